@@ -44,6 +44,19 @@ func (h *ModelHandler) List(c *fiber.Ctx) error {
 		Quantizations:     parseQueryArray(c, "quantization"),
 	}
 
+	// Costs are compared as NUMERIC, so reject values the database cannot cast
+	for name, cost := range map[string]*string{
+		"max_prompt_cost":     filter.MaxPromptCost,
+		"max_completion_cost": filter.MaxCompletionCost,
+	} {
+		if cost == nil {
+			continue
+		}
+		if !models.IsNumericCost(*cost) {
+			return errorResponse(c, http.StatusBadRequest, name+" must be a decimal number")
+		}
+	}
+
 	items, err := h.service.List(ctx, filter)
 	if err != nil {
 		return errorResponse(c, http.StatusInternalServerError, err.Error())
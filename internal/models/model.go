@@ -1,9 +1,44 @@
 package models
 
 import (
+	"math/big"
+	"regexp"
 	"time"
+
+	"gorm.io/gorm"
 )
 
+// decimalPattern matches the plain decimal numbers NUMERIC accepts; big.Rat
+// also accepts fractions and base prefixes (0x, 0o, 0b), NUMERIC does not.
+var decimalPattern = regexp.MustCompile(`^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$`)
+
+// IsNumericCost reports whether cost is a finite decimal number a NUMERIC column accepts.
+func IsNumericCost(cost string) bool {
+	if !decimalPattern.MatchString(cost) {
+		return false
+	}
+	_, ok := new(big.Rat).SetString(cost)
+	return ok
+}
+
+// numericCost returns cost for a NUMERIC column, or nil if it is not a decimal number.
+func numericCost(cost string) *string {
+	if !IsNumericCost(cost) {
+		return nil
+	}
+	return &cost
+}
+
+// costPerMillion returns a per-token cost in USD per million tokens, or nil if it is not a decimal number.
+func costPerMillion(cost string) *string {
+	if numericCost(cost) == nil {
+		return nil
+	}
+	r, _ := new(big.Rat).SetString(cost)
+	perMillion := r.Mul(r, big.NewRat(1_000_000, 1)).FloatString(12)
+	return &perMillion
+}
+
 // ModelPricing represents model pricing (database entity and API response)
 type ModelPricing struct {
 	ID                    int64  `json:"id,omitzero" gorm:"primaryKey;autoIncrement"`
@@ -14,12 +49,35 @@ type ModelPricing struct {
 	ImageCost             string `json:"image_cost,omitzero" gorm:"column:image_cost"`
 	WebSearchCost         string `json:"web_search_cost,omitzero" gorm:"column:web_search_cost"`
 	InternalReasoningCost string `json:"internal_reasoning_cost,omitzero" gorm:"column:internal_reasoning_cost"`
+
+	// Exact NUMERIC copies used by price filters, kept in step by BeforeSave
+	PromptCostNumeric            *string `json:"-" gorm:"column:prompt_cost_numeric;type:numeric;index:ix_model_pricing_prompt_cost_numeric"`
+	CompletionCostNumeric        *string `json:"-" gorm:"column:completion_cost_numeric;type:numeric;index:ix_model_pricing_completion_cost_numeric"`
+	RequestCostNumeric           *string `json:"-" gorm:"column:request_cost_numeric;type:numeric"`
+	ImageCostNumeric             *string `json:"-" gorm:"column:image_cost_numeric;type:numeric"`
+	WebSearchCostNumeric         *string `json:"-" gorm:"column:web_search_cost_numeric;type:numeric"`
+	InternalReasoningCostNumeric *string `json:"-" gorm:"column:internal_reasoning_cost_numeric;type:numeric"`
+	PromptCostPer1M              *string `json:"-" gorm:"column:prompt_cost_per_1m;type:numeric;index:ix_model_pricing_prompt_cost_per_1m"`
+	CompletionCostPer1M          *string `json:"-" gorm:"column:completion_cost_per_1m;type:numeric;index:ix_model_pricing_completion_cost_per_1m"`
 }
 
 func (ModelPricing) TableName() string {
 	return "model_pricing"
 }
 
+// BeforeSave fills the NUMERIC cost columns from the string costs.
+func (p *ModelPricing) BeforeSave(*gorm.DB) error {
+	p.PromptCostNumeric = numericCost(p.PromptCost)
+	p.CompletionCostNumeric = numericCost(p.CompletionCost)
+	p.RequestCostNumeric = numericCost(p.RequestCost)
+	p.ImageCostNumeric = numericCost(p.ImageCost)
+	p.WebSearchCostNumeric = numericCost(p.WebSearchCost)
+	p.InternalReasoningCostNumeric = numericCost(p.InternalReasoningCost)
+	p.PromptCostPer1M = costPerMillion(p.PromptCost)
+	p.CompletionCostPer1M = costPerMillion(p.CompletionCost)
+	return nil
+}
+
 // ModelArchitecture represents model architecture (database entity and API response)
 type ModelArchitecture struct {
 	ID           int64  `json:"id,omitzero" gorm:"primaryKey;autoIncrement"`
@@ -100,12 +158,43 @@ type ModelEndpointPricing struct {
 	InputCacheReadCost  string `json:"input_cache_read_cost,omitzero" gorm:"column:input_cache_read_cost"`
 	InputCacheWriteCost string `json:"input_cache_write_cost,omitzero" gorm:"column:input_cache_write_cost"`
 	Discount            string `json:"discount,omitzero" gorm:"column:discount"`
+
+	// Exact NUMERIC copies used by price filters, kept in step by BeforeSave
+	PromptCostNumeric          *string `json:"-" gorm:"column:prompt_cost_numeric;type:numeric;index:ix_model_endpoint_pricing_prompt_cost_numeric"`
+	CompletionCostNumeric      *string `json:"-" gorm:"column:completion_cost_numeric;type:numeric;index:ix_model_endpoint_pricing_completion_cost_numeric"`
+	RequestCostNumeric         *string `json:"-" gorm:"column:request_cost_numeric;type:numeric"`
+	ImageCostNumeric           *string `json:"-" gorm:"column:image_cost_numeric;type:numeric"`
+	ImageOutputCostNumeric     *string `json:"-" gorm:"column:image_output_cost_numeric;type:numeric"`
+	AudioCostNumeric           *string `json:"-" gorm:"column:audio_cost_numeric;type:numeric"`
+	InputAudioCacheCostNumeric *string `json:"-" gorm:"column:input_audio_cache_cost_numeric;type:numeric"`
+	InputCacheReadCostNumeric  *string `json:"-" gorm:"column:input_cache_read_cost_numeric;type:numeric"`
+	InputCacheWriteCostNumeric *string `json:"-" gorm:"column:input_cache_write_cost_numeric;type:numeric"`
+	DiscountNumeric            *string `json:"-" gorm:"column:discount_numeric;type:numeric"`
+	PromptCostPer1M            *string `json:"-" gorm:"column:prompt_cost_per_1m;type:numeric;index:ix_model_endpoint_pricing_prompt_cost_per_1m"`
+	CompletionCostPer1M        *string `json:"-" gorm:"column:completion_cost_per_1m;type:numeric;index:ix_model_endpoint_pricing_completion_cost_per_1m"`
 }
 
 func (ModelEndpointPricing) TableName() string {
 	return "model_endpoint_pricing"
 }
 
+// BeforeSave fills the NUMERIC cost columns from the string costs.
+func (p *ModelEndpointPricing) BeforeSave(*gorm.DB) error {
+	p.PromptCostNumeric = numericCost(p.PromptCost)
+	p.CompletionCostNumeric = numericCost(p.CompletionCost)
+	p.RequestCostNumeric = numericCost(p.RequestCost)
+	p.ImageCostNumeric = numericCost(p.ImageCost)
+	p.ImageOutputCostNumeric = numericCost(p.ImageOutputCost)
+	p.AudioCostNumeric = numericCost(p.AudioCost)
+	p.InputAudioCacheCostNumeric = numericCost(p.InputAudioCacheCost)
+	p.InputCacheReadCostNumeric = numericCost(p.InputCacheReadCost)
+	p.InputCacheWriteCostNumeric = numericCost(p.InputCacheWriteCost)
+	p.DiscountNumeric = numericCost(p.Discount)
+	p.PromptCostPer1M = costPerMillion(p.PromptCost)
+	p.CompletionCostPer1M = costPerMillion(p.CompletionCost)
+	return nil
+}
+
 // ModelSupportedParameter represents supported parameters (many-to-many with Model)
 type ModelSupportedParameter struct {
 	ID            int64              `json:"id,omitzero" gorm:"primaryKey;autoIncrement"`
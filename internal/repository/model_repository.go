@@ -97,14 +97,14 @@ func (r *modelRepository) List(ctx context.Context, filter models.ModelFilter) (
 		query = query.Where("context_length >= ?", *filter.MinContextLength)
 	}
 
-	// Filter by maximum prompt cost
+	// Filter by maximum prompt cost (numeric comparison, served by the btree index)
 	if filter.MaxPromptCost != nil {
-		query = query.Where("Pricing.prompt_cost <= ?", *filter.MaxPromptCost)
+		query = query.Where("Pricing.prompt_cost_numeric <= CAST(? AS NUMERIC)", *filter.MaxPromptCost)
 	}
 
-	// Filter by maximum completion cost
+	// Filter by maximum completion cost (numeric comparison, served by the btree index)
 	if filter.MaxCompletionCost != nil {
-		query = query.Where("Pricing.completion_cost <= ?", *filter.MaxCompletionCost)
+		query = query.Where("Pricing.completion_cost_numeric <= CAST(? AS NUMERIC)", *filter.MaxCompletionCost)
 	}
 
 	// Filter by supported parameters
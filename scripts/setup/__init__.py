@@ -9,38 +9,46 @@ import argparse
 import asyncio
 import json
 import logging
+import tempfile
 from datetime import UTC, datetime
 from pathlib import Path
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from .fetchers.openrouter import fetch_all_endpoints_parallel, fetch_openrouter_models
-from .fetchers.zdr import fetch_zdr_endpoints
-from .inserters.bulk_insert import bulk_insert_models
+from .change_detection import ChangeDetector
+from .fetchers.cache import CachePolicy, close_cache_store, set_cache_dir
+from .fetchers.catalog import fetch_catalog
+from .fetchers.client import ConnectionStats, create_http_client
+from .fetchers.fixtures import FixtureArchive, ReplayTransport
+from .fetchers.metrics import FetchMetrics
+from .fetchers.refresh import CacheRefresher
+from .fetchers.retry import RetryBudget
+from .inserters.bulk_insert import DEFAULT_INSERT_CHUNK_SIZE
+from .models.compact import CompactModel
 from .models.database import Base, SyncMetadata
+from .models.migrations import apply_schema_migrations, pending_schema_changes
 from .models.openrouter import OpenRouterModelWithEndpoints
 from .models.zdr import ZDREndpoint
-from .updaters.architecture import (
-    update_existing_architecture_modalities,
-    update_existing_model_architecture,
+from .pipeline import (
+    SYNC_ENGINES,
+    StreamingSyncResult,
+    log_update_counts,
+    run_streaming_sync,
+    write_models,
 )
-from .updaters.endpoints import update_existing_endpoints
-from .updaters.llm_models import update_existing_llm_models
-from .updaters.parameters import (
-    update_existing_default_parameters,
-    update_existing_supported_parameters,
-)
-from .updaters.pricing import (
-    update_existing_endpoint_pricing,
-    update_existing_model_pricing,
-)
-from .updaters.providers import update_existing_top_provider
+from .staging_sync import supports_staging_sync
+from .updaters.fingerprints import load_change_detector, save_fingerprints
 from .utils.exports import save_to_polars
-from .utils.validation import validate_parameter_constants
+from .utils.fingerprints import zdr_fingerprint
+from .utils.validation import (
+    collect_validation_diagnostics,
+    validate_parameter_constants,
+)
 
 # Re-export key types for package users
 __all__ = [
+    "CompactModel",
     "OpenRouterModelWithEndpoints",
     "ZDREndpoint",
 ]
@@ -81,12 +89,49 @@ async def should_sync(
     return False
 
 
+async def record_sync_metadata(
+    session: AsyncSession, sync_type: str, **fields: object
+) -> None:
+    """Insert or update the metadata row for a sync type"""
+    sync_metadata = await session.scalar(
+        select(SyncMetadata).where(SyncMetadata.sync_type == sync_type)
+    )
+    if sync_metadata is None:
+        sync_metadata = SyncMetadata(sync_type=sync_type)
+        session.add(sync_metadata)
+
+    sync_metadata.last_sync_at = datetime.now(UTC)  # type: ignore
+    for name, value in fields.items():
+        setattr(sync_metadata, name, value)
+
+
 async def main_async(
     db_url: str,
     output_json: str | None = None,
     output_parquet: str | None = None,
     output_csv: str | None = None,
     force_refresh: bool = False,
+    max_concurrency: int = 64,
+    max_retries: int = 500,
+    http2: bool = False,
+    streaming: bool = False,
+    batch_size: int = 100,
+    change_detection: bool = True,
+    drift_sample_rate: float = 0.1,
+    metrics_json: str | None = None,
+    metrics_prometheus: str | None = None,
+    stale_while_revalidate: bool = False,
+    cache_fresh_hours: float = 24.0,
+    cache_expire_hours: float = 168.0,
+    record_fixtures: str | None = None,
+    replay_fixtures: str | None = None,
+    replay_latency_ms: float = 0.0,
+    replay_jitter_ms: float = 0.0,
+    replay_error_rate: float = 0.0,
+    replay_seed: int | None = None,
+    sync_engine: str = "orm",
+    dry_run: bool = False,
+    insert_chunk_size: int = DEFAULT_INSERT_CHUNK_SIZE,
 ) -> None:
     """Main async pipeline using SQLAlchemy ORM"""
     # Validate parameter constants on startup
@@ -101,69 +146,183 @@ async def main_async(
         async_db_url, echo=False, pool_size=10, max_overflow=20
     )
 
-    # Create tables (including new SyncMetadata table)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("✓ Database tables created/verified")
+    if sync_engine == "staging" and not supports_staging_sync(engine.dialect):
+        logger.warning("Staging sync engine needs PostgreSQL, using the ORM engine")
+        sync_engine = "orm"
+
+    if dry_run:
+        # Creating or migrating tables would write too, so only check the schema
+        async with engine.connect() as conn:
+            pending = await pending_schema_changes(conn)
+        if pending:
+            await engine.dispose()
+            raise RuntimeError(
+                "Dry run needs an up-to-date schema; run a sync without --dry-run "
+                f"to add: {', '.join(pending)}"
+            )
+        logger.info("✓ Database tables verified")
+    else:
+        # Create tables (including new SyncMetadata table)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await apply_schema_migrations(conn)
+        logger.info("✓ Database tables created/verified")
 
     # Create session factory
     async_session = async_sessionmaker(
         engine, expire_on_commit=False, class_=AsyncSession
     )
 
-    # Check if we need to sync OpenRouter models
-    should_sync_models = force_refresh
-    if not force_refresh:
+    if record_fixtures and replay_fixtures:
+        raise ValueError("record_fixtures and replay_fixtures are mutually exclusive")
+    if record_fixtures and stale_while_revalidate:
+        # Cache hits make no requests, which would leave gaps in the archive
+        logger.info("Recording fixtures: ignoring --stale-while-revalidate")
+        stale_while_revalidate = False
+
+    # Check if we need to sync OpenRouter models (always when recording/replaying)
+    should_sync_models = force_refresh or bool(record_fixtures or replay_fixtures)
+    if not should_sync_models:
         async with async_session() as session:
             should_sync_models = await should_sync(session, "openrouter_models")
 
-    raw_models = []
-    models_with_endpoints = []
-    zdr_lookup = {}
+    models_with_endpoints: list[CompactModel] = []
+    zdr_lookup: dict[tuple[str, str, str], ZDREndpoint] = {}
+    streaming_result: StreamingSyncResult | None = None
+    change_detector: ChangeDetector | None = None
+    exports_requested = bool(output_json or output_parquet or output_csv)
 
     if should_sync_models:
-        # Step 1: Fetch models from OpenRouter
-        logger.info("Fetching OpenRouter models...")
-        raw_models = await fetch_openrouter_models(
-            use_cache=False
-        )  # Always fresh for sync
-
-        # Step 2: Fetch endpoints for all models in parallel
-        logger.info(f"Fetching endpoints for {len(raw_models)} models in parallel...")
-        models_with_endpoints = await fetch_all_endpoints_parallel(
-            raw_models,
-            use_cache=False,  # Always fresh for sync
-        )
-        logger.info(
-            f"✓ Fetched endpoints for {len(models_with_endpoints)} models (from {len(raw_models)} total)"
-        )
-
-        # Step 2.5: Fetch ZDR endpoints
-        logger.info("Fetching ZDR endpoints...")
-        zdr_lookup = await fetch_zdr_endpoints(use_cache=False)  # Always fresh for sync
-        logger.info(f"✓ Fetched {len(zdr_lookup)} ZDR endpoints")
-
-        # Record sync metadata
-        async with async_session() as session:
-            # Upsert OpenRouter models sync metadata
-            sync_metadata = SyncMetadata(
-                sync_type="openrouter_models",
-                last_sync_at=datetime.now(UTC),
-                models_count=len(models_with_endpoints),
+        if change_detection:
+            # Exports need every model, so only the DB writes skip unchanged ones
+            async with async_session() as session:
+                change_detector = await load_change_detector(
+                    session,
+                    sample_fraction=drift_sample_rate,
+                    # A recording must hold every model's endpoints
+                    fetch_all=exports_requested or bool(record_fixtures),
+                )
+
+        # One retry budget and one HTTP client shared by every fetcher for the run
+        retry_budget = RetryBudget(max_retries=max_retries)
+        connection_stats = ConnectionStats()
+        fetch_metrics = FetchMetrics()
+
+        # Serve cached data up to the hard expiry, refreshing stale entries
+        # in the background instead of blocking the sync on upstream latency
+        cache_refresher: CacheRefresher | None = None
+        if stale_while_revalidate:
+            cache_refresher = CacheRefresher(
+                CachePolicy(
+                    fresh_hours=cache_fresh_hours, expire_hours=cache_expire_hours
+                )
             )
-            await session.merge(sync_metadata)
 
-            # Upsert ZDR endpoints sync metadata
-            zdr_sync_metadata = SyncMetadata(
-                sync_type="zdr_endpoints",
-                last_sync_at=datetime.now(UTC),
-                zdr_endpoints_count=len(zdr_lookup),
+        # Record the run's responses, or serve a recording instead of the API
+        fixture_archive = FixtureArchive() if record_fixtures else None
+        replay_transport: ReplayTransport | None = None
+        replay_cache_dir: tempfile.TemporaryDirectory[str] | None = None
+        if replay_fixtures:
+            replay_transport = ReplayTransport(
+                FixtureArchive.load(Path(replay_fixtures)),
+                latency=replay_latency_ms / 1000,
+                jitter=replay_jitter_ms / 1000,
+                error_rate=replay_error_rate,
+                seed=replay_seed,
             )
-            await session.merge(zdr_sync_metadata)
-
-            await session.commit()
-
-        logger.info("✓ Sync metadata recorded")
+            # Keep replayed payloads out of the real cache
+            replay_cache_dir = tempfile.TemporaryDirectory(prefix="model-registry-")
+            set_cache_dir(Path(replay_cache_dir.name))
+
+        try:
+            # Tally parameters dropped by validation instead of logging each one
+            with collect_validation_diagnostics() as validation_diagnostics:
+                async with create_http_client(
+                    max_connections=max_concurrency,
+                    http2=http2,
+                    stats=connection_stats,
+                    transport=replay_transport,
+                    record=fixture_archive,
+                ) as client:
+                    if streaming:
+                        # Steps 1-6 interleaved: fetch → parse → diff → batched write
+                        streaming_result = await run_streaming_sync(
+                            async_session,
+                            client,
+                            retry_budget=retry_budget,
+                            max_concurrency=max_concurrency,
+                            batch_size=batch_size,
+                            keep_models=exports_requested,
+                            change_detector=change_detector,
+                            metrics=fetch_metrics,
+                            use_cache=stale_while_revalidate,
+                            cache_refresher=cache_refresher,
+                            sync_engine=sync_engine,
+                            dry_run=dry_run,
+                            insert_chunk_size=insert_chunk_size,
+                        )
+                        models_with_endpoints = streaming_result.models_with_endpoints
+                        zdr_lookup = streaming_result.zdr_lookup
+                        models_count = streaming_result.catalog_size
+                    else:
+                        # Steps 1-2.5: models → endpoints fan-out, concurrently with ZDR
+                        catalog = await fetch_catalog(
+                            client,
+                            retry_budget=retry_budget,
+                            max_concurrency=max_concurrency,
+                            use_cache=stale_while_revalidate,  # Otherwise always fresh
+                            select_models=(
+                                change_detector.select_models
+                                if change_detector
+                                else None
+                            ),
+                            metrics=fetch_metrics,
+                            cache_refresher=cache_refresher,
+                        )
+                        models_with_endpoints = catalog.models_with_endpoints
+                        zdr_lookup = catalog.zdr_lookup
+                        models_count = catalog.catalog_size
+
+                    if cache_refresher is not None:
+                        await cache_refresher.drain()
+        finally:
+            # Also on failure (or sys.exit), so the replay cache dir never leaks
+            if replay_cache_dir is not None:
+                close_cache_store()
+                set_cache_dir(None)
+                replay_cache_dir.cleanup()
+
+        if replay_transport is not None:
+            replay_transport.log_summary()
+        if fixture_archive is not None and record_fixtures:
+            fixture_archive.save(Path(record_fixtures))
+
+        connection_stats.log_summary()
+        fetch_metrics.log_summary()
+        validation_diagnostics.log_summary()
+        if metrics_json:
+            fetch_metrics.write_json(Path(metrics_json))
+        if metrics_prometheus:
+            fetch_metrics.write_prometheus(Path(metrics_prometheus))
+
+        # Record sync metadata (a dry run leaves the database as it was)
+        if dry_run:
+            logger.info("Dry run: not recording sync metadata")
+        else:
+            async with async_session() as session:
+                # Upsert by sync_type (merge() would INSERT, violating the unique key)
+                await record_sync_metadata(
+                    session, "openrouter_models", models_count=models_count
+                )
+                await record_sync_metadata(
+                    session,
+                    "zdr_endpoints",
+                    zdr_endpoints_count=len(zdr_lookup),
+                    content_hash=zdr_fingerprint(zdr_lookup),
+                )
+
+                await session.commit()
+            logger.info("✓ Sync metadata recorded")
     else:
         logger.info("⏭️  Skipping API calls - using existing database data")
         # If not syncing, we still need to load data from database for updates
@@ -183,7 +342,7 @@ async def main_async(
         output_path = Path(output_json)
         with open(output_path, "w") as f:
             json.dump(
-                [m.model_dump(mode="json") for m in models_with_endpoints],
+                [m.to_dict() for m in models_with_endpoints],
                 f,
                 indent=2,
                 default=str,
@@ -196,64 +355,53 @@ async def main_async(
     if output_csv:
         save_to_polars(models_with_endpoints, Path(output_csv), format="csv")
 
-    # Database connection already established above
-
-    # Step 5: Update existing models with new data
-    logger.info("Updating existing models with new data...")
-    async with async_session() as session:
-        # Update existing models in all tables
-        updated_llm = await update_existing_llm_models(session, models_with_endpoints)
-        updated_pricing = await update_existing_model_pricing(
-            session, models_with_endpoints
-        )
-        updated_architecture = await update_existing_model_architecture(
-            session, models_with_endpoints
-        )
-        updated_modalities = await update_existing_architecture_modalities(
-            session, models_with_endpoints
-        )
-        updated_top_provider = await update_existing_top_provider(
-            session, models_with_endpoints
-        )
-        updated_endpoints = await update_existing_endpoints(
-            session, models_with_endpoints, zdr_lookup
-        )
-        updated_endpoint_pricing = await update_existing_endpoint_pricing(
-            session, models_with_endpoints, zdr_lookup
-        )
-        updated_supported_params = await update_existing_supported_parameters(
-            session, models_with_endpoints
-        )
-        updated_default_params = await update_existing_default_parameters(
-            session, models_with_endpoints
+    if streaming_result is not None:
+        # Steps 5-6 already ran batch by batch while fetching
+        if not dry_run:
+            log_update_counts(streaming_result.update_counts)
+        inserted, skipped = streaming_result.inserted, streaming_result.skipped
+    else:
+        # Step 4: Skip models whose upstream content has not changed
+        models_to_write = models_with_endpoints
+        if change_detector is not None:
+            models_to_write = change_detector.filter_changed(models_with_endpoints)
+
+        # Steps 5-6: Update existing models with new data, insert new models
+        logger.info(f"Writing models to database ({sync_engine} engine)...")
+        update_counts, inserted, skipped = await write_models(
+            async_session,
+            models_to_write,
+            zdr_lookup,
+            sync_engine,
+            dry_run=dry_run,
+            insert_chunk_size=insert_chunk_size,
         )
+        if not dry_run:
+            log_update_counts(update_counts)
 
-    logger.info("✓ Updates complete:")
-    logger.info(f"  • LLM models: {updated_llm}")
-    logger.info(f"  • Model pricing: {updated_pricing}")
-    logger.info(f"  • Architecture: {updated_architecture}")
-    logger.info(f"  • Architecture modalities: {updated_modalities}")
-    logger.info(f"  • Top provider: {updated_top_provider}")
-    logger.info(f"  • Endpoints: {updated_endpoints}")
-    logger.info(f"  • Endpoint pricing: {updated_endpoint_pricing}")
-    logger.info(f"  • Supported parameters: {updated_supported_params}")
-    logger.info(f"  • Default parameters: {updated_default_params}")
-
-    # Step 6: Insert new models
-    logger.info("Inserting new models to database...")
-    async with async_session() as session:
-        inserted, skipped = await bulk_insert_models(
-            session, models_with_endpoints, zdr_lookup
-        )
+        if change_detector is not None and not dry_run:
+            async with async_session() as session:
+                await save_fingerprints(session, change_detector)
 
-    logger.info("✓ Database sync complete:")
-    logger.info(f"  • Inserted: {inserted} new models")
-    logger.info(f"  • Skipped: {skipped} existing models")
+    if dry_run:
+        logger.info("✓ Dry run complete: no changes written")
+    else:
+        logger.info("✓ Database sync complete:")
+        logger.info(f"  • Inserted: {inserted} new models")
+        logger.info(f"  • Skipped: {skipped} existing models")
 
     await engine.dispose()
     logger.info("✅ Pipeline completed successfully")
 
 
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Sync OpenRouter models to PostgreSQL with optional dataset exports"
@@ -280,6 +428,124 @@ def main() -> None:
         action="store_true",
         help="Force refresh data from OpenRouter API (ignore sync timestamps)",
     )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=64,
+        help="Ceiling for concurrent endpoint requests (adapts below it on 429/5xx)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=500,
+        help="Total retry budget shared by all OpenRouter requests in one run",
+    )
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Multiplex OpenRouter requests over HTTP/2 (requires httpx[http2])",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Stream fetched models through bounded queues into batched DB writes",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=100,
+        help="Models per database write batch in --streaming mode",
+    )
+    parser.add_argument(
+        "--insert-chunk-size",
+        type=_positive_int,
+        default=DEFAULT_INSERT_CHUNK_SIZE,
+        help="New models per insert transaction (ORM engine)",
+    )
+    parser.add_argument(
+        "--full-sync",
+        action="store_true",
+        help="Fetch and write every model, ignoring stored content fingerprints",
+    )
+    parser.add_argument(
+        "--drift-sample-rate",
+        type=float,
+        default=0.1,
+        help="Fraction of unchanged models whose endpoints are re-checked each day",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        help="Optional: Save fetch metrics (latency, status codes, cache) as JSON",
+    )
+    parser.add_argument(
+        "--metrics-prometheus",
+        help="Optional: Write fetch metrics to a Prometheus textfile-collector file",
+    )
+    parser.add_argument(
+        "--stale-while-revalidate",
+        action="store_true",
+        help="Sync from cached data when fresh, or stale but before hard expiry "
+        "(stale entries are refreshed in the background)",
+    )
+    parser.add_argument(
+        "--cache-fresh-hours",
+        type=float,
+        default=24.0,
+        help="Age up to which cached data is served without refreshing",
+    )
+    parser.add_argument(
+        "--cache-expire-hours",
+        type=float,
+        default=168.0,
+        help="Hard expiry: cached data older than this is always refetched first",
+    )
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument(
+        "--record",
+        metavar="ARCHIVE",
+        help="Optional: Record every API response to a fixture archive (.json.gz)",
+    )
+    fixtures.add_argument(
+        "--replay",
+        metavar="ARCHIVE",
+        help="Optional: Serve API responses from a fixture archive instead of OpenRouter",
+    )
+    parser.add_argument(
+        "--replay-latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated latency per replayed request in milliseconds (default: 0)",
+    )
+    parser.add_argument(
+        "--replay-jitter-ms",
+        type=float,
+        default=0.0,
+        help="Random extra latency of up to this many milliseconds (default: 0)",
+    )
+    parser.add_argument(
+        "--replay-error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of replayed requests failing with 429/503/connection errors",
+    )
+    parser.add_argument(
+        "--replay-seed",
+        type=int,
+        help="Seed for replay latency and error injection (reproducible runs)",
+    )
+    parser.add_argument(
+        "--sync-engine",
+        choices=SYNC_ENGINES,
+        default="orm",
+        help="Database write engine: in-memory snapshot diff and bulk inserts, or "
+        "COPY into staging tables reconciled in one transaction (PostgreSQL only)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Log the changes a sync would make to existing models and the number "
+        "of new models, without writing to the database",
+    )
     args = parser.parse_args()
 
     # Run async main with asyncio
@@ -290,6 +556,27 @@ def main() -> None:
             args.output_parquet,
             args.output_csv,
             args.force_refresh,
+            args.max_concurrency,
+            args.max_retries,
+            args.http2,
+            args.streaming,
+            args.batch_size,
+            not args.full_sync,
+            args.drift_sample_rate,
+            args.metrics_json,
+            args.metrics_prometheus,
+            args.stale_while_revalidate,
+            args.cache_fresh_hours,
+            args.cache_expire_hours,
+            args.record,
+            args.replay,
+            args.replay_latency_ms,
+            args.replay_jitter_ms,
+            args.replay_error_rate,
+            args.replay_seed,
+            args.sync_engine,
+            args.dry_run,
+            args.insert_chunk_size,
         )
     )
 
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Benchmark endpoint fan-out latency with and without the cache.
+
+Runs the fan-out against a mock transport with fixed per-request latency and
+reports wall time plus event-loop lag (how late a 1ms ticker wakes up), which
+is what blocking disk I/O on the loop shows up as:
+
+    python -m setup.bench.cache_io --models 2000 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+
+from ..fetchers.cache import (
+    OPENROUTER_API_BASE,
+    get_cache_store,
+    get_endpoints_cache_key,
+)
+from ..fetchers.openrouter import fetch_all_endpoints_parallel
+from ..models.openrouter import OpenRouterModel
+
+
+def make_models(count: int) -> list[OpenRouterModel]:
+    """Synthetic models with distinct ids"""
+    return [
+        OpenRouterModel.model_validate(
+            {
+                "id": f"bench/model-{i}",
+                "canonical_slug": f"bench/model-{i}",
+                "name": f"Model {i}",
+                "description": "Synthetic benchmark model",
+                "context_length": 128000,
+                "pricing": {"prompt": "0.000001", "completion": "0.000002"},
+                "architecture": {
+                    "modality": "text->text",
+                    "input_modalities": ["text"],
+                    "output_modalities": ["text"],
+                    "tokenizer": "Other",
+                },
+                "top_provider": {"context_length": 128000, "is_moderated": False},
+                "created": 0,
+                "supported_parameters": ["temperature", "top_p", "tools"],
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def make_transport(latency: float) -> httpx.MockTransport:
+    """Mock OpenRouter transport answering every endpoints request after `latency`"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        model_id = request.url.path.split("/models/", 1)[1].rsplit("/endpoints", 1)[0]
+        endpoints = [
+            {
+                "name": f"Provider {p} | {model_id}",
+                "model_name": model_id,
+                "context_length": 128000,
+                "pricing": {"prompt": "0.000001", "completion": "0.000002"},
+                "provider_name": f"Provider {p}",
+                "tag": f"provider-{p}",
+                "quantization": "fp16",
+                "max_completion_tokens": 4096,
+                "max_prompt_tokens": None,
+                "supported_parameters": ["temperature", "top_p", "tools"],
+                "status": 0,
+                "uptime_last_30m": 99.9,
+                "supports_implicit_caching": False,
+            }
+            for p in range(3)
+        ]
+        return httpx.Response(
+            200,
+            json={"data": {"id": model_id, "endpoints": endpoints}},
+            headers={"ETag": f'"{model_id}"'},
+        )
+
+    return httpx.MockTransport(handler)
+
+
+class LoopLagMonitor:
+    """Measures how late a periodic ticker wakes up on the event loop"""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def _tick(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - expected))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._tick())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+async def network_only(
+    client: httpx.AsyncClient, models: list[OpenRouterModel], concurrency: int
+) -> None:
+    """Baseline: the same fan-out with no cache reads or writes at all"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(model: OpenRouterModel) -> None:
+        async with semaphore:
+            response = await client.get(
+                f"{OPENROUTER_API_BASE}/models/{model.id}/endpoints"
+            )
+            response.json()
+
+    await asyncio.gather(*[fetch(m) for m in models])
+
+
+async def blocking_cache_writes(
+    client: httpx.AsyncClient, models: list[OpenRouterModel], concurrency: int
+) -> None:
+    """Previous behaviour: every response written to the cache on the event loop"""
+    semaphore = asyncio.Semaphore(concurrency)
+    store = get_cache_store()
+
+    async def fetch(model: OpenRouterModel) -> None:
+        async with semaphore:
+            response = await client.get(
+                f"{OPENROUTER_API_BASE}/models/{model.id}/endpoints"
+            )
+            data: dict[str, Any] = response.json()["data"]
+            store.put(get_endpoints_cache_key(model.id), data)
+
+    await asyncio.gather(*[fetch(m) for m in models])
+
+
+async def run_scenario(
+    name: str, scenario: Callable[[], Awaitable[object]]
+) -> dict[str, Any]:
+    """Run one scenario under the loop-lag monitor"""
+    monitor = LoopLagMonitor()
+    monitor.start()
+    started_at = time.perf_counter()
+    await scenario()
+    elapsed = time.perf_counter() - started_at
+    await monitor.stop()
+
+    lags = sorted(monitor.lags) or [0.0]
+    return {
+        "scenario": name,
+        "seconds": elapsed,
+        "lag_p50_ms": statistics.median(lags) * 1000,
+        "lag_p99_ms": lags[int(0.99 * (len(lags) - 1))] * 1000,
+        "lag_max_ms": lags[-1] * 1000,
+    }
+
+
+async def main_async(model_count: int, latency: float, concurrency: int) -> None:
+    models = make_models(model_count)
+    transport = make_transport(latency)
+    results = []
+
+    async with httpx.AsyncClient(
+        transport=transport, limits=httpx.Limits(max_connections=concurrency)
+    ) as client:
+
+        def fan_out(use_cache: bool) -> Callable[[], Awaitable[object]]:
+            return lambda: fetch_all_endpoints_parallel(
+                models, use_cache=use_cache, max_concurrency=concurrency, client=client
+            )
+
+        results.append(
+            await run_scenario(
+                "no cache (network only)",
+                lambda: network_only(client, models, concurrency),
+            )
+        )
+        results.append(
+            await run_scenario(
+                "blocking writes on the loop",
+                lambda: blocking_cache_writes(client, models, concurrency),
+            )
+        )
+        results.append(await run_scenario("cold cache (off-loop I/O)", fan_out(False)))
+        results.append(await run_scenario("warm cache (off-loop I/O)", fan_out(True)))
+
+    print(
+        f"\n{model_count} models, {latency * 1000:.0f}ms latency, "
+        f"concurrency {concurrency}\n"
+    )
+    print(
+        f"{'scenario':<30} {'wall s':>8} {'lag p50':>9} {'lag p99':>9} {'lag max':>9}"
+    )
+    for r in results:
+        print(
+            f"{r['scenario']:<30} {r['seconds']:>8.2f} {r['lag_p50_ms']:>7.2f}ms "
+            f"{r['lag_p99_ms']:>7.2f}ms {r['lag_max_ms']:>7.2f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--models", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    # Run against a throwaway cache so the real one is left untouched
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        asyncio.run(main_async(args.models, args.latency_ms / 1000, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of building the per-model catalog record.
+
+Compares the validating OpenRouterModelWithEndpoints constructor (which
+re-runs pricing, architecture, top provider and parameter validation on
+already-validated data) with Pydantic's unvalidated `model_construct()` and
+with the CompactModel records built by the fetchers:
+
+    python -m setup.bench.construction --models 5000 --repeat 5
+"""
+
+import argparse
+import json
+import logging
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from ..fetchers.openrouter import parse_provider_model
+from ..fetchers.synthetic import SyntheticCatalog
+from ..models.compact import CompactModel, InternPool
+from ..models.openrouter import (
+    Endpoint,
+    OpenRouterModel,
+    OpenRouterModelWithEndpoints,
+    parse_endpoints_json,
+    parse_openrouter_models_json,
+)
+
+Inputs = list[tuple[OpenRouterModel, list[Endpoint], str, str]]
+
+
+def validated(inputs: Inputs) -> None:
+    """Previous path: full validation of every field"""
+    for model, endpoints, author, model_name in inputs:
+        OpenRouterModelWithEndpoints(
+            openrouter_id=model.id,
+            name=model.name,
+            description=model.description,
+            context_length=model.context_length,
+            pricing=model.pricing,
+            architecture=model.architecture,
+            top_provider=model.top_provider,
+            created=model.created,
+            supported_parameters=model.supported_parameters,
+            default_parameters=model.default_parameters,
+            providers=endpoints,
+            author=author,
+            model_name=model_name,
+            created_at=datetime.fromtimestamp(model.created, tz=UTC),
+        )
+
+
+def construct_model_with_endpoints(
+    model: OpenRouterModel, endpoints: list[Endpoint], author: str, model_name: str
+) -> OpenRouterModelWithEndpoints:
+    """OpenRouterModelWithEndpoints sharing the validated sub-objects, unvalidated"""
+    return OpenRouterModelWithEndpoints.model_construct(
+        openrouter_id=model.id,
+        name=model.name,
+        description=model.description,
+        context_length=model.context_length,
+        pricing=model.pricing,
+        architecture=model.architecture,
+        top_provider=model.top_provider,
+        created=model.created,
+        supported_parameters=model.supported_parameters,
+        default_parameters=model.default_parameters,
+        providers=endpoints,
+        author=author,
+        model_name=model_name,
+        created_at=datetime.fromtimestamp(model.created, tz=UTC),
+        last_updated=datetime.now(UTC),
+    )
+
+
+def constructed(inputs: Inputs) -> None:
+    """model_construct() reusing the validated sub-objects"""
+    for model, endpoints, author, model_name in inputs:
+        construct_model_with_endpoints(model, endpoints, author, model_name)
+
+
+def compact(inputs: Inputs) -> None:
+    """Slotted records with pooled values, as kept by the sync (one pool per run)"""
+    pool = InternPool()
+    for model, endpoints, author, model_name in inputs:
+        CompactModel.from_validated(model, endpoints, author, model_name, pool)
+
+
+def best_of(fn: Callable[[Inputs], None], inputs: Inputs, repeat: int) -> float:
+    """Fastest of `repeat` runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        fn(inputs)
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--models", type=int, default=5000)
+    parser.add_argument("--max-endpoints", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    catalog = SyntheticCatalog(models=args.models, max_endpoints=args.max_endpoints)
+    models = parse_openrouter_models_json(json.dumps(catalog.models_payload()).encode())
+    inputs: Inputs = []
+    for index, model in enumerate(models):
+        author, model_name = parse_provider_model(model.id)
+        assert author and model_name
+        endpoints = parse_endpoints_json(
+            json.dumps(catalog.endpoints_payload(index)).encode()
+        )
+        inputs.append((model, endpoints, author, model_name))
+
+    print(f"\n{len(inputs)} models, best of {args.repeat}\n")
+    baseline = best_of(validated, inputs, args.repeat)
+    for name, fn in (
+        ("validated", validated),
+        ("construct", constructed),
+        ("compact", compact),
+    ):
+        seconds = baseline if fn is validated else best_of(fn, inputs, args.repeat)
+        print(
+            f"{name:<10} {seconds * 1e6 / len(inputs):>8.2f} µs/model "
+            f"({baseline / seconds:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
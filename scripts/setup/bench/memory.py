@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Memory held by the validated catalog, per model.
+
+Builds the post-validation catalog from a synthetic API twice, once as
+OpenRouterModelWithEndpoints (nested Pydantic objects) and once as the
+CompactModel records the sync now keeps, and reports the bytes still
+allocated per model once the intermediate payloads are freed:
+
+    python -m setup.bench.memory --models 1000,10000,100000
+
+Memory is traced with tracemalloc, so it counts Python allocations only.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+from ..fetchers.openrouter import parse_provider_model
+from ..fetchers.synthetic import SyntheticCatalog
+from ..models.compact import CompactModel, InternPool
+from ..models.openrouter import (
+    Endpoint,
+    OpenRouterModel,
+    parse_endpoints_json,
+    parse_openrouter_models_json,
+)
+from .construction import construct_model_with_endpoints
+
+# Builds one catalog record from a validated model and its endpoints
+Builder = Callable[[OpenRouterModel, list[Endpoint], str, str], Any]
+
+
+def retained_bytes(catalog: SyntheticCatalog, build: Builder) -> tuple[int, int]:
+    """Bytes still allocated by the built catalog, and the peak while building"""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    records = []
+    for index in range(catalog.models):
+        model, endpoints, _ = catalog.generate(index)
+        validated = parse_openrouter_models_json(
+            json.dumps({"data": [model]}).encode()
+        )[0]
+        author, model_name = parse_provider_model(validated.id)
+        assert author and model_name
+        records.append(
+            build(
+                validated,
+                parse_endpoints_json(
+                    json.dumps({"data": {"endpoints": endpoints}}).encode()
+                ),
+                author,
+                model_name,
+            )
+        )
+
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current - baseline, peak - baseline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--models",
+        default="1000,10000,100000",
+        help="Comma-separated catalog sizes (default: 1000,10000,100000)",
+    )
+    parser.add_argument("--min-endpoints", type=int, default=1)
+    parser.add_argument("--max-endpoints", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"\nendpoints per model {args.min_endpoints}-{args.max_endpoints}\n")
+    print(
+        f"{'models':>8} {'representation':<15} {'bytes/model':>12} "
+        f"{'retained':>10} {'peak':>10}"
+    )
+    for size in (int(size) for size in args.models.split(",")):
+        catalog = SyntheticCatalog(
+            models=size,
+            min_endpoints=args.min_endpoints,
+            max_endpoints=args.max_endpoints,
+            seed=args.seed,
+        )
+        builders: dict[str, Builder] = {
+            "pydantic": construct_model_with_endpoints,
+            # A fresh pool per size so its values are counted with the records
+            "compact": partial(CompactModel.from_validated, pool=InternPool()),
+        }
+        results = {name: retained_bytes(catalog, b) for name, b in builders.items()}
+        for name, (retained, peak) in results.items():
+            print(
+                f"{size:>8} {name:<15} {retained / size:>12,.0f} "
+                f"{retained / 2**20:>7.1f}MiB {peak / 2**20:>7.1f}MiB"
+            )
+        ratio = results["pydantic"][0] / results["compact"][0]
+        print(f"{'':>8} {'compact saves':<15} {1 - 1 / ratio:>12.0%} ({ratio:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Measure how the sync stages scale with catalog size.
+
+Serves a synthetic catalog through SyntheticTransport and times each stage
+per catalog size: fetch (models → endpoints ∥ ZDR, including parsing),
+validation alone (response bodies → Pydantic models), insert into an empty
+database and update after a price drift:
+
+    python -m setup.bench.scale --models 1000,10000,100000 --latency local
+
+Uses a throwaway SQLite database and cache unless --db-url is given.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import tempfile
+import time
+from collections.abc import Awaitable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from ..fetchers.cache import close_cache_store, set_cache_dir
+from ..fetchers.catalog import CatalogFetchResult, fetch_catalog
+from ..fetchers.client import create_http_client
+from ..fetchers.openrouter import build_model_with_endpoints
+from ..fetchers.synthetic import LATENCY_PROFILES, SyntheticCatalog, SyntheticTransport
+from ..inserters.bulk_insert import bulk_insert_models
+from ..models.compact import InternPool
+from ..models.database import Base
+from ..models.migrations import apply_schema_migrations
+from ..models.openrouter import parse_endpoints_json, parse_openrouter_models_json
+from ..models.zdr import ZDREndpoint
+from ..pipeline import apply_updates
+
+T = TypeVar("T")
+
+_ZDR_LIST = TypeAdapter(list[ZDREndpoint])
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process so far (Linux reports KiB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def timed(
+    results: list[dict[str, Any]], size: int, stage: str, work: Awaitable[T]
+) -> T:
+    """Await `work` and record its wall time for the report"""
+    started_at = time.perf_counter()
+    value = await work
+    seconds = time.perf_counter() - started_at
+    results.append(
+        {
+            "models": size,
+            "stage": stage,
+            "seconds": seconds,
+            "us_per_model": seconds / size * 1e6,
+            "peak_rss_mib": peak_rss_mib(),
+        }
+    )
+    return value
+
+
+async def fetch(
+    catalog: SyntheticCatalog, args: argparse.Namespace
+) -> CatalogFetchResult:
+    """Fetch phase against the synthetic API"""
+    transport = SyntheticTransport(
+        catalog, LATENCY_PROFILES[args.latency], seed=catalog.seed
+    )
+    async with create_http_client(
+        max_connections=args.concurrency, transport=transport
+    ) as client:
+        return await fetch_catalog(client, max_concurrency=args.concurrency)
+
+
+async def validate(
+    models_body: bytes, endpoints_bodies: list[bytes], zdr_body: bytes
+) -> int:
+    """Validation stage alone: raw response bodies to Pydantic models"""
+    valid = 0
+    pool = InternPool()
+    models = parse_openrouter_models_json(models_body)
+    for model, body in zip(models, endpoints_bodies, strict=True):
+        if build_model_with_endpoints(model, parse_endpoints_json(body), pool):
+            valid += 1
+    _ZDR_LIST.validate_python(json.loads(zdr_body)["data"])
+    return valid
+
+
+async def run_size(
+    size: int, args: argparse.Namespace, db_url: str, results: list[dict[str, Any]]
+) -> None:
+    """Run every stage for one catalog size on a fresh database"""
+    engine = create_async_engine(db_url, echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await apply_schema_migrations(conn)
+    async_session = async_sessionmaker(
+        engine, expire_on_commit=False, class_=AsyncSession
+    )
+
+    catalog = SyntheticCatalog(
+        models=size,
+        min_endpoints=args.min_endpoints,
+        max_endpoints=args.max_endpoints,
+        zdr_fraction=args.zdr_fraction,
+        seed=args.seed,
+    )
+    result = await timed(results, size, "fetch", fetch(catalog, args))
+    models_body = json.dumps(catalog.models_payload()).encode()
+    endpoints_bodies = [
+        json.dumps(catalog.endpoints_payload(i)).encode() for i in range(size)
+    ]
+    zdr_body = json.dumps(catalog.zdr_payload()).encode()
+    await timed(
+        results, size, "validate", validate(models_body, endpoints_bodies, zdr_body)
+    )
+    del models_body, endpoints_bodies, zdr_body
+
+    async with async_session() as session:
+        await timed(
+            results,
+            size,
+            "insert",
+            bulk_insert_models(
+                session, result.models_with_endpoints, result.zdr_lookup
+            ),
+        )
+
+    # Second pass: a drifted revision so the update stages have work to do
+    drifted = await fetch(
+        SyntheticCatalog(
+            models=size,
+            min_endpoints=args.min_endpoints,
+            max_endpoints=args.max_endpoints,
+            zdr_fraction=args.zdr_fraction,
+            seed=args.seed,
+            revision=1,
+        ),
+        args,
+    )
+    async with async_session() as session:
+        await timed(
+            results,
+            size,
+            "update",
+            apply_updates(
+                session,
+                drifted.models_with_endpoints,
+                drifted.zdr_lookup,
+                async_session=async_session,
+            ),
+        )
+
+    await engine.dispose()
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    sizes = [int(size) for size in args.models.split(",")]
+    results: list[dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory(prefix="model-registry-bench-") as work_dir:
+        # Keep synthetic payloads out of the real cache
+        set_cache_dir(Path(work_dir))
+        db_url = args.db_url or f"sqlite+aiosqlite:///{work_dir}/bench.sqlite3"
+        db_url = db_url.replace("postgresql://", "postgresql+asyncpg://")
+        try:
+            for size in sizes:
+                await run_size(size, args, db_url, results)
+        finally:
+            close_cache_store()
+            set_cache_dir(None)
+
+    print(
+        f"\nlatency profile {args.latency!r}, endpoints per model "
+        f"{args.min_endpoints}-{args.max_endpoints}, concurrency {args.concurrency}\n"
+    )
+    print(
+        f"{'models':>8} {'stage':<9} {'seconds':>9} {'µs/model':>10} {'peak RSS':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['models']:>8} {r['stage']:<9} {r['seconds']:>9.2f} "
+            f"{r['us_per_model']:>10.0f} {r['peak_rss_mib']:>7.0f}MiB"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--models",
+        default="1000,10000",
+        help="Comma-separated catalog sizes (default: 1000,10000)",
+    )
+    parser.add_argument("--min-endpoints", type=int, default=1)
+    parser.add_argument("--max-endpoints", type=int, default=6)
+    parser.add_argument("--zdr-fraction", type=float, default=0.2)
+    parser.add_argument("--latency", choices=sorted(LATENCY_PROFILES), default="none")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--db-url",
+        help="Scratch database whose tables are dropped (default: temporary SQLite)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
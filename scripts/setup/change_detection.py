@@ -0,0 +1,157 @@
+"""
+Upstream change detection to skip models that have not changed since the last sync.
+"""
+
+import logging
+import time
+import zlib
+from dataclasses import dataclass
+
+from .fetchers.openrouter import parse_provider_model
+from .models.compact import CompactModel
+from .models.openrouter import OpenRouterModel
+from .models.zdr import ZDREndpoint
+from .utils.fingerprints import (
+    endpoints_fingerprint,
+    summary_fingerprint,
+    zdr_fingerprint,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredFingerprint:
+    """Fingerprints recorded for a model by a previous sync"""
+
+    model_id: int
+    summary_hash: str
+    endpoints_hash: str
+
+
+class ChangeDetector:
+    """
+    Decides which models need endpoint fetches and database writes.
+
+    A model's endpoints are fetched when its /models entry changed, it has no
+    stored fingerprint, the ZDR list changed, or it falls in today's rotating
+    sample (which catches endpoint-only drift: every model is re-checked at
+    least once every `1 / sample_fraction` days). After fetching, models whose
+    summary, endpoints and ZDR fingerprints all match are skipped by the
+    update and insert stages. With `fetch_all` (e.g. when exporting the full
+    catalog) every model's endpoints are fetched but unchanged models are
+    still skipped by the write stages.
+    """
+
+    def __init__(
+        self,
+        stored: dict[tuple[str, str], StoredFingerprint],
+        stored_zdr_hash: str | None = None,
+        sample_fraction: float = 0.1,
+        rotation: int | None = None,
+        fetch_all: bool = False,
+    ) -> None:
+        self.stored = stored
+        self.fetch_all = fetch_all
+        self.stored_zdr_hash = stored_zdr_hash
+        self.sample_buckets = (
+            max(1, round(1 / sample_fraction)) if sample_fraction else 0
+        )
+        self.rotation = int(time.time() // 86400) if rotation is None else rotation
+
+        self.zdr_hash: str | None = None
+        self.zdr_changed = True
+        self._summary_hashes: dict[str, str] = {}
+
+        # Fingerprints to persist once the models have been written
+        self.pending: dict[tuple[str, str], tuple[str, str]] = {}
+
+        # Counters for end-of-run reporting
+        self.summary_unchanged = 0
+        self.sampled = 0
+        self.unchanged = 0
+
+    def observe_zdr(self, zdr_lookup: dict[tuple[str, str, str], ZDREndpoint]) -> None:
+        """Record the ZDR list; a change forces every model to be re-checked"""
+        self.zdr_hash = zdr_fingerprint(zdr_lookup)
+        self.zdr_changed = self.zdr_hash != self.stored_zdr_hash
+        if self.zdr_changed:
+            logger.info(
+                "ZDR endpoint list changed, re-checking endpoints for all models"
+            )
+
+    def _in_sample(self, model_id: str) -> bool:
+        """Whether a model is part of today's rotating drift sample"""
+        if not self.sample_buckets:
+            return False
+        bucket = zlib.crc32(model_id.encode()) % self.sample_buckets
+        return bucket == self.rotation % self.sample_buckets
+
+    def select_models(
+        self,
+        models: list[OpenRouterModel],
+        zdr_lookup: dict[tuple[str, str, str], ZDREndpoint],
+    ) -> list[OpenRouterModel]:
+        """Record the ZDR list, then select the models whose endpoints to fetch"""
+        self.observe_zdr(zdr_lookup)
+        return self.select_for_fetch(models)
+
+    def select_for_fetch(self, models: list[OpenRouterModel]) -> list[OpenRouterModel]:
+        """Return the models whose endpoints must be fetched this run"""
+        selected = []
+        for model in models:
+            summary_hash = summary_fingerprint(model)
+            self._summary_hashes[model.id] = summary_hash
+
+            author, model_name = parse_provider_model(model.id)
+            stored = (
+                self.stored.get((author, model_name)) if author and model_name else None
+            )
+            if (
+                stored is None
+                or stored.summary_hash != summary_hash
+                or self.zdr_changed
+            ):
+                selected.append(model)
+                continue
+
+            self.summary_unchanged += 1
+            if self.fetch_all or self._in_sample(model.id):
+                self.sampled += 1
+                selected.append(model)
+
+        logger.info(
+            f"✓ Change detection: fetching endpoints for {len(selected)}/{len(models)} models "
+            f"({self.summary_unchanged} unchanged summaries, {self.sampled} sampled for drift)"
+        )
+        return selected
+
+    def has_changed(self, m: CompactModel) -> bool:
+        """Check a fetched model against its stored fingerprints"""
+        summary_hash = self._summary_hashes.get(m.openrouter_id)
+        endpoints_hash = endpoints_fingerprint(m.providers)
+        key = (m.author, m.model_name)
+        stored = self.stored.get(key)
+
+        changed = (
+            summary_hash is None
+            or stored is None
+            or stored.summary_hash != summary_hash
+            or stored.endpoints_hash != endpoints_hash
+            or self.zdr_changed
+        )
+        if changed:
+            if summary_hash is not None:
+                self.pending[key] = (summary_hash, endpoints_hash)
+        else:
+            self.unchanged += 1
+        return changed
+
+    def filter_changed(self, models: list[CompactModel]) -> list[CompactModel]:
+        """Keep only models that need update/insert work"""
+        changed = [m for m in models if self.has_changed(m)]
+        logger.info(
+            f"✓ Change detection: {len(changed)} changed models, "
+            f"{self.unchanged} fetched models unchanged"
+        )
+        return changed
@@ -0,0 +1,560 @@
+"""
+Snapshot diff engine: load the registry rows of existing models in bulk, diff
+them against the catalog in memory and write the changes in batches.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Collection, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, TypeVar
+
+from sqlalchemy import Select, Table, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .id_resolver import EndpointKey
+from .inserters.rows import (
+    Row,
+    ZDRLookup,
+    endpoint_key,
+    endpoint_pricing_costs,
+    zdr_key,
+)
+from .models.compact import CompactEndpoint, CompactModel
+from .models.database import (
+    LLMModel,
+    ModelArchitecture,
+    ModelArchitectureModality,
+    ModelDefaultParameters,
+    ModelEndpoint,
+    ModelEndpointPricing,
+    ModelPricing,
+    ModelSupportedParameter,
+    ModelTopProvider,
+    numeric_costs,
+)
+from .utils.validation import (
+    DefaultParametersValues,
+    is_valid_default_parameter,
+    is_valid_supported_parameter,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Model ids per IN (…) list when loading a snapshot
+SNAPSHOT_CHUNK_SIZE = 1000
+
+# Endpoint costs taken from non-ZDR endpoints; the rest only from the ZDR list
+NON_ZDR_ENDPOINT_COSTS = (
+    "prompt_cost",
+    "completion_cost",
+    "request_cost",
+    "image_cost",
+)
+
+
+def _table(model: Any) -> Table:
+    table: Table = model.__table__
+    return table
+
+
+# ============================================================================
+# SNAPSHOT
+# ============================================================================
+
+
+@dataclass
+class Snapshot:
+    """
+    Current registry rows of a set of models, as plain column dicts.
+
+    Rows are updated in place while diffing, so a model or endpoint the
+    catalog lists twice is diffed against the values its first occurrence
+    set, as if each change had been written in turn.
+    """
+
+    # (author, model_name) → llm_models.id
+    model_ids: dict[tuple[str, str], int] = field(default_factory=dict)
+    # llm_models.id → row, and one-to-one child rows by model id
+    models: dict[int, Row] = field(default_factory=dict)
+    pricing: dict[int, Row] = field(default_factory=dict)
+    architectures: dict[int, Row] = field(default_factory=dict)
+    top_providers: dict[int, Row] = field(default_factory=dict)
+    default_parameters: dict[int, Row] = field(default_factory=dict)
+    # architecture id → (modality_type, modality_value) pairs
+    modalities: dict[int, set[tuple[str, str]]] = field(default_factory=dict)
+    # model id → parameter names
+    supported_parameters: dict[int, set[str]] = field(default_factory=dict)
+    # (model_id, name, provider_name, tag) → row, endpoint id → pricing row
+    endpoints: dict[EndpointKey, Row] = field(default_factory=dict)
+    endpoint_pricing: dict[int, Row] = field(default_factory=dict)
+
+
+def supports_concurrent_stages(session: AsyncSession) -> bool:
+    """Whether per-table stages can run on separate connections at once"""
+    # SQLite allows one writer at a time, so concurrent stages would only contend
+    return session.get_bind().dialect.name == "postgresql"
+
+
+async def _run_stages(
+    session: AsyncSession,
+    stages: Sequence[Callable[[AsyncSession], Awaitable[T]]],
+    async_session: async_sessionmaker[AsyncSession] | None = None,
+) -> list[T]:
+    """
+    Run independent per-table stages and return their results in order.
+
+    With `async_session` on a database that takes concurrent writers, each
+    stage runs at the same time on its own session, committed when it
+    finishes, so the wall time approaches the slowest table instead of the
+    sum of all of them. Otherwise the stages run one after another in
+    `session`, left for the caller to commit.
+    """
+    if async_session is None or not supports_concurrent_stages(session):
+        return [await stage(session) for stage in stages]
+
+    async def run(stage: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        async with async_session() as stage_session:
+            result = await stage(stage_session)
+            await stage_session.commit()
+            return result
+
+    async with asyncio.TaskGroup() as task_group:
+        tasks = [task_group.create_task(run(stage)) for stage in stages]
+    return [task.result() for task in tasks]
+
+
+def _chunked_rows(
+    ids: Sequence[int], statement: Callable[[Sequence[int]], Select[Any]]
+) -> Callable[[AsyncSession], Awaitable[list[Row]]]:
+    """Stage selecting `statement(chunk)` for each chunk of model ids"""
+
+    async def load(session: AsyncSession) -> list[Row]:
+        rows: list[Row] = []
+        for start in range(0, len(ids), SNAPSHOT_CHUNK_SIZE):
+            result = await session.execute(
+                statement(ids[start : start + SNAPSHOT_CHUNK_SIZE])
+            )
+            rows.extend(dict(row) for row in result.mappings())
+        return rows
+
+    return load
+
+
+def _select_by_model_id(table: Table) -> Callable[[Sequence[int]], Select[Any]]:
+    return lambda chunk: select(table).where(table.c.model_id.in_(chunk))
+
+
+async def load_snapshot(
+    session: AsyncSession,
+    model_ids: Collection[int],
+    async_session: async_sessionmaker[AsyncSession] | None = None,
+) -> Snapshot:
+    """
+    Load the rows of the given models from every registry table in bulk,
+    one table per stage (concurrently with `async_session`, see _run_stages).
+    """
+    models = _table(LLMModel)
+    pricing = _table(ModelPricing)
+    architectures = _table(ModelArchitecture)
+    modalities = _table(ModelArchitectureModality)
+    top_providers = _table(ModelTopProvider)
+    supported = _table(ModelSupportedParameter)
+    defaults = _table(ModelDefaultParameters)
+    endpoints = _table(ModelEndpoint)
+    endpoint_pricing = _table(ModelEndpointPricing)
+
+    ids = sorted(set(model_ids))
+    (
+        model_rows,
+        pricing_rows,
+        architecture_rows,
+        top_provider_rows,
+        default_rows,
+        supported_rows,
+        modality_rows,
+        endpoint_rows,
+        endpoint_pricing_rows,
+    ) = await _run_stages(
+        session,
+        [
+            _chunked_rows(
+                ids, lambda chunk: select(models).where(models.c.id.in_(chunk))
+            ),
+            *(
+                _chunked_rows(ids, _select_by_model_id(table))
+                for table in (pricing, architectures, top_providers, defaults)
+            ),
+            _chunked_rows(
+                ids,
+                lambda chunk: select(
+                    supported.c.model_id, supported.c.parameter_name
+                ).where(supported.c.model_id.in_(chunk)),
+            ),
+            _chunked_rows(
+                ids,
+                lambda chunk: select(
+                    modalities.c.architecture_id,
+                    modalities.c.modality_type,
+                    modalities.c.modality_value,
+                )
+                .join(architectures, architectures.c.id == modalities.c.architecture_id)
+                .where(architectures.c.model_id.in_(chunk)),
+            ),
+            _chunked_rows(
+                ids,
+                lambda chunk: select(endpoints).where(endpoints.c.model_id.in_(chunk)),
+            ),
+            _chunked_rows(
+                ids,
+                lambda chunk: select(endpoint_pricing)
+                .join(endpoints, endpoints.c.id == endpoint_pricing.c.endpoint_id)
+                .where(endpoints.c.model_id.in_(chunk)),
+            ),
+        ],
+        async_session,
+    )
+
+    snapshot = Snapshot()
+    for row in model_rows:
+        snapshot.model_ids[(row["author"], row["model_name"])] = row["id"]
+        snapshot.models[row["id"]] = row
+    for rows, rows_by_model in (
+        (pricing_rows, snapshot.pricing),
+        (architecture_rows, snapshot.architectures),
+        (top_provider_rows, snapshot.top_providers),
+        (default_rows, snapshot.default_parameters),
+    ):
+        for row in rows:
+            rows_by_model[row["model_id"]] = row
+    for row in supported_rows:
+        snapshot.supported_parameters.setdefault(row["model_id"], set()).add(
+            row["parameter_name"]
+        )
+    for row in modality_rows:
+        snapshot.modalities.setdefault(row["architecture_id"], set()).add(
+            (row["modality_type"], row["modality_value"])
+        )
+    for row in endpoint_rows:
+        snapshot.endpoints[
+            (row["model_id"], row["name"], row["provider_name"], row["tag"])
+        ] = row
+    for row in endpoint_pricing_rows:
+        snapshot.endpoint_pricing[row["endpoint_id"]] = row
+
+    logger.info(
+        f"✓ Loaded snapshot of {len(snapshot.models)} models and "
+        f"{len(snapshot.endpoints)} endpoints"
+    )
+    return snapshot
+
+
+# ============================================================================
+# CHANGESET
+# ============================================================================
+
+
+@dataclass
+class TableChanges:
+    """Changed columns of existing rows by row id, and rows to add, for one table"""
+
+    model: type[Any]
+    updates: dict[int, Row] = field(default_factory=dict)
+    inserts: list[Row] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.updates) + len(self.inserts)
+
+    def set(self, row: Row, column: str, value: Any) -> None:
+        """Change a snapshot row's column, recording it if the value differs"""
+        if row[column] != value:
+            row[column] = value
+            self.updates.setdefault(row["id"], {})[column] = value
+
+    def fill(self, row: Row, column: str, value: Any) -> None:
+        """Set an empty column from a meaningful new value"""
+        if value and not row[column]:
+            self.set(row, column, value)
+
+    def fill_cost(self, row: Row, column: str, value: Any) -> None:
+        """Fill an empty or zero cost, along with its NUMERIC copies"""
+        if value and (not row[column] or row[column] == "0"):
+            self.set(row, column, str(value))
+            for numeric_column, cost in numeric_costs({column: str(value)}).items():
+                self.set(row, numeric_column, cost)
+
+
+@dataclass
+class Changeset:
+    """
+    Per-table changes that bring the registry in line with the catalog.
+
+    Tables are keyed by update stage, in the order they are written. Doubles
+    as the dry-run report: `counts()` gives the rows changed per stage and
+    `log_report()` the columns behind them.
+    """
+
+    tables: dict[str, TableChanges] = field(
+        default_factory=lambda: {
+            "LLM models": TableChanges(LLMModel),
+            "Model pricing": TableChanges(ModelPricing),
+            "Architecture": TableChanges(ModelArchitecture),
+            "Architecture modalities": TableChanges(ModelArchitectureModality),
+            "Top provider": TableChanges(ModelTopProvider),
+            "Endpoints": TableChanges(ModelEndpoint),
+            "Endpoint pricing": TableChanges(ModelEndpointPricing),
+            "Supported parameters": TableChanges(ModelSupportedParameter),
+            "Default parameters": TableChanges(ModelDefaultParameters),
+        }
+    )
+
+    def counts(self) -> dict[str, int]:
+        """Rows updated or added per stage"""
+        return {stage: len(changes) for stage, changes in self.tables.items()}
+
+    def log_report(self) -> None:
+        """Log the rows and columns each stage would change"""
+        if not any(self.tables.values()):
+            logger.info("Changeset: no changes to existing models")
+            return
+        logger.info("Changeset:")
+        for stage, changes in self.tables.items():
+            if changes.inserts:
+                logger.info(f"  • {stage}: {len(changes.inserts)} rows to add")
+            if not changes.updates:
+                continue
+            column_counts: dict[str, int] = {}
+            for values in changes.updates.values():
+                for column in values:
+                    column_counts[column] = column_counts.get(column, 0) + 1
+            columns = ", ".join(
+                f"{column} ×{count}"
+                for column, count in sorted(column_counts.items())
+                # Derived columns follow the ones they are derived from
+                if not column.endswith(("_numeric", "_per_1m"))
+                and column != "last_updated"
+            )
+            logger.info(
+                f"  • {stage}: {len(changes.updates)} rows to update ({columns})"
+            )
+
+
+# ============================================================================
+# DIFF RULES (fill empty fields; status-like fields always follow the latest)
+# ============================================================================
+
+
+def _diff_llm_model(
+    changes: TableChanges, row: Row, m: CompactModel, now: datetime
+) -> None:
+    changed = row["id"] in changes.updates
+    changes.fill(row, "display_name", m.name)
+    changes.fill(row, "description", m.description)
+    changes.fill(row, "context_length", m.context_length)
+    if not changed and row["id"] in changes.updates:
+        changes.set(row, "last_updated", now)
+
+
+def _diff_model_pricing(changes: TableChanges, row: Row, m: CompactModel) -> None:
+    changes.fill_cost(row, "prompt_cost", m.pricing.prompt)
+    changes.fill_cost(row, "completion_cost", m.pricing.completion)
+    changes.fill_cost(row, "request_cost", m.pricing.request)
+    changes.fill_cost(row, "image_cost", m.pricing.image)
+    changes.fill_cost(row, "web_search_cost", m.pricing.web_search)
+    changes.fill_cost(row, "internal_reasoning_cost", m.pricing.internal_reasoning)
+
+
+def _diff_architecture(changes: TableChanges, row: Row, m: CompactModel) -> None:
+    changes.fill(row, "modality", m.architecture.modality)
+    changes.fill(row, "tokenizer", m.architecture.tokenizer)
+    changes.fill(row, "instruct_type", m.architecture.instruct_type)
+
+
+def _diff_modalities(
+    changes: TableChanges,
+    architecture_id: int,
+    existing: set[tuple[str, str]],
+    m: CompactModel,
+) -> None:
+    """Add missing modalities; modalities the catalog dropped are kept"""
+    for modality_type, values in (
+        ("input", m.architecture.input_modalities),
+        ("output", m.architecture.output_modalities),
+    ):
+        for value in values:
+            if (modality_type, value) not in existing:
+                existing.add((modality_type, value))
+                changes.inserts.append(
+                    {
+                        "architecture_id": architecture_id,
+                        "modality_type": modality_type,
+                        "modality_value": value,
+                    }
+                )
+
+
+def _diff_top_provider(changes: TableChanges, row: Row, m: CompactModel) -> None:
+    """Top provider metadata always follows the latest values"""
+    if m.top_provider.context_length is not None:
+        changes.set(row, "context_length", m.top_provider.context_length)
+    if m.top_provider.max_completion_tokens is not None:
+        changes.set(row, "max_completion_tokens", m.top_provider.max_completion_tokens)
+    changes.set(row, "is_moderated", "true" if m.top_provider.is_moderated else "false")
+
+
+def _diff_endpoint(
+    changes: TableChanges, row: Row, ep: CompactEndpoint, zdr_lookup: ZDRLookup
+) -> None:
+    """Fill empty endpoint fields; status, caching and ZDR always follow the latest"""
+    changes.fill(row, "context_length", ep.context_length)
+    changes.fill(row, "quantization", ep.quantization)
+    for column, value in (
+        ("max_completion_tokens", ep.max_completion_tokens),
+        ("max_prompt_tokens", ep.max_prompt_tokens),
+    ):
+        if value is not None and row[column] is None:
+            changes.set(row, column, value)
+    changes.set(row, "status", ep.status)
+    changes.set(
+        row,
+        "supports_implicit_caching",
+        "true" if ep.supports_implicit_caching else "false",
+    )
+    changes.set(row, "is_zdr", "true" if zdr_key(ep) in zdr_lookup else "false")
+
+
+def _diff_endpoint_pricing(
+    changes: TableChanges, row: Row, ep: CompactEndpoint, zdr_lookup: ZDRLookup
+) -> None:
+    """Fill empty costs, preferring ZDR pricing, which also carries the extra costs"""
+    if zdr_key(ep) in zdr_lookup:
+        for column, value in endpoint_pricing_costs(ep, zdr_lookup).items():
+            changes.fill_cost(row, column, value)
+    else:
+        for column in NON_ZDR_ENDPOINT_COSTS:
+            changes.fill_cost(row, column, ep.pricing.get(column.removesuffix("_cost")))
+
+
+def _diff_supported_parameters(
+    changes: TableChanges, model_id: int, existing: set[str], m: CompactModel
+) -> None:
+    """Add missing valid parameters; parameters the catalog dropped are kept"""
+    for param in m.supported_parameters:
+        if param not in existing and is_valid_supported_parameter(param):
+            existing.add(param)
+            changes.inserts.append({"model_id": model_id, "parameter_name": param})
+
+
+def _diff_default_parameters(changes: TableChanges, row: Row, m: CompactModel) -> None:
+    """Merge valid catalog defaults over the stored ones"""
+    if not m.default_parameters:
+        return
+    valid_defaults = {
+        k: v for k, v in m.default_parameters.items() if is_valid_default_parameter(k)
+    }
+    if valid_defaults:
+        merged = DefaultParametersValues(
+            **{**(row["parameters"] or {}), **valid_defaults}
+        )
+        changes.set(row, "parameters", merged.model_dump(exclude_none=True))
+
+
+def diff_models(
+    snapshot: Snapshot, models: Sequence[CompactModel], zdr_lookup: ZDRLookup
+) -> Changeset:
+    """
+    Diff catalog models against a snapshot of their rows: empty fields are
+    filled, top provider metadata and
+    endpoint status, caching and ZDR flags follow the latest values, and
+    missing modalities and supported parameters are added. Models, endpoints
+    and one-to-one rows missing from the snapshot are left to the inserter.
+    """
+    changeset = Changeset()
+    tables = changeset.tables
+    now = datetime.now(UTC)
+
+    for m in models:
+        model_id = snapshot.model_ids.get((m.author, m.model_name))
+        if model_id is None:
+            continue
+
+        _diff_llm_model(tables["LLM models"], snapshot.models[model_id], m, now)
+        if (row := snapshot.pricing.get(model_id)) is not None:
+            _diff_model_pricing(tables["Model pricing"], row, m)
+        if (row := snapshot.architectures.get(model_id)) is not None:
+            _diff_architecture(tables["Architecture"], row, m)
+            _diff_modalities(
+                tables["Architecture modalities"],
+                row["id"],
+                snapshot.modalities.setdefault(row["id"], set()),
+                m,
+            )
+        if (row := snapshot.top_providers.get(model_id)) is not None:
+            _diff_top_provider(tables["Top provider"], row, m)
+
+        for ep in m.providers:
+            if (row := snapshot.endpoints.get(endpoint_key(model_id, ep))) is None:
+                continue
+            _diff_endpoint(tables["Endpoints"], row, ep, zdr_lookup)
+            if (pricing := snapshot.endpoint_pricing.get(row["id"])) is not None:
+                _diff_endpoint_pricing(
+                    tables["Endpoint pricing"], pricing, ep, zdr_lookup
+                )
+
+        _diff_supported_parameters(
+            tables["Supported parameters"],
+            model_id,
+            snapshot.supported_parameters.setdefault(model_id, set()),
+            m,
+        )
+        if (row := snapshot.default_parameters.get(model_id)) is not None:
+            _diff_default_parameters(tables["Default parameters"], row, m)
+
+    return changeset
+
+
+def _write_changes(
+    changes: TableChanges,
+) -> Callable[[AsyncSession], Awaitable[None]]:
+    """Stage writing one table's changes"""
+
+    async def write(session: AsyncSession) -> None:
+        # The ORM batches only consecutive rows with the same keys into one
+        # executemany, so rows are grouped by their changed columns first
+        by_columns: dict[tuple[str, ...], list[Row]] = {}
+        for row_id, values in changes.updates.items():
+            by_columns.setdefault(tuple(sorted(values)), []).append(
+                {"id": row_id, **values}
+            )
+        for rows in by_columns.values():
+            await session.execute(update(changes.model), rows)
+        if changes.inserts:
+            await session.execute(insert(changes.model), changes.inserts)
+
+    return write
+
+
+async def apply_changeset(
+    session: AsyncSession,
+    changeset: Changeset,
+    async_session: async_sessionmaker[AsyncSession] | None = None,
+) -> None:
+    """
+    Write a changeset: one executemany UPDATE by primary key per set of
+    changed columns and one multi-row INSERT per table.
+
+    Without `async_session` every table is written in `session` and committed
+    in one transaction. With it (PostgreSQL only), the tables are written
+    concurrently, each in its own transaction: the tables share no rows or
+    foreign keys, and a table that fails leaves the others written, to be
+    retried by the next sync's diff.
+    """
+    await _run_stages(
+        session,
+        [_write_changes(changes) for changes in changeset.tables.values() if changes],
+        async_session,
+    )
+    await session.commit()
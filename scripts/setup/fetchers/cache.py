@@ -2,162 +2,330 @@
 Caching utilities for OpenRouter API data.
 """
 
-import json
+import asyncio
 import logging
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+import httpx
+
+from .cache_store import CacheEntry, CacheStore, RawJSONPayload
+
 logger = logging.getLogger(__name__)
 
 # OpenRouter API base URL
 OPENROUTER_API_BASE = "https://openrouter.ai/api/v1"
 
+# Single SQLite database holding every cached payload
+CACHE_DB_NAME = "openrouter_cache.sqlite3"
 
-def get_cache_dir() -> Path:
-    """Get cache directory for OpenRouter data"""
-    cache_dir = Path.home() / ".cache" / "adaptive_router"
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    return cache_dir
+# Cache keys for the catalog-wide payloads
+MODELS_CACHE_KEY = "models"
+ZDR_CACHE_KEY = "zdr_endpoints"
 
+_cache_dir_override: Path | None = None
+_stores: dict[Path, CacheStore] = {}
+_writers: dict[Path, "CacheWriter"] = {}
 
-def get_models_cache_path() -> Path:
-    """Get cache file path for OpenRouter models list"""
-    return get_cache_dir() / "openrouter_models.json"
 
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Freshness rules for cached payloads.
 
-def get_endpoints_cache_dir() -> Path:
-    """Get cache directory for model endpoints"""
-    endpoints_dir = get_cache_dir() / "endpoints"
-    endpoints_dir.mkdir(parents=True, exist_ok=True)
-    return endpoints_dir
+    Entries up to `fresh_hours` old are served as-is. Older entries up to
+    `expire_hours` are stale: with a CacheRefresher they are served while a
+    background refresh runs, otherwise they are refetched in the foreground.
+    Entries past `expire_hours` are never served.
+    """
 
+    fresh_hours: float = 24.0
+    expire_hours: float = 24.0  # hard expiry; no stale window by default
 
-def get_endpoint_cache_path(model_id: str) -> Path:
-    """Get cache file path for a specific model's endpoints"""
-    # Replace / with _ for filesystem safety
-    safe_id = model_id.replace("/", "_")
-    return get_endpoints_cache_dir() / f"{safe_id}.json"
+    def __post_init__(self) -> None:
+        if self.expire_hours < self.fresh_hours:
+            raise ValueError("expire_hours must be at least fresh_hours")
 
+    def classify(self, entry: CacheEntry) -> str:
+        """Classify an entry as "fresh", "stale" or "expired" """
+        age_hours = entry.age_hours
+        if age_hours <= self.fresh_hours:
+            return "fresh"
+        if age_hours <= self.expire_hours:
+            return "stale"
+        return "expired"
 
-def get_zdr_cache_path() -> Path:
-    """Get cache file path for ZDR endpoints"""
-    return get_cache_dir() / "zdr_endpoints.json"
 
+DEFAULT_CACHE_POLICY = CachePolicy()
 
-def load_cached_models() -> list[dict[str, Any]] | None:
-    """Load cached OpenRouter models if fresh (less than 24 hours old)"""
-    cache_path = get_models_cache_path()
 
-    if not cache_path.exists():
-        return None
+def set_cache_dir(cache_dir: Path | None) -> None:
+    """Redirect the cache to another directory (None restores the default)"""
+    global _cache_dir_override
+    _cache_dir_override = cache_dir
 
-    # Check if cache is fresh (less than 24 hours old)
-    cache_age_hours = (
-        datetime.now(UTC).timestamp() - cache_path.stat().st_mtime
-    ) / 3600
 
-    if cache_age_hours > 24:
-        logger.info(f"Models cache is {cache_age_hours:.1f} hours old, will refresh")
-        return None
+def get_cache_dir() -> Path:
+    """Get cache directory for OpenRouter data"""
+    cache_dir = _cache_dir_override or Path.home() / ".cache" / "adaptive_router"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
 
+
+def get_cache_store() -> CacheStore:
+    """Get the process-wide cache store, opening it on first use"""
+    path = get_cache_dir() / CACHE_DB_NAME
+    if path not in _stores:
+        _stores[path] = CacheStore(path)
+    return _stores[path]
+
+
+def close_cache_store() -> None:
+    """Close the cache store of the current cache directory once writes are flushed"""
+    path = get_cache_dir() / CACHE_DB_NAME
+    _writers.pop(path, None)
+    store = _stores.pop(path, None)
+    if store is not None:
+        store.close()
+
+
+class CacheWriter:
+    """
+    Applies cache writes on a worker thread instead of the event loop.
+
+    Writes are queued without blocking and a single flush task commits
+    whatever accumulated while the previous batch was being written (group
+    commit), so compression and SQLite commits never stall in-flight requests.
+    A later write for the same key supersedes a pending one.
+    """
+
+    def __init__(self, store: CacheStore) -> None:
+        self.store = store
+        self._pending: dict[str, CacheEntry] = {}
+        self._touched: dict[str, CacheEntry] = {}
+        self._task: asyncio.Task[None] | None = None
+
+        # Counters for benchmarks and debugging
+        self.batches = 0
+        self.entries_written = 0
+
+    def put(self, entry: CacheEntry) -> None:
+        """Queue an entry to be written"""
+        self._touched.pop(entry.key, None)
+        self._pending[entry.key] = entry
+        self._ensure_flushing()
+
+    def touch(self, entry: CacheEntry) -> None:
+        """Reset an entry's age now and queue the timestamp update"""
+        entry.fetched_at = datetime.now(UTC).timestamp()
+        if entry.key in self._pending:
+            self._pending[entry.key].fetched_at = entry.fetched_at
+        else:
+            self._touched[entry.key] = entry
+        self._ensure_flushing()
+
+    def _ensure_flushing(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while self._pending or self._touched:
+            entries, self._pending = list(self._pending.values()), {}
+            touched, self._touched = list(self._touched.values()), {}
+            try:
+                await asyncio.to_thread(self.store.write_batch, entries, touched)
+                self.batches += 1
+                self.entries_written += len(entries)
+            except Exception as e:
+                logger.warning(f"Failed to write {len(entries)} cache entries: {e}")
+
+    async def flush(self) -> None:
+        """Wait until every queued write has been committed"""
+        task = self._task
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            await asyncio.shield(task)
+
+
+def get_cache_writer() -> CacheWriter:
+    """Get the background writer for the process-wide cache store"""
+    store = get_cache_store()
+    if store.path not in _writers:
+        _writers[store.path] = CacheWriter(store)
+    return _writers[store.path]
+
+
+async def flush_cache_writes() -> None:
+    """Wait for queued cache writes to be committed"""
+    await get_cache_writer().flush()
+
+
+def get_endpoints_cache_key(model_id: str) -> str:
+    """Get cache key for a specific model's endpoints"""
+    return f"endpoints/{model_id}"
+
+
+def write_cache_entry(
+    key: str, data: Any, response: httpx.Response | None = None
+) -> CacheEntry:
+    """Write a payload to cache together with the response's validators"""
+    headers = response.headers if response is not None else {}
+    return get_cache_store().put(
+        key,
+        data,
+        etag=headers.get("ETag"),
+        last_modified=headers.get("Last-Modified"),
+    )
+
+
+def queue_cache_entry(
+    key: str, data: Any, response: httpx.Response | None = None
+) -> None:
+    """Queue a payload and the response's validators for a background write"""
+    headers = response.headers if response is not None else {}
+    get_cache_writer().put(
+        CacheEntry(
+            key=key,
+            data=data,
+            fetched_at=datetime.now(UTC).timestamp(),
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+        )
+    )
+
+
+def mark_cache_entry_revalidated(entry: CacheEntry) -> None:
+    """Reset an entry's age after the server confirmed it is unchanged (304)"""
+    get_cache_writer().touch(entry)
+
+
+def load_models_cache_entry() -> CacheEntry | None:
+    """Load the cached OpenRouter models entry regardless of age"""
     try:
-        with open(cache_path) as f:
-            data = json.load(f)
-            logger.info(
-                f"✓ Loaded {len(data)} models from cache (age: {cache_age_hours:.1f}h)"
-            )
-            return data
+        return get_cache_store().get(MODELS_CACHE_KEY)
     except Exception as e:
         logger.warning(f"Failed to load models cache: {e}")
         return None
 
 
-def save_models_to_cache(models: list[dict[str, Any]]) -> None:
-    """Save OpenRouter models to cache"""
-    cache_path = get_models_cache_path()
+def load_cached_models(
+    policy: CachePolicy = DEFAULT_CACHE_POLICY,
+) -> list[dict[str, Any]] | None:
+    """Load cached OpenRouter models if fresh (less than 24 hours old by default)"""
+    entry = load_models_cache_entry()
+    if entry is None:
+        return None
+
+    if policy.classify(entry) != "fresh":
+        logger.info(f"Models cache is {entry.age_hours:.1f} hours old, will refresh")
+        return None
+
+    logger.info(
+        f"✓ Loaded {len(entry.data)} models from cache (age: {entry.age_hours:.1f}h)"
+    )
+    data: list[dict[str, Any]] = entry.data
+    return data
+
 
+def save_models_to_cache(
+    models: list[dict[str, Any]] | RawJSONPayload,
+    response: httpx.Response | None = None,
+) -> None:
+    """Save OpenRouter models to cache"""
     try:
-        with open(cache_path, "w") as f:
-            json.dump(models, f)
-        logger.info(f"✓ Saved {len(models)} models to cache: {cache_path}")
+        entry = write_cache_entry(MODELS_CACHE_KEY, models, response)
+        logger.info(
+            f"✓ Saved {len(entry.data)} models to cache: {get_cache_store().path}"
+        )
     except Exception as e:
         logger.warning(f"Failed to save models cache: {e}")
 
 
-def load_cached_endpoints(model_id: str) -> dict[str, Any] | None:
-    """Load cached endpoints for a model if fresh (less than 24 hours old)"""
-    cache_path = get_endpoint_cache_path(model_id)
-
-    if not cache_path.exists():
+def load_endpoints_cache_entry(model_id: str) -> CacheEntry | None:
+    """Load the cached endpoints entry for a model regardless of age"""
+    try:
+        return get_cache_store().get(get_endpoints_cache_key(model_id))
+    except Exception as e:
+        logger.debug(f"Failed to load endpoints cache for {model_id}: {e}")
         return None
 
-    # Check if cache is fresh (less than 24 hours old)
-    cache_age_hours = (
-        datetime.now(UTC).timestamp() - cache_path.stat().st_mtime
-    ) / 3600
-
-    if cache_age_hours > 24:
-        return None
 
+def load_endpoints_cache_entries(model_ids: list[str]) -> dict[str, CacheEntry]:
+    """Load cached endpoints entries for many models in one pass, keyed by model id"""
+    keys = {get_endpoints_cache_key(model_id): model_id for model_id in model_ids}
     try:
-        with open(cache_path) as f:
-            return json.load(f)
+        entries = get_cache_store().get_many(keys)
     except Exception as e:
-        logger.debug(f"Failed to load endpoints cache for {model_id}: {e}")
+        logger.warning(f"Failed to load endpoints cache: {e}")
+        return {}
+    return {keys[key]: entry for key, entry in entries.items()}
+
+
+def load_cached_endpoints(
+    model_id: str, policy: CachePolicy = DEFAULT_CACHE_POLICY
+) -> dict[str, Any] | None:
+    """Load cached endpoints for a model if fresh (less than 24 hours old by default)"""
+    entry = load_endpoints_cache_entry(model_id)
+    if entry is None or policy.classify(entry) != "fresh":
         return None
 
+    data: dict[str, Any] = entry.data
+    return data
 
-def save_endpoints_to_cache(model_id: str, endpoints_data: dict[str, Any]) -> None:
-    """Save model endpoints to cache"""
-    cache_path = get_endpoint_cache_path(model_id)
 
+def save_endpoints_to_cache(
+    model_id: str,
+    endpoints_data: dict[str, Any] | RawJSONPayload,
+    response: httpx.Response | None = None,
+) -> None:
+    """Queue model endpoints for a batched background cache write"""
     try:
-        with open(cache_path, "w") as f:
-            json.dump(endpoints_data, f)
+        queue_cache_entry(get_endpoints_cache_key(model_id), endpoints_data, response)
     except Exception as e:
         logger.debug(f"Failed to save endpoints cache for {model_id}: {e}")
 
 
-def load_cached_zdr_endpoints() -> list[dict[str, Any]] | None:
-    """Load cached ZDR endpoints if fresh (less than 24 hours old)"""
-    cache_path = get_zdr_cache_path()
-
-    if not cache_path.exists():
+def load_zdr_cache_entry() -> CacheEntry | None:
+    """Load the cached ZDR endpoints entry regardless of age"""
+    try:
+        return get_cache_store().get(ZDR_CACHE_KEY)
+    except Exception as e:
+        logger.warning(f"Failed to load ZDR endpoints cache: {e}")
         return None
 
-    # Check if cache is fresh (less than 24 hours old)
-    cache_age_hours = (
-        datetime.now(UTC).timestamp() - cache_path.stat().st_mtime
-    ) / 3600
 
-    if cache_age_hours > 24:
+def load_cached_zdr_endpoints(
+    policy: CachePolicy = DEFAULT_CACHE_POLICY,
+) -> list[dict[str, Any]] | None:
+    """Load cached ZDR endpoints if fresh (less than 24 hours old by default)"""
+    entry = load_zdr_cache_entry()
+    if entry is None:
+        return None
+
+    if policy.classify(entry) != "fresh":
         logger.info(
-            f"ZDR endpoints cache is {cache_age_hours:.1f} hours old, will refresh"
+            f"ZDR endpoints cache is {entry.age_hours:.1f} hours old, will refresh"
         )
         return None
 
-    try:
-        with open(cache_path) as f:
-            data = json.load(f)
-            logger.info(
-                f"✓ Loaded {len(data)} ZDR endpoints from cache (age: {cache_age_hours:.1f}h)"
-            )
-            return data
-    except Exception as e:
-        logger.warning(f"Failed to load ZDR endpoints cache: {e}")
-        return None
+    logger.info(
+        f"✓ Loaded {len(entry.data)} ZDR endpoints from cache (age: {entry.age_hours:.1f}h)"
+    )
+    data: list[dict[str, Any]] = entry.data
+    return data
 
 
-def save_zdr_endpoints_to_cache(zdr_endpoints: list[dict[str, Any]]) -> None:
+def save_zdr_endpoints_to_cache(
+    zdr_endpoints: list[dict[str, Any]], response: httpx.Response | None = None
+) -> None:
     """Save ZDR endpoints to cache"""
-    cache_path = get_zdr_cache_path()
-
     try:
-        with open(cache_path, "w") as f:
-            json.dump(zdr_endpoints, f)
+        write_cache_entry(ZDR_CACHE_KEY, zdr_endpoints, response)
         logger.info(
-            f"✓ Saved {len(zdr_endpoints)} ZDR endpoints to cache: {cache_path}"
+            f"✓ Saved {len(zdr_endpoints)} ZDR endpoints to cache: "
+            f"{get_cache_store().path}"
         )
     except Exception as e:
         logger.warning(f"Failed to save ZDR endpoints cache: {e}")
@@ -0,0 +1,313 @@
+"""
+Single-file SQLite store for cached OpenRouter API payloads.
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import json
+import logging
+import lzma
+import sqlite3
+import threading
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on bound parameters per statement is 999 on older builds
+_MAX_KEYS_PER_QUERY = 500
+
+# Bumped whenever the layout changes; older cache databases are rebuilt empty
+SCHEMA_VERSION = 2
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS blobs (
+        content_hash TEXT PRIMARY KEY,
+        codec TEXT NOT NULL,
+        raw_size INTEGER NOT NULL,
+        data BLOB NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        key TEXT PRIMARY KEY,
+        fetched_at REAL NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        content_hash TEXT NOT NULL REFERENCES blobs (content_hash)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_cache_entries_content_hash "
+    "ON cache_entries (content_hash)",
+)
+
+_SELECT_ENTRIES = (
+    "SELECT e.key, e.fetched_at, e.etag, e.last_modified, b.codec, b.data "
+    "FROM cache_entries e JOIN blobs b ON b.content_hash = e.content_hash"
+)
+
+CACHE_CODECS = ("zstd", "zlib", "lzma")
+
+
+def zstd_available() -> bool:
+    """Check whether the optional `zstandard` package is installed"""
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def default_codec() -> str:
+    """Fastest codec available: zstd when installed, otherwise zlib"""
+    return "zstd" if zstd_available() else "zlib"
+
+
+def compress(codec: str, raw: bytes) -> bytes:
+    """Compress a payload with one of CACHE_CODECS"""
+    if codec == "zstd":
+        zstandard = importlib.import_module("zstandard")
+        return bytes(zstandard.ZstdCompressor(level=10).compress(raw))
+    if codec == "lzma":
+        return lzma.compress(raw)
+    if codec == "zlib":
+        return zlib.compress(raw, 6)
+    raise ValueError(f"Unknown cache codec: {codec}")
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    """Decompress a payload written by `compress`"""
+    if codec == "zstd":
+        zstandard = importlib.import_module("zstandard")
+        return bytes(zstandard.ZstdDecompressor().decompress(data))
+    if codec == "lzma":
+        return lzma.decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown cache codec: {codec}")
+
+
+def encode_payload(data: Any) -> tuple[str, bytes]:
+    """Canonical JSON encoding of a payload and its SHA-256 content hash"""
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(raw).hexdigest(), raw
+
+
+@dataclass(frozen=True)
+class RawJSONPayload:
+    """
+    An undecoded response body standing in for a payload until it is written.
+
+    Lets the fetchers hand the cache the body bytes they validated, so the
+    dict decode the cache needs runs on the writer thread, not the event loop.
+    """
+
+    content: bytes
+    field: str | None = None  # top-level field holding the payload, if any
+    default: Any = None  # payload when `field` is missing
+
+    def decode(self) -> Any:
+        """Decode the body and extract the payload"""
+        data = json.loads(self.content)
+        return data.get(self.field, self.default) if self.field else data
+
+
+@dataclass
+class CacheEntry:
+    """Cached API payload plus the HTTP validators it was served with"""
+
+    key: str
+    data: Any
+    fetched_at: float  # Unix timestamp of the last fetch or revalidation
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def age_hours(self) -> float:
+        """Age of the entry in hours"""
+        return (datetime.now(UTC).timestamp() - self.fetched_at) / 3600
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for revalidation"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CacheStore:
+    """
+    Cache entries in one SQLite database in WAL mode, keyed by cache key.
+
+    Payloads are stored compressed in a content-addressed `blobs` table keyed
+    by the SHA-256 of their canonical JSON, so identical payloads (across
+    model variants or across days) are stored and compressed once; entries
+    only reference a blob. Every write or batch is one transaction, so a crash
+    never leaves a truncated entry behind, and readers are never blocked by a
+    writer. `get_many` loads thousands of entries with a handful of indexed
+    queries instead of one file open per entry.
+
+    The connection is shared across threads (serialised by a lock) so reads
+    and writes can run off the event loop via `asyncio.to_thread`.
+    """
+
+    def __init__(self, path: Path, codec: str | None = None) -> None:
+        self.path = path
+        self.codec = codec or default_codec()
+        if self.codec not in CACHE_CODECS:
+            raise ValueError(f"Unknown cache codec: {self.codec}")
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+            if version != SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS cache_entries")
+                self._conn.execute("DROP TABLE IF EXISTS blobs")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+        self.prune()
+
+    @staticmethod
+    def _to_entry(
+        row: tuple[str, float, str | None, str | None, str, bytes],
+    ) -> CacheEntry:
+        key, fetched_at, etag, last_modified, codec, data = row
+        return CacheEntry(
+            key=key,
+            data=json.loads(decompress(codec, data)),
+            fetched_at=fetched_at,
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Load one entry regardless of age"""
+        with self._lock:
+            row = self._conn.execute(
+                f"{_SELECT_ENTRIES} WHERE e.key = ?", (key,)
+            ).fetchone()
+        return self._to_entry(row) if row is not None else None
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, CacheEntry]:
+        """Load every existing entry among `keys` in batched queries"""
+        keys = list(keys)
+        entries: dict[str, CacheEntry] = {}
+        for start in range(0, len(keys), _MAX_KEYS_PER_QUERY):
+            chunk = keys[start : start + _MAX_KEYS_PER_QUERY]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"{_SELECT_ENTRIES} WHERE e.key IN ({placeholders})", chunk
+                ).fetchall()
+            for row in rows:
+                entry = self._to_entry(row)
+                entries[entry.key] = entry
+        return entries
+
+    def _insert(self, entry: CacheEntry) -> None:
+        """Insert or replace an entry inside the caller's transaction"""
+        if isinstance(entry.data, RawJSONPayload):
+            entry.data = entry.data.decode()
+        content_hash, raw = encode_payload(entry.data)
+
+        # Only compress payloads the store has not seen before
+        known = self._conn.execute(
+            "SELECT 1 FROM blobs WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        if known is None:
+            self._conn.execute(
+                "INSERT INTO blobs (content_hash, codec, raw_size, data) "
+                "VALUES (?, ?, ?, ?)",
+                (content_hash, self.codec, len(raw), compress(self.codec, raw)),
+            )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache_entries "
+            "(key, fetched_at, etag, last_modified, content_hash) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                entry.key,
+                entry.fetched_at,
+                entry.etag,
+                entry.last_modified,
+                content_hash,
+            ),
+        )
+
+    def put(
+        self,
+        key: str,
+        data: Any,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CacheEntry:
+        """Atomically insert or replace an entry, stamped with the current time"""
+        entry = CacheEntry(
+            key=key,
+            data=data,
+            fetched_at=datetime.now(UTC).timestamp(),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        with self._lock, self._conn:
+            self._insert(entry)
+        return entry
+
+    def touch(self, entry: CacheEntry) -> None:
+        """Reset an entry's fetch timestamp to now"""
+        entry.fetched_at = datetime.now(UTC).timestamp()
+        self.write_batch([], [entry])
+
+    def write_batch(
+        self, entries: Iterable[CacheEntry], touched: Iterable[CacheEntry]
+    ) -> None:
+        """Write new entries and refreshed timestamps in a single transaction"""
+        with self._lock, self._conn:
+            for entry in entries:
+                self._insert(entry)
+            self._conn.executemany(
+                "UPDATE cache_entries SET fetched_at = ? WHERE key = ?",
+                [(entry.fetched_at, entry.key) for entry in touched],
+            )
+
+    def prune(self) -> int:
+        """Delete blobs no longer referenced by any entry"""
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM blobs WHERE content_hash NOT IN "
+                "(SELECT content_hash FROM cache_entries)"
+            ).rowcount
+        if deleted:
+            logger.debug(f"Pruned {deleted} unreferenced cache blobs")
+        return deleted
+
+    def stats(self) -> dict[str, int]:
+        """Entry/blob counts and raw vs stored payload sizes"""
+        with self._lock:
+            entries, referenced_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(b.raw_size), 0) FROM cache_entries e "
+                "JOIN blobs b ON b.content_hash = e.content_hash"
+            ).fetchone()
+            blobs, raw_bytes, stored_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), "
+                "COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "blobs": blobs,
+            "referenced_bytes": referenced_bytes,
+            "raw_bytes": raw_bytes,
+            "stored_bytes": stored_bytes,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,135 @@
+"""
+Fetch-phase orchestration for the OpenRouter catalog.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import httpx
+
+from ..models.compact import CompactModel, InternPool
+from ..models.openrouter import OpenRouterModel
+from ..models.zdr import ZDREndpoint
+from .metrics import FetchMetrics
+from .openrouter import fetch_all_endpoints_parallel, fetch_openrouter_models
+from .refresh import CacheRefresher
+from .retry import RetryBudget
+from .zdr import fetch_zdr_endpoints
+
+logger = logging.getLogger(__name__)
+
+# Picks the models whose endpoints to fetch once the ZDR list is known
+ModelSelector = Callable[
+    [list[OpenRouterModel], dict[tuple[str, str, str], ZDREndpoint]],
+    list[OpenRouterModel],
+]
+
+
+@dataclass
+class CatalogFetchResult:
+    """Everything the update/insert stages need from the fetch phase"""
+
+    catalog_size: int
+    models_with_endpoints: list[CompactModel]
+    zdr_lookup: dict[tuple[str, str, str], ZDREndpoint]
+
+
+async def fetch_catalog(
+    client: httpx.AsyncClient,
+    retry_budget: RetryBudget | None = None,
+    max_concurrency: int = 64,
+    use_cache: bool = False,
+    select_models: ModelSelector | None = None,
+    metrics: FetchMetrics | None = None,
+    cache_refresher: CacheRefresher | None = None,
+) -> CatalogFetchResult:
+    """
+    Fetch models, their endpoints and the ZDR list as a small task graph.
+
+    The two independent branches run concurrently:
+
+        /models ──► /models/{id}/endpoints fan-out ──┐
+                                                     ├──► result
+        /endpoints/zdr ──────────────────────────────┘
+
+    so the critical path is the slower branch rather than the sum of both.
+
+    With `select_models`, the endpoints fan-out waits for the ZDR list and
+    only fetches the models the selector returns (see ChangeDetector).
+    """
+    started_at = time.monotonic()
+    branch_seconds: dict[str, float] = {}
+
+    async def models_branch() -> tuple[list[OpenRouterModel], list[CompactModel]]:
+        branch_started_at = time.monotonic()
+
+        logger.info("Fetching OpenRouter models...")
+        raw_models = await fetch_openrouter_models(
+            use_cache=use_cache,
+            retry_budget=retry_budget,
+            client=client,
+            metrics=metrics,
+            cache_refresher=cache_refresher,
+        )
+
+        selected_models = raw_models
+        if select_models is not None:
+            selected_models = select_models(raw_models, await zdr_task)
+
+        logger.info(
+            f"Fetching endpoints for {len(selected_models)} models in parallel..."
+        )
+        models_with_endpoints = await fetch_all_endpoints_parallel(
+            selected_models,
+            use_cache=use_cache,
+            max_concurrency=max_concurrency,
+            retry_budget=retry_budget,
+            client=client,
+            metrics=metrics,
+            cache_refresher=cache_refresher,
+            # Values are shared between this run's records only
+            pool=InternPool(),
+        )
+        logger.info(
+            f"✓ Fetched endpoints for {len(models_with_endpoints)} models (from {len(raw_models)} total)"
+        )
+
+        branch_seconds["models → endpoints"] = time.monotonic() - branch_started_at
+        return raw_models, models_with_endpoints
+
+    async def zdr_branch() -> dict[tuple[str, str, str], ZDREndpoint]:
+        branch_started_at = time.monotonic()
+
+        logger.info("Fetching ZDR endpoints...")
+        zdr_lookup = await fetch_zdr_endpoints(
+            use_cache=use_cache,
+            retry_budget=retry_budget,
+            client=client,
+            metrics=metrics,
+            cache_refresher=cache_refresher,
+        )
+        logger.info(f"✓ Fetched {len(zdr_lookup)} ZDR endpoints")
+
+        branch_seconds["ZDR"] = time.monotonic() - branch_started_at
+        return zdr_lookup
+
+    async with asyncio.TaskGroup() as task_group:
+        zdr_task = task_group.create_task(zdr_branch())
+        models_task = task_group.create_task(models_branch())
+
+    raw_models, models_with_endpoints = models_task.result()
+    branches = ", ".join(
+        f"{name} {seconds:.1f}s" for name, seconds in branch_seconds.items()
+    )
+    logger.info(
+        f"✓ Fetch phase finished in {time.monotonic() - started_at:.1f}s ({branches})"
+    )
+
+    return CatalogFetchResult(
+        catalog_size=len(raw_models),
+        models_with_endpoints=models_with_endpoints,
+        zdr_lookup=zdr_task.result(),
+    )
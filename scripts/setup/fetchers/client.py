@@ -0,0 +1,138 @@
+"""
+Shared HTTP client for OpenRouter API fetchers.
+"""
+
+import importlib.util
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+
+from .fixtures import FixtureArchive, RecordingTransport
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionStats:
+    """Connection reuse counters collected through httpcore's trace extension"""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.responses_by_http_version: dict[str, int] = {}
+
+    @property
+    def reused_requests(self) -> int:
+        """Requests that were served over an already-open connection"""
+        return max(0, self.requests - self.connections_opened)
+
+    async def trace(self, event_name: str, info: dict[str, Any]) -> None:
+        """httpcore trace callback counting new TCP connections and TLS handshakes"""
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+    async def on_request(self, request: httpx.Request) -> None:
+        """Event hook attaching the trace callback to every outgoing request"""
+        self.requests += 1
+        request.extensions["trace"] = self.trace
+
+    async def on_response(self, response: httpx.Response) -> None:
+        """Event hook recording the negotiated HTTP version"""
+        version = response.http_version
+        self.responses_by_http_version[version] = (
+            self.responses_by_http_version.get(version, 0) + 1
+        )
+
+    def log_summary(self) -> None:
+        """Log connection reuse for the run"""
+        reuse_pct = 100 * self.reused_requests / self.requests if self.requests else 0.0
+        versions = ", ".join(
+            f"{version}: {count}"
+            for version, count in sorted(self.responses_by_http_version.items())
+        )
+        logger.info(
+            f"✓ HTTP: {self.requests} requests over {self.connections_opened} "
+            f"connections ({reuse_pct:.1f}% reused, {self.tls_handshakes} TLS handshakes)"
+        )
+        if versions:
+            logger.info(f"  • Responses by protocol: {versions}")
+
+
+def http2_available() -> bool:
+    """Check whether the optional `h2` package needed for HTTP/2 is installed"""
+    return importlib.util.find_spec("h2") is not None
+
+
+def connection_limits(max_connections: int = 64) -> httpx.Limits:
+    """Pool limits keeping every connection of the fan-out alive between requests"""
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=60.0,
+    )
+
+
+def create_http_client(
+    max_connections: int = 64,
+    http2: bool = False,
+    stats: ConnectionStats | None = None,
+    timeout: float = 30.0,
+    transport: httpx.AsyncBaseTransport | None = None,
+    record: FixtureArchive | None = None,
+) -> httpx.AsyncClient:
+    """
+    Create the run-scoped client shared by every fetcher.
+
+    Keep-alive is sized so that all connections opened during the fan-out stay
+    pooled between the hundreds of small endpoint requests. HTTP/2 multiplexes
+    requests over a handful of connections and needs `httpx[http2]`; without it
+    the client falls back to HTTP/1.1. A custom `transport` (e.g. a fixture
+    replay) replaces the network transport and its pool settings; with a
+    `record` archive every response is also written to the archive.
+    """
+    if http2 and not http2_available():
+        logger.warning(
+            "HTTP/2 requested but the 'h2' package is not installed "
+            "(pip install 'httpx[http2]'); falling back to HTTP/1.1"
+        )
+        http2 = False
+
+    if record is not None:
+        transport = RecordingTransport(
+            record,
+            transport
+            or httpx.AsyncHTTPTransport(
+                http2=http2, limits=connection_limits(max_connections)
+            ),
+        )
+
+    event_hooks: dict[str, list[Any]] = {"request": [], "response": []}
+    if stats is not None:
+        event_hooks["request"].append(stats.on_request)
+        event_hooks["response"].append(stats.on_response)
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=timeout,
+        limits=connection_limits(max_connections),
+        event_hooks=event_hooks,
+        transport=transport,
+    )
+
+
+@asynccontextmanager
+async def use_client(
+    client: httpx.AsyncClient | None, max_connections: int = 64
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the injected client, or a temporary one closed on exit"""
+    if client is not None:
+        yield client
+        return
+
+    async with create_http_client(max_connections=max_connections) as own_client:
+        yield own_client
@@ -0,0 +1,265 @@
+"""
+Record/replay fixture archives for offline OpenRouter syncs.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import random
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT_VERSION = 1
+
+# Response headers kept in the archive (the body is stored decoded)
+RECORDED_HEADERS = ("content-type", "etag", "last-modified")
+
+# Conditional headers are stripped while recording so every response is a full body
+_CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+
+# Injected failures: throttling, a transient server error and a dropped connection
+INJECTED_ERRORS = ("429", "503", "connect")
+
+
+def request_key(method: str, url: httpx.URL | str) -> str:
+    """Archive key of a request, e.g. "GET https://openrouter.ai/api/v1/models" """
+    return f"{method.upper()} {httpx.URL(url)}"
+
+
+@dataclass
+class RecordedResponse:
+    """One archived HTTP response"""
+
+    status_code: int
+    headers: dict[str, str]
+    body: str
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        """Build an httpx response, answering conditional requests with 304"""
+        etag = self.headers.get("etag")
+        last_modified = self.headers.get("last-modified")
+        if (etag and request.headers.get("if-none-match") == etag) or (
+            last_modified and request.headers.get("if-modified-since") == last_modified
+        ):
+            validators = {
+                k: v for k, v in self.headers.items() if k in ("etag", "last-modified")
+            }
+            return httpx.Response(304, headers=validators, request=request)
+
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.body.encode(),
+            request=request,
+        )
+
+
+class FixtureArchive:
+    """
+    Gzipped JSON archive of API responses keyed by method and URL.
+
+    Only the latest response per request is kept. Throttling and server
+    errors are never archived, so a replay sees the response the recorded
+    run eventually succeeded with.
+    """
+
+    def __init__(
+        self,
+        responses: dict[str, RecordedResponse] | None = None,
+        recorded_at: str | None = None,
+    ) -> None:
+        self.responses = responses or {}
+        self.recorded_at = recorded_at
+
+    def __len__(self) -> int:
+        return len(self.responses)
+
+    def add(self, response: httpx.Response) -> None:
+        """Archive a response that has already been read"""
+        if response.status_code == 429 or response.status_code >= 500:
+            return
+        self.responses[request_key(response.request.method, response.request.url)] = (
+            RecordedResponse(
+                status_code=response.status_code,
+                headers={
+                    name: response.headers[name]
+                    for name in RECORDED_HEADERS
+                    if name in response.headers
+                },
+                body=response.text,
+            )
+        )
+
+    def lookup(self, request: httpx.Request) -> RecordedResponse | None:
+        """Find the archived response for a request"""
+        return self.responses.get(request_key(request.method, request.url))
+
+    @classmethod
+    def load(cls, path: Path) -> "FixtureArchive":
+        """Read an archive written by `save`"""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            document = json.load(f)
+
+        version = document.get("format")
+        if version != ARCHIVE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported fixture archive format {version} in {path} "
+                f"(expected {ARCHIVE_FORMAT_VERSION})"
+            )
+
+        responses = {
+            key: RecordedResponse(
+                status_code=entry["status_code"],
+                headers=entry["headers"],
+                body=entry["body"],
+            )
+            for key, entry in document["responses"].items()
+        }
+        logger.info(f"✓ Loaded {len(responses)} recorded responses from {path}")
+        return cls(responses, recorded_at=document.get("recorded_at"))
+
+    def save(self, path: Path) -> None:
+        """Atomically write the archive"""
+        document: dict[str, Any] = {
+            "format": ARCHIVE_FORMAT_VERSION,
+            "recorded_at": self.recorded_at or datetime.now(UTC).isoformat(),
+            "responses": {
+                key: {
+                    "status_code": r.status_code,
+                    "headers": r.headers,
+                    "body": r.body,
+                }
+                for key, r in sorted(self.responses.items())
+            },
+        }
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(document, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        logger.info(f"✓ Saved {len(self.responses)} recorded responses to {path}")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Forwards requests to a real transport and archives every response.
+
+    Conditional headers are dropped so that a cached copy never turns a
+    response into a bodiless 304 in the archive.
+    """
+
+    def __init__(
+        self, archive: FixtureArchive, transport: httpx.AsyncBaseTransport
+    ) -> None:
+        self.archive = archive
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for name in _CONDITIONAL_HEADERS:
+            if name in request.headers:
+                del request.headers[name]
+
+        response = await self.transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+
+        # The body is already decoded, so drop the framing headers that described it
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        recorded = httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=content,
+            request=request,
+            extensions={
+                k: v
+                for k, v in response.extensions.items()
+                if k in ("http_version", "reason_phrase")
+            },
+        )
+        self.archive.add(recorded)
+        return recorded
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves archived responses with optional simulated latency and failures.
+
+    Each request waits `latency` seconds plus up to `jitter` seconds, then
+    fails with probability `error_rate` (a 429, a 503 or a connection error,
+    chosen at random) before the archived response is returned. Requests
+    missing from the archive get a 404. With a `seed` the latency and error
+    sequence is reproducible.
+    """
+
+    def __init__(
+        self,
+        archive: FixtureArchive,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+        # Counters for end-of-run reporting
+        self.served = 0
+        self.missing = 0
+        self.injected: dict[str, int] = dict.fromkeys(INJECTED_ERRORS, 0)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.latency + self._random.uniform(0.0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            error = self._random.choice(INJECTED_ERRORS)
+            self.injected[error] += 1
+            if error == "connect":
+                raise httpx.ConnectError("Injected connection failure", request=request)
+            return httpx.Response(
+                int(error),
+                json={"error": {"code": int(error), "message": "Injected failure"}},
+                request=request,
+            )
+
+        recorded = self.archive.lookup(request)
+        if recorded is None:
+            self.missing += 1
+            return httpx.Response(
+                404,
+                json={"error": {"code": 404, "message": "No recorded response"}},
+                request=request,
+            )
+
+        self.served += 1
+        return recorded.to_response(request)
+
+    def log_summary(self) -> None:
+        """Log what the replay served"""
+        injected = ", ".join(f"{k} {v}" for k, v in self.injected.items())
+        logger.info(
+            f"✓ Replay: {self.served} recorded responses served, "
+            f"{self.missing} not in archive, injected failures: {injected}"
+        )
@@ -0,0 +1,250 @@
+"""
+In-process metrics for the OpenRouter fetch layer.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CACHE_OUTCOMES = ("hit", "stale", "miss", "revalidated")
+
+# Collapse per-model URLs into one route so label cardinality stays bounded
+_ENDPOINTS_ROUTE = re.compile(r"/models/.+/endpoints$")
+
+PROMETHEUS_PREFIX = "model_registry_fetch"
+
+
+def route_for(url: str) -> str:
+    """Map a request URL to its API route template (e.g. /models/{id}/endpoints)"""
+    path = httpx.URL(url).path.removeprefix("/api/v1")
+    return _ENDPOINTS_ROUTE.sub("/models/{id}/endpoints", path)
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative export"""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket"""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(estimate, self.max)
+            seen += bucket_count
+        return self.max
+
+    def cumulative_counts(self) -> list[tuple[str, int]]:
+        """(le, cumulative count) pairs including the +Inf bucket"""
+        pairs = []
+        running = 0
+        for bound, bucket_count in zip(
+            [*map(str, self.buckets), "+Inf"], self.counts, strict=True
+        ):
+            running += bucket_count
+            pairs.append((bound, running))
+        return pairs
+
+    def to_dict(self) -> dict[str, float]:
+        """Summary statistics for the JSON report"""
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 6),
+            "p90": round(self.quantile(0.9), 6),
+            "p99": round(self.quantile(0.99), 6),
+            "max": round(self.max, 6),
+        }
+
+
+class RouteMetrics:
+    """Counters and latency histogram for one API route"""
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.status_codes: dict[int, int] = {}
+        self.transport_errors = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.cache = dict.fromkeys(CACHE_OUTCOMES, 0)
+
+    @property
+    def requests(self) -> int:
+        """HTTP attempts made, including retries and transport failures"""
+        return self.latency.count
+
+    def to_dict(self) -> dict[str, Any]:
+        """Route summary for the JSON report"""
+        return {
+            "requests": self.requests,
+            "status_codes": {
+                str(code): count for code, count in sorted(self.status_codes.items())
+            },
+            "transport_errors": self.transport_errors,
+            "retries": self.retries,
+            "bytes_received": self.bytes_received,
+            "cache": self.cache,
+            "latency_seconds": self.latency.to_dict(),
+        }
+
+
+class FetchMetrics:
+    """
+    Run-scoped fetch metrics: per-route latency, status codes, retries, bytes
+    received and cache outcomes, recorded as requests happen.
+
+    Cache outcomes are `hit` (served from a fresh cache entry without a
+    request), `stale` (served while refreshing in the background),
+    `revalidated` (304 Not Modified) and `miss` (full download).
+    """
+
+    def __init__(self) -> None:
+        self.started_at = time.monotonic()
+        self.routes: dict[str, RouteMetrics] = {}
+
+    def route(self, url: str) -> RouteMetrics:
+        """Metrics for the route a URL belongs to"""
+        key = route_for(url)
+        if key not in self.routes:
+            self.routes[key] = RouteMetrics()
+        return self.routes[key]
+
+    def observe_attempt(
+        self,
+        url: str,
+        seconds: float,
+        response: httpx.Response | None,
+        error: Exception | None = None,
+    ) -> None:
+        """Record one HTTP attempt (a response or a transport error)"""
+        route = self.route(url)
+        route.latency.observe(seconds)
+        if response is not None:
+            route.status_codes[response.status_code] = (
+                route.status_codes.get(response.status_code, 0) + 1
+            )
+            # Wire bytes (pre-decompression) when streamed from the network
+            route.bytes_received += response.num_bytes_downloaded or len(
+                response.content
+            )
+        elif error is not None:
+            route.transport_errors += 1
+
+    def record_retry(self, url: str) -> None:
+        """Record that a request is about to be retried"""
+        self.route(url).retries += 1
+
+    def record_cache(self, url: str, outcome: str) -> None:
+        """Record a cache outcome (one of CACHE_OUTCOMES) for a URL"""
+        self.route(url).cache[outcome] += 1
+
+    def summary(self) -> dict[str, Any]:
+        """JSON-serialisable summary of the run"""
+        return {
+            "elapsed_seconds": round(time.monotonic() - self.started_at, 3),
+            "routes": {
+                name: route.to_dict() for name, route in sorted(self.routes.items())
+            },
+        }
+
+    def log_summary(self) -> None:
+        """Log a per-route summary for the run"""
+        for name, route in sorted(self.routes.items()):
+            latency = route.latency
+            cache = ", ".join(f"{k} {v}" for k, v in route.cache.items())
+            logger.info(
+                f"✓ Fetch {name}: {route.requests} requests, {route.retries} retries, "
+                f"{route.bytes_received / 1024:.0f} KiB, "
+                f"p50 {latency.quantile(0.5) * 1000:.0f}ms / "
+                f"p99 {latency.quantile(0.99) * 1000:.0f}ms, cache: {cache}"
+            )
+
+    def write_json(self, path: Path) -> None:
+        """Write the summary as JSON"""
+        path.write_text(json.dumps(self.summary(), indent=2))
+        logger.info(f"✓ Saved fetch metrics to {path}")
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format"""
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> str:
+            full_name = f"{PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            return full_name
+
+        routes = sorted(self.routes.items())
+
+        name = family(
+            "request_duration_seconds", "histogram", "HTTP attempt latency by route"
+        )
+        for route_name, route in routes:
+            for bound, count in route.latency.cumulative_counts():
+                lines.append(
+                    f'{name}_bucket{{route="{route_name}",le="{bound}"}} {count}'
+                )
+            lines.append(f'{name}_sum{{route="{route_name}"}} {route.latency.sum}')
+            lines.append(f'{name}_count{{route="{route_name}"}} {route.latency.count}')
+
+        name = family("responses_total", "counter", "HTTP responses by status code")
+        for route_name, route in routes:
+            for code, count in sorted(route.status_codes.items()):
+                lines.append(f'{name}{{route="{route_name}",code="{code}"}} {count}')
+
+        for metric, attr, help_text in (
+            ("transport_errors_total", "transport_errors", "Failed HTTP attempts"),
+            ("retries_total", "retries", "Retried HTTP attempts"),
+            ("response_bytes_total", "bytes_received", "Response bytes received"),
+        ):
+            name = family(metric, "counter", help_text)
+            for route_name, route in routes:
+                lines.append(f'{name}{{route="{route_name}"}} {getattr(route, attr)}')
+
+        name = family("cache_lookups_total", "counter", "Cache outcomes by route")
+        for route_name, route in routes:
+            for outcome, count in route.cache.items():
+                lines.append(
+                    f'{name}{{route="{route_name}",outcome="{outcome}"}} {count}'
+                )
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path) -> None:
+        """Atomically write a node_exporter textfile-collector file"""
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(self.to_prometheus())
+        os.replace(tmp_path, path)
+        logger.info(f"✓ Saved Prometheus fetch metrics to {path}")
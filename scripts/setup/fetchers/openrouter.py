@@ -5,73 +5,136 @@ OpenRouter API fetching utilities.
 import asyncio
 import logging
 import sys
-from datetime import UTC, datetime
-from typing import Any
+from collections.abc import Awaitable, Callable
 
 import httpx
+from pydantic import ValidationError
 
+from ..models.compact import CompactModel, InternPool
 from ..models.openrouter import (
     Endpoint,
     OpenRouterModel,
-    OpenRouterModelWithEndpoints,
-    parse_openrouter_model,
+    parse_endpoints,
+    parse_endpoints_json,
+    parse_openrouter_models,
+    parse_openrouter_models_json,
 )
 from .cache import (
     OPENROUTER_API_BASE,
-    load_cached_endpoints,
-    load_cached_models,
+    CacheEntry,
+    RawJSONPayload,
+    flush_cache_writes,
+    load_endpoints_cache_entries,
+    load_endpoints_cache_entry,
+    load_models_cache_entry,
+    mark_cache_entry_revalidated,
     save_endpoints_to_cache,
     save_models_to_cache,
 )
+from .client import use_client
+from .metrics import FetchMetrics
+from .refresh import CacheRefresher, serve_from_cache
+from .retry import DEFAULT_RETRY_POLICY, RetryBudget, RetryPolicy, get_with_retry
+from .scheduler import AdaptiveConcurrencyLimiter
 
 logger = logging.getLogger(__name__)
 
+# Models whose cached endpoints are read from the cache store per query
+CACHE_PREFETCH_SIZE = 500
 
-async def fetch_openrouter_models(use_cache: bool = True) -> list[OpenRouterModel]:
+
+async def _request_models_data(
+    client: httpx.AsyncClient,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retry_budget: RetryBudget | None = None,
+    cache_entry: CacheEntry | None = None,
+    metrics: FetchMetrics | None = None,
+) -> list[OpenRouterModel]:
+    """
+    Request and validate the models list, raising on HTTP errors.
+    A cached entry is revalidated conditionally and reused on 304.
+    """
+    url = f"{OPENROUTER_API_BASE}/models"
+    headers = cache_entry.conditional_headers() if cache_entry else None
+
+    response = await get_with_retry(
+        client, url, retry_policy, retry_budget, headers=headers, metrics=metrics
+    )
+    if response.status_code == 304 and cache_entry is not None:
+        mark_cache_entry_revalidated(cache_entry)
+        if metrics is not None:
+            metrics.record_cache(url, "revalidated")
+        logger.info("✓ Models unchanged upstream (304), using cached copy")
+        return parse_openrouter_models(cache_entry.data)
+
+    response.raise_for_status()
+    if metrics is not None:
+        metrics.record_cache(url, "miss")
+
+    # Save the body to cache (with validators for the next revalidation); it is
+    # decoded on the worker thread while the models are validated from bytes
+    save = asyncio.create_task(
+        asyncio.to_thread(
+            save_models_to_cache, RawJSONPayload(response.content, "data", []), response
+        )
+    )
+    models = parse_openrouter_models_json(response.content)
+    await save
+    return models
+
+
+async def fetch_openrouter_models(
+    use_cache: bool = True,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retry_budget: RetryBudget | None = None,
+    client: httpx.AsyncClient | None = None,
+    metrics: FetchMetrics | None = None,
+    cache_refresher: CacheRefresher | None = None,
+) -> list[OpenRouterModel]:
     """
     Fetch all models from OpenRouter API (async) and parse into Pydantic models.
-    Uses 24-hour cache by default to avoid unnecessary API calls.
-    """
-    # Try to load from cache first
-    if use_cache:
-        cached_raw = load_cached_models()
-        if cached_raw is not None:
-            models = [
-                parsed_model
-                for raw_model in cached_raw
-                if (parsed_model := parse_openrouter_model(raw_model)) is not None
-            ]
-            return models
-
-    # Fetch from API
-    url = "https://openrouter.ai/api/v1/models"
+    Uses 24-hour cache by default to avoid unnecessary API calls; with a
+    `cache_refresher`, stale entries within its policy are served immediately
+    and refreshed in the background. When the cache is bypassed or expired, a
+    cached copy is still revalidated with If-None-Match/If-Modified-Since and
+    reused on 304 Not Modified.
+    Transient failures are retried according to `retry_policy`.
+    """
+    url = f"{OPENROUTER_API_BASE}/models"
+    cache_entry = await asyncio.to_thread(load_models_cache_entry)
+
+    async def refresh() -> None:
+        async with use_client(client) as http_client:
+            await _request_models_data(
+                http_client, retry_policy, retry_budget, cache_entry, metrics
+            )
+
+    # Try to serve from cache first
+    if use_cache and cache_entry is not None:
+        outcome = serve_from_cache(cache_entry, cache_refresher, refresh)
+        if outcome is not None:
+            if metrics is not None:
+                metrics.record_cache(url, outcome)
+            logger.info(
+                f"✓ Loaded {len(cache_entry.data)} models from cache "
+                f"(age: {cache_entry.age_hours:.1f}h, {outcome})"
+            )
+            return parse_openrouter_models(cache_entry.data)
+
+    # Fetch from API, revalidating any cached copy
     logger.info(f"Fetching models from {url}")
-
-    async with httpx.AsyncClient(
-        timeout=30.0, limits=httpx.Limits(max_connections=100)
-    ) as client:
+    async with use_client(client) as http_client:
         try:
-            response = await client.get(url)
-            response.raise_for_status()
-            data = response.json()
-            raw_models: list[dict[str, Any]] = data.get("data", [])
-
-            # Save to cache
-            if use_cache:
-                save_models_to_cache(raw_models)
-
-            # Parse into Pydantic models for strict typing using comprehension
-            models = [
-                parsed_model
-                for raw_model in raw_models
-                if (parsed_model := parse_openrouter_model(raw_model)) is not None
-            ]
-
-            logger.info(f"✓ Fetched and parsed {len(models)} models from OpenRouter")
-            return models
+            models = await _request_models_data(
+                http_client, retry_policy, retry_budget, cache_entry, metrics
+            )
         except httpx.HTTPError as e:
-            logger.error(f"❌ Failed to fetch models: {e}")
+            logger.error(f"❌ Failed to fetch models after retries: {e}")
             sys.exit(1)
+    await flush_cache_writes()
+
+    logger.info(f"✓ Fetched and parsed {len(models)} models from OpenRouter")
+    return models
 
 
 def parse_provider_model(model_id: str) -> tuple[str | None, str | None]:
@@ -96,94 +159,344 @@ def normalize_model_name(model_name: str) -> str:
     return model_name
 
 
-async def fetch_model_endpoints(
-    client: httpx.AsyncClient, model: OpenRouterModel, use_cache: bool = True
-) -> OpenRouterModelWithEndpoints | None:
-    """
-    Fetch endpoints for a model from OpenRouter API with caching.
-    Returns None if endpoints cannot be fetched.
-    """
-    # Try to load from cache first
-    cached_data = None
-    if use_cache:
-        cached_data = load_cached_endpoints(model.id)
+def endpoints_url(model_id: str) -> str:
+    """URL of the endpoints listing for a model"""
+    return f"{OPENROUTER_API_BASE}/models/{model_id}/endpoints"
 
-    # If cache miss, fetch from API
-    if cached_data is None:
-        url = f"{OPENROUTER_API_BASE}/models/{model.id}/endpoints"
 
-        try:
-            response = await client.get(url)
-            response.raise_for_status()
-            cached_data = response.json().get("data", {})
+async def _request_endpoints_data(
+    client: httpx.AsyncClient,
+    model_id: str,
+    limiter: AdaptiveConcurrencyLimiter | None = None,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retry_budget: RetryBudget | None = None,
+    cache_entry: CacheEntry | None = None,
+    metrics: FetchMetrics | None = None,
+) -> list[Endpoint]:
+    """
+    Request and validate the endpoints of a model, raising on HTTP errors or
+    invalid endpoints. A cached entry is revalidated conditionally and
+    reused on 304.
+    """
+    url = endpoints_url(model_id)
+    headers = cache_entry.conditional_headers() if cache_entry else None
+
+    response = await get_with_retry(
+        client, url, retry_policy, retry_budget, limiter, headers, metrics
+    )
+    if response.status_code == 304 and cache_entry is not None:
+        mark_cache_entry_revalidated(cache_entry)
+        if metrics is not None:
+            metrics.record_cache(url, "revalidated")
+        return parse_endpoints(cache_entry.data.get("endpoints", []))
+
+    response.raise_for_status()
+    if metrics is not None:
+        metrics.record_cache(url, "miss")
+
+    # Save to cache (with validators for the next revalidation); the body is
+    # decoded by the background writer, the endpoints are validated from bytes
+    save_endpoints_to_cache(
+        model_id, RawJSONPayload(response.content, "data", {}), response
+    )
+    return parse_endpoints_json(response.content)
+
+
+async def _load_endpoints_data(
+    client: httpx.AsyncClient,
+    model: OpenRouterModel,
+    cache_entry: CacheEntry | None,
+    use_cache: bool = True,
+    limiter: AdaptiveConcurrencyLimiter | None = None,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retry_budget: RetryBudget | None = None,
+    metrics: FetchMetrics | None = None,
+    cache_refresher: CacheRefresher | None = None,
+) -> list[Endpoint]:
+    """Load validated endpoints from cache or the API, raising on HTTP errors"""
+    if use_cache and cache_entry is not None:
+        outcome = serve_from_cache(
+            cache_entry,
+            cache_refresher,
+            lambda: _request_endpoints_data(
+                client,
+                model.id,
+                limiter,
+                retry_policy,
+                retry_budget,
+                cache_entry,
+                metrics,
+            ),
+        )
+        if outcome is not None:
+            if metrics is not None:
+                metrics.record_cache(endpoints_url(model.id), outcome)
+            return parse_endpoints(cache_entry.data.get("endpoints", []))
 
-            # Save to cache
-            if use_cache:
-                save_endpoints_to_cache(model.id, cached_data)
+    return await _request_endpoints_data(
+        client, model.id, limiter, retry_policy, retry_budget, cache_entry, metrics
+    )
 
-        except httpx.HTTPError as e:
-            logger.warning(f"Failed to fetch endpoints for {model.id}: {e}")
-            return None
-        except Exception as e:
-            logger.warning(f"Error fetching endpoints for {model.id}: {e}")
-            return None
 
-    # Parse cached/fetched data
+def build_model_with_endpoints(
+    model: OpenRouterModel, endpoints: list[Endpoint], pool: InternPool
+) -> CompactModel | None:
+    """
+    Combine a model with its validated endpoints, returning None if invalid.
+    Repeated values are shared through `pool`, one per fetch run.
+    """
     try:
-        # Parse endpoints
-        endpoints_data = cached_data.get("endpoints", [])
-        endpoints = [Endpoint(**ep) for ep in endpoints_data]
-
         # Parse author/model_name
         author, model_name = parse_provider_model(model.id)
         if not author or not model_name:
             logger.warning(f"Could not parse author/model from {model.id}")
             return None
 
-        # Convert timestamp
-        created_at = datetime.fromtimestamp(model.created, tz=UTC)
-
-        return OpenRouterModelWithEndpoints(
-            openrouter_id=model.id,
-            name=model.name,
-            description=model.description,
-            context_length=model.context_length,
-            pricing=model.pricing,
-            architecture=model.architecture,
-            top_provider=model.top_provider,
-            created=model.created,
-            supported_parameters=model.supported_parameters,
-            default_parameters=model.default_parameters,
-            providers=endpoints,
-            author=author,
-            model_name=model_name,
-            created_at=created_at,
-        )
+        # Model and endpoints were validated at the API boundary
+        return CompactModel.from_validated(model, endpoints, author, model_name, pool)
     except Exception as e:
         logger.warning(f"Error processing endpoints data for {model.id}: {e}")
         return None
 
 
-async def fetch_all_endpoints_parallel(
-    models: list[OpenRouterModel], use_cache: bool = True
-) -> list[OpenRouterModelWithEndpoints]:
-    """Fetch endpoints for all models in parallel with caching"""
-    # Create a single client for all requests
-    async with httpx.AsyncClient(
-        timeout=30.0, limits=httpx.Limits(max_connections=100)
-    ) as client:
-        # Run all endpoint fetches concurrently (with caching)
-        results = await asyncio.gather(
-            *[fetch_model_endpoints(client, model, use_cache) for model in models]
+async def _fetch_endpoints_payload(
+    client: httpx.AsyncClient,
+    model: OpenRouterModel,
+    cache_entry: CacheEntry | None,
+    use_cache: bool = True,
+    limiter: AdaptiveConcurrencyLimiter | None = None,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retry_budget: RetryBudget | None = None,
+    metrics: FetchMetrics | None = None,
+    cache_refresher: CacheRefresher | None = None,
+) -> list[Endpoint] | None:
+    """Load a model's validated endpoints, returning None (and logging) on failure"""
+    try:
+        return await _load_endpoints_data(
+            client,
+            model,
+            cache_entry,
+            use_cache,
+            limiter,
+            retry_policy,
+            retry_budget,
+            metrics,
+            cache_refresher,
         )
+    except httpx.HTTPError as e:
+        logger.warning(f"Failed to fetch endpoints for {model.id}: {e}")
+        return None
+    except ValidationError as e:
+        logger.warning(f"Error processing endpoints data for {model.id}: {e}")
+        return None
+    except Exception as e:
+        logger.warning(f"Error fetching endpoints for {model.id}: {e}")
+        return None
+
+
+async def fetch_model_endpoints(
+    client: httpx.AsyncClient,
+    model: OpenRouterModel,
+    use_cache: bool = True,
+    limiter: AdaptiveConcurrencyLimiter | None = None,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retry_budget: RetryBudget | None = None,
+    metrics: FetchMetrics | None = None,
+    cache_refresher: CacheRefresher | None = None,
+    pool: InternPool | None = None,
+) -> CompactModel | None:
+    """
+    Fetch endpoints for a model from OpenRouter API with caching.
+    Returns None if endpoints cannot be fetched after retries.
+    """
+    endpoints = await _fetch_endpoints_payload(
+        client,
+        model,
+        await asyncio.to_thread(load_endpoints_cache_entry, model.id),
+        use_cache,
+        limiter,
+        retry_policy,
+        retry_budget,
+        metrics,
+        cache_refresher,
+    )
+    if endpoints is None:
+        return None
+
+    return build_model_with_endpoints(model, endpoints, pool or InternPool())
+
+
+# Called once per model with its validated endpoints (None if the fetch failed)
+EndpointsPayloadHandler = Callable[
+    [int, OpenRouterModel, list[Endpoint] | None], Awaitable[None]
+]
+
 
-    # Count cache hits for logging
-    if use_cache:
-        cache_hits = sum(
-            1 for model in models if load_cached_endpoints(model.id) is not None
+async def _run_endpoint_workers(
+    models: list[OpenRouterModel],
+    handle_payload: EndpointsPayloadHandler,
+    use_cache: bool = True,
+    max_concurrency: int = 64,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retry_budget: RetryBudget | None = None,
+    client: httpx.AsyncClient | None = None,
+    metrics: FetchMetrics | None = None,
+    cache_refresher: CacheRefresher | None = None,
+) -> None:
+    """
+    Fetch every model's endpoints payload with adaptive concurrency.
+
+    A fixed pool of workers drains a queue of models while an AIMD limiter
+    decides how many requests may be in flight at once. Throttled or failed
+    requests are retried with backoff (honouring Retry-After) instead of
+    dropping the model. Cached entries are read from the cache store on a
+    worker thread in batches of CACHE_PREFETCH_SIZE models, one batch ahead
+    of the workers, and cache writes are committed in the background, so
+    disk I/O never blocks in-flight requests.
+
+    Background refreshes of stale entries reuse the workers' client, so they
+    are only scheduled when a run-scoped `client` is passed in.
+    """
+    if client is None:
+        cache_refresher = None
+
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=min(16, max_concurrency), max_limit=max_concurrency
+    )
+    queue: asyncio.Queue[tuple[int, OpenRouterModel]] = asyncio.Queue()
+    for index, model in enumerate(models):
+        queue.put_nowait((index, model))
+
+    prefetches: dict[int, asyncio.Task[dict[str, CacheEntry]]] = {}
+
+    def prefetch(chunk: int) -> asyncio.Task[dict[str, CacheEntry]]:
+        if chunk not in prefetches:
+            start = chunk * CACHE_PREFETCH_SIZE
+            model_ids = [m.id for m in models[start : start + CACHE_PREFETCH_SIZE]]
+            prefetches[chunk] = asyncio.create_task(
+                asyncio.to_thread(load_endpoints_cache_entries, model_ids)
+            )
+            # Models are dequeued in order, so older chunks are fully consumed
+            prefetches.pop(chunk - 2, None)
+        return prefetches[chunk]
+
+    async def take_cache_entry(index: int, model: OpenRouterModel) -> CacheEntry | None:
+        chunk = index // CACHE_PREFETCH_SIZE
+        entries = prefetch(chunk)
+        if (chunk + 1) * CACHE_PREFETCH_SIZE < len(models):
+            prefetch(chunk + 1)  # Read ahead while this chunk is being fetched
+        return (await entries).pop(model.id, None)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while True:
+            try:
+                index, model = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            endpoints = await _fetch_endpoints_payload(
+                client,
+                model,
+                await take_cache_entry(index, model),
+                use_cache,
+                limiter,
+                retry_policy,
+                retry_budget,
+                metrics,
+                cache_refresher,
+            )
+            await handle_payload(index, model, endpoints)
+
+    # Share one client (injected or temporary) across all workers
+    async with use_client(client, max_connections=max_concurrency) as http_client:
+        await asyncio.gather(
+            *[worker(http_client) for _ in range(min(max_concurrency, len(models)))]
         )
-        cache_misses = len(models) - cache_hits
-        logger.info(f"  • Cache: {cache_hits} hits, {cache_misses} misses")
+    await flush_cache_writes()
+
+    logger.info(
+        f"  • Concurrency: final limit {limiter.limit} (peak {limiter.peak_limit}, "
+        f"max {max_concurrency}), {limiter.congestion_events} throttled/failed requests"
+    )
+    if retry_budget is not None:
+        logger.info(
+            f"  • Retries: {retry_budget.used} used, {retry_budget.remaining} left in budget"
+        )
+
+
+async def fetch_all_endpoints_parallel(
+    models: list[OpenRouterModel],
+    use_cache: bool = True,
+    max_concurrency: int = 64,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retry_budget: RetryBudget | None = None,
+    client: httpx.AsyncClient | None = None,
+    metrics: FetchMetrics | None = None,
+    cache_refresher: CacheRefresher | None = None,
+    pool: InternPool | None = None,
+) -> list[CompactModel]:
+    """
+    Fetch endpoints for all models with adaptive concurrency and caching.
+    Records share repeated values through `pool` (a fresh one if not given).
+    """
+    results: list[CompactModel | None] = [None] * len(models)
+    pool = pool or InternPool()
+
+    async def collect(
+        index: int, model: OpenRouterModel, endpoints: list[Endpoint] | None
+    ) -> None:
+        if endpoints is not None:
+            results[index] = build_model_with_endpoints(model, endpoints, pool)
+
+    await _run_endpoint_workers(
+        models,
+        collect,
+        use_cache,
+        max_concurrency,
+        retry_policy,
+        retry_budget,
+        client,
+        metrics,
+        cache_refresher,
+    )
 
     # Filter out None values
     return [m for m in results if m is not None]
+
+
+async def stream_endpoints_payloads(
+    models: list[OpenRouterModel],
+    output: asyncio.Queue[tuple[OpenRouterModel, list[Endpoint]] | None],
+    use_cache: bool = True,
+    max_concurrency: int = 64,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retry_budget: RetryBudget | None = None,
+    client: httpx.AsyncClient | None = None,
+    metrics: FetchMetrics | None = None,
+    cache_refresher: CacheRefresher | None = None,
+) -> None:
+    """
+    Fetch endpoints for all models, pushing validated endpoints onto `output` as they
+    arrive, followed by a None sentinel once every model has been handled.
+    A bounded queue applies backpressure: workers stop fetching while
+    downstream stages are behind. Failed models are logged and not forwarded.
+    """
+
+    async def forward(
+        index: int, model: OpenRouterModel, endpoints: list[Endpoint] | None
+    ) -> None:
+        if endpoints is not None:
+            await output.put((model, endpoints))
+
+    await _run_endpoint_workers(
+        models,
+        forward,
+        use_cache,
+        max_concurrency,
+        retry_policy,
+        retry_budget,
+        client,
+        metrics,
+        cache_refresher,
+    )
+    await output.put(None)
@@ -0,0 +1,94 @@
+"""
+Stale-while-revalidate support for cached OpenRouter data.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+from .cache import DEFAULT_CACHE_POLICY, CachePolicy, flush_cache_writes
+from .cache_store import CacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Re-fetches a cached payload and saves it back to the cache
+CacheRefresh = Callable[[], Awaitable[object]]
+
+
+class CacheRefresher:
+    """
+    Serves stale cache entries while refreshing them in the background.
+
+    Refreshes are scheduled as tasks (at most one per cache key) and drained
+    before the HTTP client closes. A refresh that fails or does not finish in
+    time leaves the entry stale, so the next run serves it and tries again
+    until the policy's hard expiry forces a foreground fetch.
+    """
+
+    def __init__(self, policy: CachePolicy = DEFAULT_CACHE_POLICY) -> None:
+        self.policy = policy
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+
+        # Counters for end-of-run reporting
+        self.scheduled = 0
+        self.refreshed = 0
+        self.failed = 0
+
+    def schedule(self, key: str, refresh: CacheRefresh) -> None:
+        """Start a background refresh for a cache key unless one is running"""
+        if key in self._tasks:
+            return
+        self.scheduled += 1
+        self._tasks[key] = asyncio.create_task(self._run(key, refresh))
+
+    async def _run(self, key: str, refresh: CacheRefresh) -> None:
+        try:
+            await refresh()
+            self.refreshed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Background refresh of {key} failed: {e}")
+
+    async def drain(self, timeout: float = 60.0) -> None:
+        """Wait for pending refreshes, cancelling any still running after `timeout`"""
+        if not self._tasks:
+            return
+
+        started_at = time.monotonic()
+        logger.info(f"Waiting for {len(self._tasks)} background cache refreshes...")
+        _, pending = await asyncio.wait(self._tasks.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks.clear()
+        await flush_cache_writes()
+
+        logger.info(
+            f"✓ Background refresh: {self.refreshed} refreshed, {self.failed} failed, "
+            f"{len(pending)} deferred to the next run "
+            f"({time.monotonic() - started_at:.1f}s)"
+        )
+
+
+def serve_from_cache(
+    entry: CacheEntry,
+    refresher: CacheRefresher | None,
+    refresh: CacheRefresh,
+) -> str | None:
+    """
+    Decide whether a cached entry can be served without a foreground fetch.
+
+    Returns "hit" for a fresh entry and "stale" for a stale one that is
+    served while `refresh` runs in the background (only with a refresher).
+    Returns None when the entry must be refetched before use.
+    """
+    policy = refresher.policy if refresher is not None else DEFAULT_CACHE_POLICY
+    freshness = policy.classify(entry)
+
+    if freshness == "fresh":
+        return "hit"
+    if freshness == "stale" and refresher is not None:
+        refresher.schedule(entry.key, refresh)
+        return "stale"
+    return None
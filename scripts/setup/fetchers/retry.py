@@ -0,0 +1,160 @@
+"""
+Retry utilities shared by all OpenRouter API fetchers.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from .metrics import FetchMetrics
+from .scheduler import AdaptiveConcurrencyLimiter
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: timeouts, throttling and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff settings for a single logical request"""
+
+    max_attempts: int = 5
+    base_delay: float = 0.5  # seconds, doubled per attempt
+    max_delay: float = 30.0  # cap for computed backoff
+    max_retry_after: float = 60.0  # give up if the server asks us to wait longer
+    attempt_timeout: float = 30.0  # timeout for each individual attempt
+    deadline: float = 120.0  # overall budget for the request including retries
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+class RetryBudget:
+    """Run-wide cap on retries shared by every fetcher"""
+
+    def __init__(self, max_retries: int = 500) -> None:
+        self.max_retries = max_retries
+        self.used = 0
+
+    @property
+    def remaining(self) -> int:
+        """Retries left before the budget is exhausted"""
+        return max(0, self.max_retries - self.used)
+
+    def try_acquire(self) -> bool:
+        """Consume one retry from the budget, returning False when exhausted"""
+        if self.used >= self.max_retries:
+            return False
+        self.used += 1
+        return True
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+def compute_backoff(policy: RetryPolicy, attempt: int) -> float:
+    """Exponential backoff with full jitter for the given (1-based) attempt"""
+    ceiling = min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+
+async def get_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    budget: RetryBudget | None = None,
+    limiter: AdaptiveConcurrencyLimiter | None = None,
+    headers: dict[str, str] | None = None,
+    metrics: FetchMetrics | None = None,
+) -> httpx.Response:
+    """
+    GET a URL, retrying transport errors and retryable status codes.
+
+    Retries use exponential backoff with full jitter unless the server sends a
+    Retry-After header, and stop once `policy.max_attempts`, the per-request
+    deadline or the shared retry budget is exhausted. The final response is
+    returned even if it is an error (callers still call `raise_for_status()`);
+    the last transport error is re-raised if no response was received.
+    """
+    deadline = time.monotonic() + policy.deadline
+    attempt = 0
+
+    while True:
+        attempt += 1
+        remaining = deadline - time.monotonic()
+        timeout = max(0.1, min(policy.attempt_timeout, remaining))
+
+        response: httpx.Response | None = None
+        error: httpx.TransportError | None = None
+        started_at = time.monotonic()
+        try:
+            if limiter is None:
+                response = await client.get(url, headers=headers, timeout=timeout)
+            else:
+                async with limiter.slot() as permit:
+                    started_at = time.monotonic()  # Exclude time queued for a slot
+                    response = await client.get(url, headers=headers, timeout=timeout)
+                    permit.record(response.status_code)
+        except httpx.TransportError as e:
+            error = e
+
+        if metrics is not None:
+            metrics.observe_attempt(url, time.monotonic() - started_at, response, error)
+
+        if response is not None and response.status_code not in RETRYABLE_STATUS_CODES:
+            return response
+
+        retry_after = (
+            parse_retry_after(response.headers.get("Retry-After"))
+            if response is not None
+            else None
+        )
+        delay = (
+            retry_after if retry_after is not None else compute_backoff(policy, attempt)
+        )
+        reason = f"HTTP {response.status_code}" if response is not None else repr(error)
+
+        give_up = (
+            attempt >= policy.max_attempts
+            or delay > policy.max_retry_after
+            or time.monotonic() + delay >= deadline
+            or (budget is not None and not budget.try_acquire())
+        )
+        if give_up:
+            logger.debug(f"Giving up on {url} after {attempt} attempt(s): {reason}")
+            if response is not None:
+                return response
+            assert error is not None
+            raise error
+
+        if metrics is not None:
+            metrics.record_retry(url)
+        logger.debug(
+            f"Retrying {url} in {delay:.2f}s (attempt {attempt}/{policy.max_attempts}): {reason}"
+        )
+        await asyncio.sleep(delay)
@@ -0,0 +1,140 @@
+"""
+Adaptive concurrency control for OpenRouter API fan-out.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+# Status codes that signal the upstream is overloaded or rate limiting us
+CONGESTION_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class ConcurrencyPermit:
+    """A single in-flight request slot handed out by the limiter"""
+
+    def __init__(self) -> None:
+        self.started_at = time.monotonic()
+        self.status_code: int | None = None
+
+    def record(self, status_code: int) -> None:
+        """Record the HTTP status code observed for this request"""
+        self.status_code = status_code
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) concurrency limiter.
+
+    The limit grows by roughly one slot per window of successful requests while
+    latency stays within `latency_tolerance` times the best latency observed, and
+    is cut by `decrease_factor` when the upstream answers with 429/5xx or the
+    request fails at the transport level. At most one decrease is applied per
+    latency window so a burst of failures from the same window is not
+    double-counted.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 16,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_tolerance: float = 2.0,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError(
+                f"Invalid concurrency bounds: min={min_limit}, max={max_limit}"
+            )
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+        self._min_latency: float | None = None
+        self._ewma_latency: float | None = None
+        self._last_decrease_at = 0.0
+
+        # Counters for end-of-run reporting
+        self.peak_limit = int(self._limit)
+        self.successes = 0
+        self.congestion_events = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit (whole slots)"""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently holding a slot"""
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[ConcurrencyPermit]:
+        """Hold a concurrency slot for the duration of one HTTP request"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+        permit = ConcurrencyPermit()
+        failed = False
+        try:
+            yield permit
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            latency = time.monotonic() - permit.started_at
+            if failed or permit.status_code in CONGESTION_STATUS_CODES:
+                self._on_congestion()
+            elif permit.status_code is not None:
+                self._on_success(latency)
+
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _on_success(self, latency: float) -> None:
+        """Additive increase while latency stays near the observed baseline"""
+        self.successes += 1
+
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        self._ewma_latency = (
+            latency
+            if self._ewma_latency is None
+            else 0.8 * self._ewma_latency + 0.2 * latency
+        )
+
+        # Hold the limit steady when queueing delay is building up upstream
+        if self._ewma_latency > self.latency_tolerance * self._min_latency:
+            return
+
+        self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+        self.peak_limit = max(self.peak_limit, self.limit)
+
+    def _on_congestion(self) -> None:
+        """Multiplicative decrease, at most once per latency window"""
+        self.congestion_events += 1
+
+        now = time.monotonic()
+        window = self._ewma_latency or 1.0
+        if now - self._last_decrease_at < window:
+            return
+
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        self._last_decrease_at = now
+        self.decreases += 1
+        logger.debug(f"Concurrency limit reduced {previous} → {self.limit}")
@@ -0,0 +1,298 @@
+"""
+Synthetic OpenRouter API stand-in for scale testing.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import re
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from ..utils.validation import DEFAULT_PARAMETERS, SUPPORTED_PARAMETERS
+
+logger = logging.getLogger(__name__)
+
+_ENDPOINTS_PATH = re.compile(r"^/api/v1/models/(?P<id>.+)/endpoints$")
+_MODEL_INDEX = re.compile(r"/model-(?P<index>\d+)$")
+
+_MODALITIES = (
+    ("text->text", ["text"], ["text"]),
+    ("text+image->text", ["text", "image"], ["text"]),
+    ("text+image+file->text", ["text", "image", "file"], ["text"]),
+    ("text->image", ["text"], ["image"]),
+)
+_TOKENIZERS = ("GPT", "Claude", "Gemini", "Llama3", "Mistral", "Qwen", "Other")
+_QUANTIZATIONS = (None, "fp8", "fp16", "bf16", "int4", "int8")
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Per-request latency: median ± jitter, plus an occasional slow tail"""
+
+    median: float = 0.0  # seconds
+    jitter: float = 0.0  # uniform ± around the median
+    tail_probability: float = 0.0
+    tail: float = 0.0  # extra seconds added to tail requests
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one request latency in seconds"""
+        delay = max(0.0, self.median + rng.uniform(-self.jitter, self.jitter))
+        if self.tail_probability and rng.random() < self.tail_probability:
+            delay += self.tail
+        return delay
+
+
+LATENCY_PROFILES = {
+    "none": LatencyProfile(),
+    "local": LatencyProfile(median=0.002, jitter=0.001),
+    "openrouter": LatencyProfile(
+        median=0.12, jitter=0.06, tail_probability=0.01, tail=1.5
+    ),
+    "degraded": LatencyProfile(median=0.4, jitter=0.2, tail_probability=0.05, tail=5.0),
+}
+
+
+@dataclass(frozen=True)
+class SyntheticCatalog:
+    """
+    Deterministic generator of /models, endpoints and ZDR payloads.
+
+    Every model is derived from `seed` and its index alone, so payloads are
+    generated on demand and identical across runs. Bumping `revision`
+    reprices a `drift_fraction` of the models and their endpoints, which
+    lets a second pass exercise the update stages. Models are spread over
+    `authors` authors and endpoints over `providers` providers; about
+    `invalid_parameter_rate` of the models advertise an unknown parameter.
+    """
+
+    models: int = 10_000
+    min_endpoints: int = 1
+    max_endpoints: int = 6
+    authors: int = 200
+    providers: int = 60
+    zdr_fraction: float = 0.2
+    invalid_parameter_rate: float = 0.0
+    drift_fraction: float = 0.05
+    revision: int = 0
+    seed: int = 0
+
+    def model_id(self, index: int) -> str:
+        """OpenRouter id of the model at `index`"""
+        return f"synth-{index % self.authors}/model-{index}"
+
+    def model_index(self, model_id: str) -> int | None:
+        """Inverse of `model_id`, None for ids outside the catalog"""
+        match = _MODEL_INDEX.search(model_id)
+        if match is None:
+            return None
+        index = int(match.group("index"))
+        return (
+            index if index < self.models and self.model_id(index) == model_id else None
+        )
+
+    def generate(
+        self, index: int
+    ) -> tuple[dict[str, Any], list[dict[str, Any]], list[dict[str, Any]]]:
+        """Raw model, endpoint and ZDR payloads for one model"""
+        rng = random.Random(f"{self.seed}/{index}")
+        model_id = self.model_id(index)
+
+        # Drifted models change price once per revision
+        price_scale = 1.0
+        if rng.random() < self.drift_fraction:
+            price_scale += 0.1 * self.revision
+
+        modality, input_modalities, output_modalities = rng.choice(_MODALITIES)
+        context_length = rng.choice((8192, 32768, 131072, 200000, 1048576))
+        prompt_price = rng.choice((0.0, 1e-7, 5e-7, 1e-6, 3e-6, 1.5e-5)) * price_scale
+        completion_price = prompt_price * rng.choice((1, 2, 4, 5))
+
+        supported = rng.sample(SUPPORTED_PARAMETERS, rng.randint(3, 15))
+        if rng.random() < self.invalid_parameter_rate:
+            supported.append("synthetic_unknown_parameter")
+        defaults = {
+            name: round(rng.random(), 2)
+            for name in DEFAULT_PARAMETERS
+            if name in supported and rng.random() < 0.3
+        }
+
+        model = {
+            "id": model_id,
+            "canonical_slug": f"{model_id}-{self.seed}",
+            "name": f"Synthetic Model {index}",
+            "description": f"Synthetic model {index} generated for scale testing",
+            "context_length": context_length,
+            "pricing": {
+                "prompt": f"{prompt_price:.10f}",
+                "completion": f"{completion_price:.10f}",
+            },
+            "architecture": {
+                "modality": modality,
+                "input_modalities": input_modalities,
+                "output_modalities": output_modalities,
+                "tokenizer": rng.choice(_TOKENIZERS),
+                "instruct_type": None,
+            },
+            "top_provider": {
+                "context_length": context_length,
+                "max_completion_tokens": rng.choice((None, 4096, 8192, 32768)),
+                "is_moderated": rng.random() < 0.2,
+            },
+            "created": 1_700_000_000 + index,
+            "supported_parameters": supported,
+            "default_parameters": defaults or None,
+        }
+
+        endpoints = []
+        zdr = []
+        provider_indexes = rng.sample(
+            range(self.providers),
+            min(self.providers, rng.randint(self.min_endpoints, self.max_endpoints)),
+        )
+        for provider_index in provider_indexes:
+            provider_name = f"Synthetic Provider {provider_index}"
+            tag = f"synthetic-provider-{provider_index}"
+            endpoint_prompt = prompt_price * rng.uniform(0.8, 1.2)
+            endpoint_completion = completion_price * rng.uniform(0.8, 1.2)
+            endpoints.append(
+                {
+                    "name": f"{provider_name} | {model_id}",
+                    "model_name": model["name"],
+                    "context_length": context_length,
+                    "pricing": {
+                        "prompt": f"{endpoint_prompt:.10f}",
+                        "completion": f"{endpoint_completion:.10f}",
+                        "request": "0",
+                        "image": "0",
+                    },
+                    "provider_name": provider_name,
+                    "tag": tag,
+                    "quantization": rng.choice(_QUANTIZATIONS),
+                    "max_completion_tokens": rng.choice((None, 4096, 16384)),
+                    "max_prompt_tokens": None,
+                    "supported_parameters": rng.sample(
+                        supported, max(1, len(supported) - rng.randint(0, 3))
+                    ),
+                    "status": rng.choice((0, 0, 0, 0, -1)),
+                    "uptime_last_30m": round(rng.uniform(90.0, 100.0), 2),
+                    "supports_implicit_caching": rng.random() < 0.3,
+                }
+            )
+            if rng.random() < self.zdr_fraction:
+                zdr.append(
+                    {
+                        "provider_name": provider_name,
+                        "model_name": model["name"],
+                        "tag": tag,
+                        "pricing": {
+                            "prompt_cost": f"{endpoint_prompt:.10f}",
+                            "completion_cost": f"{endpoint_completion:.10f}",
+                            "discount": 0,
+                        },
+                    }
+                )
+
+        return model, endpoints, zdr
+
+    def models_payload(self) -> dict[str, Any]:
+        """Body of GET /models"""
+        return {"data": [self.generate(i)[0] for i in range(self.models)]}
+
+    def endpoints_payload(self, index: int) -> dict[str, Any]:
+        """Body of GET /models/{id}/endpoints"""
+        model, endpoints, _ = self.generate(index)
+        return {
+            "data": {
+                "id": model["id"],
+                "name": model["name"],
+                "created": model["created"],
+                "description": model["description"],
+                "architecture": model["architecture"],
+                "endpoints": endpoints,
+            }
+        }
+
+    def zdr_payload(self) -> dict[str, Any]:
+        """Body of GET /endpoints/zdr"""
+        return {
+            "data": [entry for i in range(self.models) for entry in self.generate(i)[2]]
+        }
+
+
+class SyntheticTransport(httpx.AsyncBaseTransport):
+    """
+    Serves a SyntheticCatalog as the OpenRouter API.
+
+    Each request waits for a delay drawn from `latency`. Responses carry an
+    ETag per model and catalog revision, so conditional requests get 304.
+    The catalog-wide /models and ZDR bodies are generated once and reused.
+    """
+
+    def __init__(
+        self,
+        catalog: SyntheticCatalog,
+        latency: LatencyProfile = LATENCY_PROFILES["none"],
+        seed: int | None = None,
+    ) -> None:
+        self.catalog = catalog
+        self.latency = latency
+        self._random = random.Random(seed)
+        self._bodies: dict[str, bytes] = {}
+
+        # Counters for end-of-run reporting
+        self.requests = 0
+        self.not_modified = 0
+
+    def _catalog_body(self, name: str) -> bytes:
+        if name not in self._bodies:
+            payload = (
+                self.catalog.models_payload()
+                if name == "models"
+                else self.catalog.zdr_payload()
+            )
+            self._bodies[name] = json.dumps(payload).encode()
+        return self._bodies[name]
+
+    def _respond(
+        self, request: httpx.Request, etag: str, body: bytes
+    ) -> httpx.Response:
+        if request.headers.get("if-none-match") == etag:
+            self.not_modified += 1
+            return httpx.Response(304, headers={"ETag": etag}, request=request)
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "application/json", "ETag": etag},
+            content=body,
+            request=request,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        delay = self.latency.sample(self._random)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        catalog = self.catalog
+        version = f"{catalog.seed}-{catalog.revision}"
+        path = request.url.path
+        if path == "/api/v1/models":
+            return self._respond(
+                request, f'"models-{version}"', self._catalog_body("models")
+            )
+        if path == "/api/v1/endpoints/zdr":
+            return self._respond(request, f'"zdr-{version}"', self._catalog_body("zdr"))
+
+        match = _ENDPOINTS_PATH.match(path)
+        index = catalog.model_index(match.group("id")) if match else None
+        if index is None:
+            return httpx.Response(
+                404,
+                json={"error": {"code": 404, "message": "Model not found"}},
+                request=request,
+            )
+        body = json.dumps(catalog.endpoints_payload(index)).encode()
+        return self._respond(request, f'"{index}-{version}"', body)
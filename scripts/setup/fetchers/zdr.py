@@ -2,6 +2,7 @@
 ZDR endpoint fetching utilities.
 """
 
+import asyncio
 import logging
 import sys
 from typing import Any
@@ -11,64 +12,118 @@ import httpx
 from ..models.zdr import ZDREndpoint
 from .cache import (
     OPENROUTER_API_BASE,
-    load_cached_zdr_endpoints,
+    CacheEntry,
+    flush_cache_writes,
+    load_zdr_cache_entry,
+    mark_cache_entry_revalidated,
     save_zdr_endpoints_to_cache,
 )
+from .client import use_client
+from .metrics import FetchMetrics
+from .refresh import CacheRefresher, serve_from_cache
+from .retry import DEFAULT_RETRY_POLICY, RetryBudget, RetryPolicy, get_with_retry
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_zdr_endpoints(
+    raw_endpoints: list[dict[str, Any]],
+) -> dict[tuple[str, str, str], ZDREndpoint]:
+    """Parse raw ZDR endpoints into a lookup keyed by (provider, model, tag)"""
+    zdr_lookup = {}
+    for raw_endpoint in raw_endpoints:
+        try:
+            endpoint = ZDREndpoint(**raw_endpoint)
+            key = (endpoint.provider_name, endpoint.model_name, endpoint.tag)
+            zdr_lookup[key] = endpoint
+        except Exception as e:
+            logger.warning(f"Failed to parse ZDR endpoint {raw_endpoint}: {e}")
+    return zdr_lookup
+
+
+async def _request_zdr_data(
+    client: httpx.AsyncClient,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retry_budget: RetryBudget | None = None,
+    cache_entry: CacheEntry | None = None,
+    metrics: FetchMetrics | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Request the raw ZDR endpoints list, raising on HTTP errors.
+    A cached entry is revalidated conditionally and reused on 304.
+    """
+    url = f"{OPENROUTER_API_BASE}/endpoints/zdr"
+    headers = cache_entry.conditional_headers() if cache_entry else None
+
+    response = await get_with_retry(
+        client, url, retry_policy, retry_budget, headers=headers, metrics=metrics
+    )
+    if response.status_code == 304 and cache_entry is not None:
+        mark_cache_entry_revalidated(cache_entry)
+        if metrics is not None:
+            metrics.record_cache(url, "revalidated")
+        logger.info("✓ ZDR endpoints unchanged upstream (304), using cached copy")
+        cached_endpoints: list[dict[str, Any]] = cache_entry.data
+        return cached_endpoints
+
+    response.raise_for_status()
+    raw_endpoints: list[dict[str, Any]] = response.json().get("data", [])
+    if metrics is not None:
+        metrics.record_cache(url, "miss")
+
+    # Save to cache (with validators for the next revalidation)
+    await asyncio.to_thread(save_zdr_endpoints_to_cache, raw_endpoints, response)
+    return raw_endpoints
+
+
 async def fetch_zdr_endpoints(
     use_cache: bool = True,
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    retry_budget: RetryBudget | None = None,
+    client: httpx.AsyncClient | None = None,
+    metrics: FetchMetrics | None = None,
+    cache_refresher: CacheRefresher | None = None,
 ) -> dict[tuple[str, str, str], ZDREndpoint]:
     """
     Fetch ZDR endpoints from OpenRouter API with caching.
     Returns a lookup dict keyed by (provider_name, model_name, tag).
+    With a `cache_refresher`, stale cached endpoints are served immediately
+    and refreshed in the background.
+    Transient failures are retried according to `retry_policy`.
     """
-    # Try to load from cache first
-    if use_cache:
-        cached_raw = load_cached_zdr_endpoints()
-        if cached_raw is not None:
-            zdr_lookup = {}
-            for raw_endpoint in cached_raw:
-                try:
-                    endpoint = ZDREndpoint(**raw_endpoint)
-                    key = (endpoint.provider_name, endpoint.model_name, endpoint.tag)
-                    zdr_lookup[key] = endpoint
-                except Exception as e:
-                    logger.warning(f"Failed to parse cached ZDR endpoint: {e}")
-            return zdr_lookup
-
-    # Fetch from API
     url = f"{OPENROUTER_API_BASE}/endpoints/zdr"
-    logger.info(f"Fetching ZDR endpoints from {url}")
+    cache_entry = await asyncio.to_thread(load_zdr_cache_entry)
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.get(url)
-            response.raise_for_status()
-            data = response.json()
-            raw_endpoints: list[dict[str, Any]] = data.get("data", [])
-
-            # Save to cache
-            if use_cache:
-                save_zdr_endpoints_to_cache(raw_endpoints)
-
-            # Parse into lookup dict
-            zdr_lookup = {}
-            for raw_endpoint in raw_endpoints:
-                try:
-                    endpoint = ZDREndpoint(**raw_endpoint)
-                    key = (endpoint.provider_name, endpoint.model_name, endpoint.tag)
-                    zdr_lookup[key] = endpoint
-                except Exception as e:
-                    logger.warning(f"Failed to parse ZDR endpoint {raw_endpoint}: {e}")
+    async def refresh() -> None:
+        async with use_client(client) as http_client:
+            await _request_zdr_data(
+                http_client, retry_policy, retry_budget, cache_entry, metrics
+            )
 
+    # Try to serve from cache first
+    if use_cache and cache_entry is not None:
+        outcome = serve_from_cache(cache_entry, cache_refresher, refresh)
+        if outcome is not None:
+            if metrics is not None:
+                metrics.record_cache(url, outcome)
             logger.info(
-                f"✓ Fetched and parsed {len(zdr_lookup)} ZDR endpoints from OpenRouter"
+                f"✓ Loaded {len(cache_entry.data)} ZDR endpoints from cache "
+                f"(age: {cache_entry.age_hours:.1f}h, {outcome})"
             )
-            return zdr_lookup
+            return _parse_zdr_endpoints(cache_entry.data)
 
+    # Fetch from API, revalidating any cached copy
+    logger.info(f"Fetching ZDR endpoints from {url}")
+    async with use_client(client) as http_client:
+        try:
+            raw_endpoints = await _request_zdr_data(
+                http_client, retry_policy, retry_budget, cache_entry, metrics
+            )
         except httpx.HTTPError as e:
-            logger.error(f"❌ Failed to fetch ZDR endpoints: {e}")
+            logger.error(f"❌ Failed to fetch ZDR endpoints after retries: {e}")
             sys.exit(1)
+    await flush_cache_writes()
+
+    zdr_lookup = _parse_zdr_endpoints(raw_endpoints)
+    logger.info(f"✓ Fetched and parsed {len(zdr_lookup)} ZDR endpoints from OpenRouter")
+    return zdr_lookup
@@ -0,0 +1,101 @@
+"""
+Run-scoped natural key → database id resolution for the sync stages.
+"""
+
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models.compact import CompactEndpoint
+from .models.database import LLMModel, ModelArchitecture, ModelEndpoint
+
+logger = logging.getLogger(__name__)
+
+EndpointKey = tuple[int, str, str, str]
+
+
+class IdResolver:
+    """
+    Maps natural keys to database ids for one sync run.
+
+    Loaded with three bulk queries at the start of the run and kept current
+    by the inserter, so the update and insert stages resolve every model,
+    architecture and endpoint id from memory instead of one SELECT per model
+    and endpoint. Ids are only recorded once their rows are committed.
+    """
+
+    def __init__(
+        self,
+        model_ids: dict[tuple[str, str], int] | None = None,
+        architecture_ids: dict[int, int] | None = None,
+        endpoint_ids: dict[EndpointKey, int] | None = None,
+    ) -> None:
+        # (author, model_name) → llm_models.id
+        self.model_ids = model_ids or {}
+        # llm_models.id → model_architecture.id
+        self.architecture_ids = architecture_ids or {}
+        # (model_id, name, provider_name, tag) → model_endpoints.id
+        self.endpoint_ids = endpoint_ids or {}
+
+    def model_id(self, author: str, model_name: str) -> int | None:
+        """Id of an existing model"""
+        return self.model_ids.get((author, model_name))
+
+    def architecture_id(self, model_id: int) -> int | None:
+        """Id of a model's architecture row"""
+        return self.architecture_ids.get(model_id)
+
+    def endpoint_id(self, model_id: int, ep: CompactEndpoint) -> int | None:
+        """Id of an existing endpoint of a model"""
+        return self.endpoint_ids.get((model_id, ep.name, ep.provider_name, ep.tag))
+
+    def has_model(self, author: str, model_name: str) -> bool:
+        """Whether the model already exists"""
+        return (author, model_name) in self.model_ids
+
+    def add_model(self, author: str, model_name: str, model_id: int) -> None:
+        self.model_ids[(author, model_name)] = model_id
+
+    def add_architecture(self, model_id: int, architecture_id: int) -> None:
+        self.architecture_ids[model_id] = architecture_id
+
+    def add_endpoint(self, key: EndpointKey, endpoint_id: int) -> None:
+        self.endpoint_ids[key] = endpoint_id
+
+    def update(self, other: "IdResolver") -> None:
+        """Record every id from another resolver (e.g. rows committed in a batch)"""
+        self.model_ids.update(other.model_ids)
+        self.architecture_ids.update(other.architecture_ids)
+        self.endpoint_ids.update(other.endpoint_ids)
+
+
+async def load_id_resolver(session: AsyncSession) -> IdResolver:
+    """Load every model, architecture and endpoint id in three queries"""
+    model_rows = await session.execute(
+        select(LLMModel.author, LLMModel.model_name, LLMModel.id)
+    )
+    architecture_rows = await session.execute(
+        select(ModelArchitecture.model_id, ModelArchitecture.id)
+    )
+    endpoint_rows = await session.execute(
+        select(
+            ModelEndpoint.model_id,
+            ModelEndpoint.name,
+            ModelEndpoint.provider_name,
+            ModelEndpoint.tag,
+            ModelEndpoint.id,
+        )
+    )
+    resolver = IdResolver(
+        model_ids={(row[0], row[1]): row[2] for row in model_rows.all()},
+        architecture_ids={row[0]: row[1] for row in architecture_rows.all()},
+        endpoint_ids={
+            (row[0], row[1], row[2], row[3]): row[4] for row in endpoint_rows.all()
+        },
+    )
+    logger.info(
+        f"✓ Resolved ids for {len(resolver.model_ids)} models and "
+        f"{len(resolver.endpoint_ids)} endpoints"
+    )
+    return resolver
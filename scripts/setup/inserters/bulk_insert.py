@@ -3,10 +3,15 @@ Bulk insertion logic for new models.
 """
 
 import logging
+from collections.abc import Sequence
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..id_resolver import IdResolver, load_id_resolver
+from ..models.compact import CompactEndpoint, CompactModel
 from ..models.database import (
     LLMModel,
     ModelArchitecture,
@@ -18,204 +23,345 @@ from ..models.database import (
     ModelSupportedParameter,
     ModelTopProvider,
 )
-from ..models.openrouter import OpenRouterModelWithEndpoints
 from ..models.zdr import ZDREndpoint
+from .rows import (
+    Row,
+    architecture_row,
+    default_parameters_row,
+    endpoint_key,
+    endpoint_pricing_row,
+    endpoint_row,
+    llm_model_row,
+    modality_rows,
+    model_pricing_row,
+    supported_parameter_rows,
+    top_provider_row,
+)
 
 logger = logging.getLogger(__name__)
 
+# New models per insert transaction
+DEFAULT_INSERT_CHUNK_SIZE = 1000
+
+
+def supports_set_based_insert(session: AsyncSession) -> bool:
+    """Whether the database takes multi-row INSERT … ON CONFLICT DO NOTHING RETURNING"""
+    dialect = session.get_bind().dialect
+    return dialect.name in ("postgresql", "sqlite") and bool(
+        dialect.insert_executemany_returning
+    )
+
+
+def _table(model: Any) -> Table:
+    table: Table = model.__table__
+    return table
+
+
+async def _insert_rows(
+    session: AsyncSession,
+    model: Any,
+    rows: Sequence[Row],
+    returning: Sequence[str] = (),
+) -> list[Any]:
+    """
+    Insert many rows with ON CONFLICT DO NOTHING, batched into multi-row
+    statements by SQLAlchemy's insertmanyvalues. Returns the RETURNING rows of
+    the inserted rows only (conflicting rows are skipped), in no set order.
+    """
+    if not rows:
+        return []
+
+    table = _table(model)
+    dialect_insert = (
+        postgresql.insert
+        if session.get_bind().dialect.name == "postgresql"
+        else sqlite.insert
+    )
+    statement = dialect_insert(table).on_conflict_do_nothing()
+    if not returning:
+        await session.execute(statement, list(rows))
+        return []
+
+    result = await session.execute(
+        statement.returning(*(table.c[name] for name in returning)), list(rows)
+    )
+    return list(result.all())
+
+
+async def insert_models_set_based(
+    session: AsyncSession,
+    models: list[CompactModel],
+    zdr_lookup: dict[tuple[str, str, str], ZDREndpoint],
+    inserted_ids: IdResolver | None = None,
+) -> int:
+    """
+    Insert new models and all their child rows with one multi-row
+    INSERT … ON CONFLICT DO NOTHING per table (split into pages of rows by
+    SQLAlchemy), mapping generated ids back by natural key. Models that
+    already exist, e.g. inserted concurrently, are skipped with their children.
+    Does not commit. Records the new ids in `inserted_ids`. Returns the
+    number of models inserted.
+    """
+    inserted_ids = inserted_ids if inserted_ids is not None else IdResolver()
+
+    # 1. Core models: (author, model_name) → id; the first of any duplicates wins
+    unique_models: dict[tuple[str, str], CompactModel] = {}
+    for m in models:
+        unique_models.setdefault((m.author, m.model_name), m)
+    model_ids = {
+        (row.author, row.model_name): row.id
+        for row in await _insert_rows(
+            session,
+            LLMModel,
+            [llm_model_row(m) for m in unique_models.values()],
+            returning=("id", "author", "model_name"),
+        )
+    }
+    inserted = [
+        (model_ids[key], m) for key, m in unique_models.items() if key in model_ids
+    ]
+    for (author, model_name), model_id in model_ids.items():
+        inserted_ids.add_model(author, model_name, model_id)
+
+    # 2. One-to-one rows keyed by model id
+    await _insert_rows(
+        session, ModelPricing, [model_pricing_row(mid, m) for mid, m in inserted]
+    )
+    await _insert_rows(
+        session,
+        ModelTopProvider,
+        [top_provider_row(mid, m) for mid, m in inserted],
+    )
+    await _insert_rows(
+        session,
+        ModelDefaultParameters,
+        [
+            row
+            for mid, m in inserted
+            if (row := default_parameters_row(mid, m)) is not None
+        ],
+    )
+    await _insert_rows(
+        session,
+        ModelSupportedParameter,
+        [row for mid, m in inserted for row in supported_parameter_rows(mid, m)],
+    )
+
+    # 3. Architecture, then its modalities: model id → architecture id
+    architecture_ids = {
+        row.model_id: row.id
+        for row in await _insert_rows(
+            session,
+            ModelArchitecture,
+            [architecture_row(mid, m) for mid, m in inserted],
+            returning=("id", "model_id"),
+        )
+    }
+    for model_id, architecture_id in architecture_ids.items():
+        inserted_ids.add_architecture(model_id, architecture_id)
+    await _insert_rows(
+        session,
+        ModelArchitectureModality,
+        [
+            row
+            for mid, m in inserted
+            if mid in architecture_ids
+            for row in modality_rows(architecture_ids[mid], m)
+        ],
+    )
 
-async def get_existing_models_from_db(session: AsyncSession) -> set[tuple[str, str]]:
-    """Get existing (author, model_name) tuples from database"""
-    result = await session.execute(select(LLMModel.author, LLMModel.model_name))
-    return {(row[0], row[1]) for row in result.all()}
+    # 4. Endpoints, then their pricing: natural key → endpoint id. The API
+    # occasionally lists an endpoint twice; the first occurrence wins
+    endpoints: dict[tuple[int, str, str, str], CompactEndpoint] = {}
+    for mid, m in inserted:
+        for ep in m.providers:
+            endpoints.setdefault(endpoint_key(mid, ep), ep)
+    endpoint_ids = {
+        (row.model_id, row.name, row.provider_name, row.tag): row.id
+        for row in await _insert_rows(
+            session,
+            ModelEndpoint,
+            [endpoint_row(key[0], ep, zdr_lookup) for key, ep in endpoints.items()],
+            returning=("id", "model_id", "name", "provider_name", "tag"),
+        )
+    }
+    for key, endpoint_id in endpoint_ids.items():
+        inserted_ids.add_endpoint(key, endpoint_id)
+    await _insert_rows(
+        session,
+        ModelEndpointPricing,
+        [
+            endpoint_pricing_row(endpoint_ids[key], ep, zdr_lookup)
+            for key, ep in endpoints.items()
+            if key in endpoint_ids
+        ],
+    )
+
+    return len(inserted)
 
 
 async def bulk_insert_models(
     session: AsyncSession,
-    models: list[OpenRouterModelWithEndpoints],
+    models: list[CompactModel],
     zdr_lookup: dict[tuple[str, str, str], ZDREndpoint],
+    set_based: bool = True,
+    resolver: IdResolver | None = None,
+    chunk_size: int = DEFAULT_INSERT_CHUNK_SIZE,
 ) -> tuple[int, int]:
     """
-    Bulk insert models using normalized schema with SQLAlchemy ORM.
+    Bulk insert models using normalized schema.
     Only inserts new models, skips existing ones.
 
+    New models are inserted in chunks of `chunk_size`, each committed on its
+    own, and the session is cleared between chunks, so a large first-time
+    load holds one chunk of ORM objects at a time and a failure costs at most
+    the chunk it happened in.
+
+    With `set_based` (and a database that supports it) each chunk is written
+    with a few multi-row statements; if that fails, the chunk's models are
+    inserted one by one through the ORM instead, each in a SAVEPOINT, so a
+    model that fails rolls back only itself.
+
+    Existing models are looked up in `resolver` (loaded from the database if
+    not given), which is then updated with the ids of the committed rows.
+
     Returns: (inserted_count, skipped_count)
     """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
     # Get existing models
-    existing = await get_existing_models_from_db(session)
-    new_models = [m for m in models if (m.author, m.model_name) not in existing]
+    ids = resolver or await load_id_resolver(session)
+    new_models = [m for m in models if not ids.has_model(m.author, m.model_name)]
     skipped = len(models) - len(new_models)
 
     if not new_models:
         logger.info("No new models to insert")
         return 0, skipped
 
+    use_set_based = set_based and supports_set_based_insert(session)
+    inserted_count = 0
+    chunks = range(0, len(new_models), chunk_size)
+    for start in chunks:
+        chunk = new_models[start : start + chunk_size]
+        inserted_ids = IdResolver()
+        chunk_inserted: int | None = None
+
+        if use_set_based:
+            try:
+                chunk_inserted = await insert_models_set_based(
+                    session, chunk, zdr_lookup, inserted_ids
+                )
+                await session.commit()
+            except Exception as e:
+                logger.warning(
+                    f"Set-based insert failed, falling back to per-model inserts: {e}"
+                )
+                await session.rollback()
+                inserted_ids = IdResolver()
+                chunk_inserted = None
+
+        if chunk_inserted is None:
+            chunk_inserted = await _insert_models_orm(
+                session, chunk, zdr_lookup, inserted_ids
+            )
+            await session.commit()
+
+        ids.update(inserted_ids)
+        inserted_count += chunk_inserted
+        # The chunk is committed; drop its objects so memory stays bounded
+        session.expunge_all()
+
+    method = "set-based" if use_set_based else "per-model"
+    logger.info(
+        f"✓ Inserted {inserted_count} new models ({method}, {len(chunks)} chunks)"
+    )
+    return inserted_count, skipped + len(new_models) - inserted_count
+
+
+async def _insert_models_orm(
+    session: AsyncSession,
+    new_models: list[CompactModel],
+    zdr_lookup: dict[tuple[str, str, str], ZDREndpoint],
+    inserted_ids: IdResolver,
+) -> int:
+    """
+    Insert models one by one through the ORM, each in a SAVEPOINT, skipping
+    models that fail. Does not commit. Records the new ids in `inserted_ids`.
+    """
     inserted_count = 0
 
     for m in new_models:
+        endpoint_ids: dict[tuple[int, str, str, str], int] = {}
         try:
-            # 1. Insert core model
-            db_model = LLMModel(
-                author=m.author,
-                model_name=m.model_name,
-                display_name=m.name,
-                description=m.description,
-                context_length=m.context_length,
-                created_at=m.created_at,
-                last_updated=m.last_updated,
-            )
-            session.add(db_model)
-            await session.flush()  # Get the ID
-
-            model_id = db_model.id
-
-            # 2. Insert pricing
-            pricing = ModelPricing(
-                model_id=model_id,
-                prompt_cost=m.pricing.prompt,
-                completion_cost=m.pricing.completion,
-                request_cost=m.pricing.request,
-                image_cost=m.pricing.image,
-                web_search_cost=m.pricing.web_search,
-                internal_reasoning_cost=m.pricing.internal_reasoning,
-            )
-            session.add(pricing)
-
-            # 3. Insert architecture
-            architecture = ModelArchitecture(
-                model_id=model_id,
-                modality=m.architecture.modality,
-                tokenizer=m.architecture.tokenizer,
-                instruct_type=m.architecture.instruct_type,
-            )
-            session.add(architecture)
-            await session.flush()  # Get architecture ID
+            # A failure rolls back to the SAVEPOINT, keeping earlier models
+            async with session.begin_nested():
+                # 1. Insert core model
+                db_model = LLMModel(**llm_model_row(m))
+                session.add(db_model)
+                await session.flush()  # Get the ID
 
-            architecture_id = architecture.id
+                model_id: int = db_model.id  # type: ignore[assignment]
 
-            # 4. Insert architecture modalities
-            for input_mod in m.architecture.input_modalities:
-                modality = ModelArchitectureModality(
-                    architecture_id=architecture_id,
-                    modality_type="input",
-                    modality_value=input_mod,
-                )
-                session.add(modality)
+                # 2. Insert pricing
+                session.add(ModelPricing(**model_pricing_row(model_id, m)))
 
-            for output_mod in m.architecture.output_modalities:
-                modality = ModelArchitectureModality(
-                    architecture_id=architecture_id,
-                    modality_type="output",
-                    modality_value=output_mod,
-                )
-                session.add(modality)
-
-            # 5. Insert top provider
-            top_provider = ModelTopProvider(
-                model_id=model_id,
-                context_length=m.top_provider.context_length,
-                max_completion_tokens=m.top_provider.max_completion_tokens,
-                is_moderated=str(m.top_provider.is_moderated).lower(),
-            )
-            session.add(top_provider)
+                # 3. Insert architecture
+                architecture = ModelArchitecture(**architecture_row(model_id, m))
+                session.add(architecture)
+                await session.flush()  # Get architecture ID
 
-            # 6. Insert supported parameters
-            for param in m.supported_parameters:
-                supported_param = ModelSupportedParameter(
-                    model_id=model_id, parameter_name=param
+                # 4. Insert architecture modalities
+                architecture_id: int = architecture.id  # type: ignore[assignment]
+                session.add_all(
+                    ModelArchitectureModality(**row)
+                    for row in modality_rows(architecture_id, m)
                 )
-                session.add(supported_param)
 
-            # 7. Insert default parameters (if any)
-            if m.default_parameters:
-                default_params = ModelDefaultParameters(
-                    model_id=model_id, parameters=m.default_parameters
-                )
-                session.add(default_params)
-
-            # 8. Insert providers
-            for ep in m.providers:
-                # Check if endpoint already exists (handle OpenRouter API duplicates)
-                existing_endpoint_result = await session.execute(
-                    select(ModelEndpoint).where(
-                        ModelEndpoint.model_id == model_id,
-                        ModelEndpoint.name == ep.name,
-                        ModelEndpoint.provider_name == ep.provider_name,
-                        ModelEndpoint.tag == ep.tag,
-                    )
+                # 5. Insert top provider
+                session.add(ModelTopProvider(**top_provider_row(model_id, m)))
+
+                # 6. Insert supported parameters
+                session.add_all(
+                    ModelSupportedParameter(**row)
+                    for row in supported_parameter_rows(model_id, m)
                 )
-                existing_endpoint = existing_endpoint_result.scalar_one_or_none()
-
-                if existing_endpoint:
-                    endpoint = existing_endpoint
-                else:
-                    # Check if this endpoint is ZDR-enabled
-                    zdr_key = (ep.provider_name, ep.model_name, ep.tag)
-                    is_zdr = "true" if zdr_key in zdr_lookup else "false"
-
-                    endpoint = ModelEndpoint(
-                        name=ep.name,
-                        endpoint_model_name=ep.model_name,
-                        context_length=ep.context_length,
-                        provider_name=ep.provider_name,
-                        tag=ep.tag,
-                        quantization=ep.quantization,
-                        max_completion_tokens=ep.max_completion_tokens,
-                        max_prompt_tokens=ep.max_prompt_tokens,
-                        status=ep.status,
-                        uptime_last_30m=(
-                            str(ep.uptime_last_30m) if ep.uptime_last_30m else None
-                        ),
-                        supports_implicit_caching=str(
-                            ep.supports_implicit_caching
-                        ).lower(),
-                        is_zdr=is_zdr,
-                    )
+
+                # 7. Insert default parameters (if any)
+                default_params = default_parameters_row(model_id, m)
+                if default_params is not None:
+                    session.add(ModelDefaultParameters(**default_params))
+
+                # 8. Insert providers
+                for ep in m.providers:
+                    # Skip OpenRouter API duplicates (the model is new, so no
+                    # other endpoint of it can exist)
+                    key = endpoint_key(model_id, ep)
+                    if key in endpoint_ids:
+                        continue
+
+                    endpoint = ModelEndpoint(**endpoint_row(model_id, ep, zdr_lookup))
                     session.add(endpoint)
                     await session.flush()  # Get endpoint ID
 
                     # 9. Insert endpoint pricing (only for new endpoints)
                     # Use ZDR pricing if available, otherwise use endpoint pricing
-                    zdr_endpoint = zdr_lookup.get(zdr_key)
-                    if zdr_endpoint:
-                        endpoint_pricing = ModelEndpointPricing(
-                            endpoint_id=endpoint.id,
-                            prompt_cost=zdr_endpoint.pricing.prompt_cost,
-                            completion_cost=zdr_endpoint.pricing.completion_cost,
-                            request_cost=zdr_endpoint.pricing.request_cost,
-                            image_cost=zdr_endpoint.pricing.image_cost,
-                            image_output_cost=zdr_endpoint.pricing.image_output_cost,
-                            audio_cost=zdr_endpoint.pricing.audio_cost,
-                            input_audio_cache_cost=zdr_endpoint.pricing.input_audio_cache_cost,
-                            input_cache_read_cost=zdr_endpoint.pricing.input_cache_read_cost,
-                            input_cache_write_cost=zdr_endpoint.pricing.input_cache_write_cost,
-                            discount=zdr_endpoint.pricing.discount,
+                    endpoint_id: int = endpoint.id  # type: ignore[assignment]
+                    endpoint_ids[key] = endpoint_id
+                    session.add(
+                        ModelEndpointPricing(
+                            **endpoint_pricing_row(endpoint_id, ep, zdr_lookup)
                         )
-                    else:
-                        endpoint_pricing = ModelEndpointPricing(
-                            endpoint_id=endpoint.id,
-                            prompt_cost=ep.pricing.get("prompt", "0"),
-                            completion_cost=ep.pricing.get("completion", "0"),
-                            request_cost=ep.pricing.get("request", "0"),
-                            image_cost=ep.pricing.get("image", "0"),
-                            image_output_cost="0",
-                            audio_cost="0",
-                            input_audio_cache_cost="0",
-                            input_cache_read_cost="0",
-                            input_cache_write_cost="0",
-                            discount="0",
-                        )
-                    session.add(endpoint_pricing)
-
-            inserted_count += 1
+                    )
 
         except Exception as e:
             logger.error(f"Failed to insert model {m.openrouter_id}: {e}")
-            await session.rollback()
             continue
 
-    # Commit all changes
-    await session.commit()
+        inserted_count += 1
+        inserted_ids.add_model(m.author, m.model_name, model_id)
+        inserted_ids.add_architecture(model_id, architecture_id)
+        for key, endpoint_id in endpoint_ids.items():
+            inserted_ids.add_endpoint(key, endpoint_id)
 
-    logger.info(f"✓ Inserted {inserted_count} new models")
-    return inserted_count, skipped
+    return inserted_count
@@ -0,0 +1,158 @@
+"""
+Column values for new registry rows, shared by the insert paths.
+"""
+
+from typing import Any
+
+from ..models.compact import CompactEndpoint, CompactModel
+from ..models.database import numeric_costs
+from ..models.zdr import ZDREndpoint
+
+Row = dict[str, Any]
+
+ZDRLookup = dict[tuple[str, str, str], ZDREndpoint]
+
+
+def zdr_key(ep: CompactEndpoint) -> tuple[str, str, str]:
+    """Key of an endpoint in the ZDR lookup"""
+    return (ep.provider_name, ep.model_name, ep.tag)
+
+
+def endpoint_key(model_id: int, ep: CompactEndpoint) -> tuple[int, str, str, str]:
+    """Natural key of an endpoint row (uq_model_endpoint)"""
+    return (model_id, ep.name, ep.provider_name, ep.tag)
+
+
+def llm_model_row(m: CompactModel) -> Row:
+    """llm_models values"""
+    return {
+        "author": m.author,
+        "model_name": m.model_name,
+        "display_name": m.name,
+        "description": m.description,
+        "context_length": m.context_length,
+        "created_at": m.created_at,
+        "last_updated": m.last_updated,
+    }
+
+
+def model_pricing_row(model_id: int, m: CompactModel) -> Row:
+    """model_pricing values, including the NUMERIC copies"""
+    costs = {
+        "prompt_cost": m.pricing.prompt,
+        "completion_cost": m.pricing.completion,
+        "request_cost": m.pricing.request,
+        "image_cost": m.pricing.image,
+        "web_search_cost": m.pricing.web_search,
+        "internal_reasoning_cost": m.pricing.internal_reasoning,
+    }
+    return {"model_id": model_id, **costs, **numeric_costs(dict(costs))}
+
+
+def architecture_row(model_id: int, m: CompactModel) -> Row:
+    """model_architecture values"""
+    return {
+        "model_id": model_id,
+        "modality": m.architecture.modality,
+        "tokenizer": m.architecture.tokenizer,
+        "instruct_type": m.architecture.instruct_type,
+    }
+
+
+def modality_rows(architecture_id: int, m: CompactModel) -> list[Row]:
+    """model_architecture_modalities values, inputs then outputs"""
+    return [
+        {
+            "architecture_id": architecture_id,
+            "modality_type": modality_type,
+            "modality_value": value,
+        }
+        for modality_type, values in (
+            ("input", m.architecture.input_modalities),
+            ("output", m.architecture.output_modalities),
+        )
+        for value in values
+    ]
+
+
+def top_provider_row(model_id: int, m: CompactModel) -> Row:
+    """model_top_provider values"""
+    return {
+        "model_id": model_id,
+        "context_length": m.top_provider.context_length,
+        "max_completion_tokens": m.top_provider.max_completion_tokens,
+        "is_moderated": str(m.top_provider.is_moderated).lower(),
+    }
+
+
+def supported_parameter_rows(model_id: int, m: CompactModel) -> list[Row]:
+    """model_supported_parameters values"""
+    return [
+        {"model_id": model_id, "parameter_name": param}
+        for param in m.supported_parameters
+    ]
+
+
+def default_parameters_row(model_id: int, m: CompactModel) -> Row | None:
+    """model_default_parameters values, None without default parameters"""
+    if not m.default_parameters:
+        return None
+    return {"model_id": model_id, "parameters": dict(m.default_parameters)}
+
+
+def endpoint_row(model_id: int, ep: CompactEndpoint, zdr_lookup: ZDRLookup) -> Row:
+    """model_endpoints values"""
+    return {
+        "model_id": model_id,
+        "name": ep.name,
+        "endpoint_model_name": ep.model_name,
+        "context_length": ep.context_length,
+        "provider_name": ep.provider_name,
+        "tag": ep.tag,
+        "quantization": ep.quantization,
+        "max_completion_tokens": ep.max_completion_tokens,
+        "max_prompt_tokens": ep.max_prompt_tokens,
+        "status": ep.status,
+        "uptime_last_30m": str(ep.uptime_last_30m) if ep.uptime_last_30m else None,
+        "supports_implicit_caching": str(ep.supports_implicit_caching).lower(),
+        "is_zdr": "true" if zdr_key(ep) in zdr_lookup else "false",
+    }
+
+
+def endpoint_pricing_costs(ep: CompactEndpoint, zdr_lookup: ZDRLookup) -> Row:
+    """Endpoint cost strings, from the ZDR list when the endpoint is on it"""
+    zdr_endpoint = zdr_lookup.get(zdr_key(ep))
+    if zdr_endpoint:
+        pricing = zdr_endpoint.pricing
+        return {
+            "prompt_cost": pricing.prompt_cost,
+            "completion_cost": pricing.completion_cost,
+            "request_cost": pricing.request_cost,
+            "image_cost": pricing.image_cost,
+            "image_output_cost": pricing.image_output_cost,
+            "audio_cost": pricing.audio_cost,
+            "input_audio_cache_cost": pricing.input_audio_cache_cost,
+            "input_cache_read_cost": pricing.input_cache_read_cost,
+            "input_cache_write_cost": pricing.input_cache_write_cost,
+            "discount": pricing.discount,
+        }
+    return {
+        "prompt_cost": ep.pricing.get("prompt", "0"),
+        "completion_cost": ep.pricing.get("completion", "0"),
+        "request_cost": ep.pricing.get("request", "0"),
+        "image_cost": ep.pricing.get("image", "0"),
+        "image_output_cost": "0",
+        "audio_cost": "0",
+        "input_audio_cache_cost": "0",
+        "input_cache_read_cost": "0",
+        "input_cache_write_cost": "0",
+        "discount": "0",
+    }
+
+
+def endpoint_pricing_row(
+    endpoint_id: int, ep: CompactEndpoint, zdr_lookup: ZDRLookup
+) -> Row:
+    """model_endpoint_pricing values, including the NUMERIC copies"""
+    costs = endpoint_pricing_costs(ep, zdr_lookup)
+    return {"endpoint_id": endpoint_id, **costs, **numeric_costs(costs)}
@@ -0,0 +1,305 @@
+"""
+Compact in-memory representation of the validated catalog.
+"""
+
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, TypeVar
+
+from .openrouter import Endpoint, OpenRouterModel
+
+H = TypeVar("H", bound=Hashable)
+R = TypeVar("R")
+
+
+class InternPool:
+    """
+    Shares equal values between catalog records.
+
+    Provider names, tags, quantizations, parameter lists, modalities and
+    pricing repeat across thousands of models and endpoints, so each distinct
+    value is stored once and every record points at it. Use one pool per
+    fetch run: it holds every value it has seen until it is dropped.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[Any, Any] = {}
+        self._records: dict[tuple[Any, ...], Any] = {}
+        self._mappings: dict[tuple[tuple[str, type, Any], ...], dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._values) + len(self._records) + len(self._mappings)
+
+    def value(self, value: H) -> H:
+        """The pooled instance equal to `value`"""
+        pooled: H = self._values.setdefault(value, value)
+        return pooled
+
+    def strings(self, values: Sequence[str]) -> tuple[str, ...]:
+        """A pooled tuple of pooled strings"""
+        key = tuple(values)
+        pooled: tuple[str, ...] | None = self._values.get(key)
+        if pooled is None:
+            # Only a tuple seen for the first time pays for pooling its items
+            pooled = tuple([self.value(v) for v in key])
+            self._values[pooled] = pooled
+        return pooled
+
+    def record(self, cls: Callable[..., R], *fields: Hashable) -> R:
+        """The pooled `cls(*fields)`, constructed only the first time it is seen"""
+        key = (cls, *fields)
+        pooled: R | None = self._records.get(key)
+        if pooled is None:
+            pooled = self._records[key] = cls(*fields)
+        return pooled
+
+    def mapping(self, mapping: Mapping[str, Any]) -> dict[str, Any]:
+        """A pooled copy of a flat mapping; the returned dict must not be mutated"""
+        try:
+            # Payloads list keys in a stable order, so no sort is needed; the
+            # value type keeps 1, 1.0 and True (equal, same hash) apart
+            key = tuple((k, type(v), v) for k, v in mapping.items())
+            pooled = self._mappings.get(key)
+        except TypeError:  # unhashable values are kept as a private copy
+            return dict(mapping)
+        if pooled is None:
+            pooled = self._mappings[key] = dict(mapping)
+        return pooled
+
+
+@dataclass(frozen=True, slots=True)
+class CompactPricing:
+    """Model pricing in USD per token"""
+
+    prompt: str
+    completion: str
+    request: str = "0"
+    image: str = "0"
+    web_search: str = "0"
+    internal_reasoning: str = "0"
+
+
+@dataclass(frozen=True, slots=True)
+class CompactArchitecture:
+    """Model architecture details"""
+
+    modality: str
+    input_modalities: tuple[str, ...]
+    output_modalities: tuple[str, ...]
+    tokenizer: str
+    instruct_type: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class CompactTopProvider:
+    """Top provider metadata"""
+
+    context_length: int | None = None
+    max_completion_tokens: int | None = None
+    is_moderated: bool = False
+
+
+@dataclass(slots=True)
+class CompactEndpoint:
+    """One provider endpoint of a CompactModel"""
+
+    name: str
+    model_name: str
+    context_length: int
+    pricing: Mapping[str, Any]
+    provider_name: str
+    tag: str
+    quantization: str | None
+    max_completion_tokens: int | None
+    max_prompt_tokens: int | None
+    supported_parameters: tuple[str, ...]
+    status: int
+    uptime_last_30m: float | None
+    supports_implicit_caching: bool
+
+    @classmethod
+    def from_validated(
+        cls, endpoint: Endpoint, model_name: str, pool: InternPool
+    ) -> "CompactEndpoint":
+        """Copy a validated endpoint, pooling its repeated values"""
+        return cls(
+            name=endpoint.name,
+            # Reuse the model's display name instead of one string per endpoint
+            model_name=(
+                model_name if endpoint.model_name == model_name else endpoint.model_name
+            ),
+            context_length=endpoint.context_length,
+            pricing=pool.mapping(endpoint.pricing),
+            provider_name=pool.value(endpoint.provider_name),
+            tag=pool.value(endpoint.tag),
+            quantization=(
+                pool.value(endpoint.quantization) if endpoint.quantization else None
+            ),
+            max_completion_tokens=endpoint.max_completion_tokens,
+            max_prompt_tokens=endpoint.max_prompt_tokens,
+            supported_parameters=pool.strings(endpoint.supported_parameters),
+            status=endpoint.status,
+            uptime_last_30m=endpoint.uptime_last_30m,
+            supports_implicit_caching=endpoint.supports_implicit_caching,
+        )
+
+    def to_dict(
+        self, exclude: frozenset[str] | set[str] = frozenset()
+    ) -> dict[str, Any]:
+        """JSON-ready dict, shaped like Endpoint.model_dump(mode="json")"""
+        record = {
+            "name": self.name,
+            "model_name": self.model_name,
+            "context_length": self.context_length,
+            "pricing": dict(self.pricing),
+            "provider_name": self.provider_name,
+            "tag": self.tag,
+            "quantization": self.quantization,
+            "max_completion_tokens": self.max_completion_tokens,
+            "max_prompt_tokens": self.max_prompt_tokens,
+            "supported_parameters": list(self.supported_parameters),
+            "status": self.status,
+            "uptime_last_30m": self.uptime_last_30m,
+            "supports_implicit_caching": self.supports_implicit_caching,
+        }
+        for field in exclude:
+            record.pop(field, None)
+        return record
+
+
+@dataclass(slots=True)
+class CompactModel:
+    """
+    Slotted, read-only view of a validated model and its endpoints.
+
+    Carries the same attributes as OpenRouterModelWithEndpoints, which the
+    diff engine, inserter and exporters read, at a fraction of the memory: no
+    per-instance __dict__ or Pydantic bookkeeping, tuples instead of lists,
+    pooled repeated values and a `created_at` derived from `created`.
+    Records share pooled values, so treat them as immutable.
+    """
+
+    openrouter_id: str
+    name: str
+    description: str
+    context_length: int
+    pricing: CompactPricing
+    architecture: CompactArchitecture
+    top_provider: CompactTopProvider
+    created: int
+    supported_parameters: tuple[str, ...]
+    default_parameters: Mapping[str, Any] | None
+    providers: tuple[CompactEndpoint, ...]
+    author: str
+    model_name: str
+    last_updated: datetime
+
+    @property
+    def created_at(self) -> datetime:
+        """Creation time of the model on OpenRouter"""
+        return datetime.fromtimestamp(self.created, tz=UTC)
+
+    @classmethod
+    def from_validated(
+        cls,
+        model: OpenRouterModel,
+        endpoints: list[Endpoint],
+        author: str,
+        model_name: str,
+        pool: InternPool,
+        last_updated: datetime | None = None,
+    ) -> "CompactModel":
+        """Build from an already-validated model and endpoints without re-validation"""
+        pricing = model.pricing
+        architecture = model.architecture
+        top_provider = model.top_provider
+        return cls(
+            openrouter_id=model.id,
+            name=model.name,
+            description=model.description,
+            context_length=model.context_length,
+            pricing=pool.record(
+                CompactPricing,
+                pricing.prompt,
+                pricing.completion,
+                pricing.request,
+                pricing.image,
+                pricing.web_search,
+                pricing.internal_reasoning,
+            ),
+            architecture=pool.record(
+                CompactArchitecture,
+                architecture.modality,
+                pool.strings(architecture.input_modalities),
+                pool.strings(architecture.output_modalities),
+                architecture.tokenizer,
+                architecture.instruct_type,
+            ),
+            top_provider=pool.record(
+                CompactTopProvider,
+                top_provider.context_length,
+                top_provider.max_completion_tokens,
+                top_provider.is_moderated,
+            ),
+            created=model.created,
+            supported_parameters=pool.strings(model.supported_parameters),
+            default_parameters=(
+                pool.mapping(model.default_parameters)
+                if model.default_parameters is not None
+                else None
+            ),
+            providers=tuple(
+                CompactEndpoint.from_validated(ep, model.name, pool) for ep in endpoints
+            ),
+            author=pool.value(author),
+            model_name=model_name,
+            last_updated=last_updated or datetime.now(UTC),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready dict, shaped like OpenRouterModelWithEndpoints.model_dump(mode="json")"""
+        architecture = self.architecture
+        return {
+            "openrouter_id": self.openrouter_id,
+            "name": self.name,
+            "description": self.description,
+            "context_length": self.context_length,
+            "pricing": {
+                "prompt": self.pricing.prompt,
+                "completion": self.pricing.completion,
+                "request": self.pricing.request,
+                "image": self.pricing.image,
+                "web_search": self.pricing.web_search,
+                "internal_reasoning": self.pricing.internal_reasoning,
+            },
+            "architecture": {
+                "modality": architecture.modality,
+                "input_modalities": list(architecture.input_modalities),
+                "output_modalities": list(architecture.output_modalities),
+                "tokenizer": architecture.tokenizer,
+                "instruct_type": architecture.instruct_type,
+            },
+            "top_provider": {
+                "context_length": self.top_provider.context_length,
+                "max_completion_tokens": self.top_provider.max_completion_tokens,
+                "is_moderated": self.top_provider.is_moderated,
+            },
+            "created": self.created,
+            "supported_parameters": list(self.supported_parameters),
+            "default_parameters": (
+                dict(self.default_parameters)
+                if self.default_parameters is not None
+                else None
+            ),
+            "providers": [ep.to_dict() for ep in self.providers],
+            "author": self.author,
+            "model_name": self.model_name,
+            "created_at": _isoformat(self.created_at),
+            "last_updated": _isoformat(self.last_updated),
+        }
+
+
+def _isoformat(value: datetime) -> str:
+    """ISO 8601 with a "Z" suffix for UTC, as Pydantic serializes datetimes"""
+    return value.isoformat().replace("+00:00", "Z")
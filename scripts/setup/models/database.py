@@ -3,18 +3,58 @@ SQLAlchemy database models for the model registry.
 """
 
 from datetime import UTC, datetime
+from decimal import Decimal, InvalidOperation
 
 from sqlalchemy import (
     JSON,
     Column,
     DateTime,
     Integer,
+    Numeric,
     String,
     Text,
     UniqueConstraint,
     func,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, validates
+
+TOKENS_PER_MILLION = Decimal(1_000_000)
+
+# Cost columns that also get a precomputed USD per million tokens column
+PER_MILLION_COSTS = ("prompt_cost", "completion_cost")
+
+
+def parse_cost(value: str | None) -> Decimal | None:
+    """Exact value of a cost string ("0.000003", "1e-05", "-1"), None if not a number"""
+    if value is None:
+        return None
+    try:
+        cost = Decimal(value)
+    except InvalidOperation:
+        return None
+    return cost if cost.is_finite() else None
+
+
+def numeric_costs(costs: dict[str, str | None]) -> dict[str, Decimal | None]:
+    """NUMERIC column values (`<cost>_numeric`, `<cost>_per_1m`) for string costs"""
+    values: dict[str, Decimal | None] = {}
+    for name, value in costs.items():
+        cost = parse_cost(value)
+        values[f"{name}_numeric"] = cost
+        if name in PER_MILLION_COSTS:
+            values[f"{name}_per_1m"] = (
+                cost * TOKENS_PER_MILLION if cost is not None else None
+            )
+    return values
+
+
+class NumericCostsMixin:
+    """Keeps the NUMERIC copies of string cost columns in step on every assignment"""
+
+    def _set_numeric_costs(self, name: str, value: str | None) -> str | None:
+        for column, cost in numeric_costs({name: value}).items():
+            setattr(self, column, cost)
+        return value
 
 
 # SQLAlchemy Base
@@ -54,7 +94,7 @@ class LLMModel(Base):
     )
 
 
-class ModelPricing(Base):
+class ModelPricing(NumericCostsMixin, Base):
     """Model pricing information (one-to-one with LLMModel)"""
 
     __tablename__ = "model_pricing"
@@ -67,14 +107,36 @@ class ModelPricing(Base):
         index=True,
     )
 
-    # Pricing in USD per token (using NUMERIC for precision)
-    prompt_cost = Column(String(50), nullable=False)  # Keep as string for precision
+    # Pricing in USD per token, as published by OpenRouter
+    prompt_cost = Column(String(50), nullable=False)
     completion_cost = Column(String(50), nullable=False)
     request_cost = Column(String(50), nullable=False, default="0")
     image_cost = Column(String(50), nullable=False, default="0")
     web_search_cost = Column(String(50), nullable=False, default="0")
     internal_reasoning_cost = Column(String(50), nullable=False, default="0")
 
+    # Exact NUMERIC copies for indexed, numerically correct price filters
+    # (set from the string columns above, NULL where a cost is not a number)
+    prompt_cost_numeric = Column(Numeric, default=0, index=True)
+    completion_cost_numeric = Column(Numeric, default=0, index=True)
+    request_cost_numeric = Column(Numeric, default=0)
+    image_cost_numeric = Column(Numeric, default=0)
+    web_search_cost_numeric = Column(Numeric, default=0)
+    internal_reasoning_cost_numeric = Column(Numeric, default=0)
+    prompt_cost_per_1m = Column(Numeric, default=0, index=True)
+    completion_cost_per_1m = Column(Numeric, default=0, index=True)
+
+    @validates(
+        "prompt_cost",
+        "completion_cost",
+        "request_cost",
+        "image_cost",
+        "web_search_cost",
+        "internal_reasoning_cost",
+    )
+    def _validate_cost(self, name: str, value: str | None) -> str | None:
+        return self._set_numeric_costs(name, value)
+
 
 class ModelArchitecture(Base):
     """Model architecture metadata (one-to-one with LLMModel)"""
@@ -168,7 +230,7 @@ class ModelEndpoint(Base):
     is_zdr = Column(String(10), nullable=False, default="false")
 
 
-class ModelEndpointPricing(Base):
+class ModelEndpointPricing(NumericCostsMixin, Base):
     """Endpoint-specific pricing (one-to-one with ModelEndpoint)"""
 
     __tablename__ = "model_endpoint_pricing"
@@ -192,6 +254,36 @@ class ModelEndpointPricing(Base):
     input_cache_write_cost = Column(String(50), nullable=False, default="0")
     discount = Column(String(50), nullable=False, default="0")
 
+    # Exact NUMERIC copies for indexed, numerically correct price filters
+    # (set from the string columns above, NULL where a cost is not a number)
+    prompt_cost_numeric = Column(Numeric, default=0, index=True)
+    completion_cost_numeric = Column(Numeric, default=0, index=True)
+    request_cost_numeric = Column(Numeric, default=0)
+    image_cost_numeric = Column(Numeric, default=0)
+    image_output_cost_numeric = Column(Numeric, default=0)
+    audio_cost_numeric = Column(Numeric, default=0)
+    input_audio_cache_cost_numeric = Column(Numeric, default=0)
+    input_cache_read_cost_numeric = Column(Numeric, default=0)
+    input_cache_write_cost_numeric = Column(Numeric, default=0)
+    discount_numeric = Column(Numeric, default=0)
+    prompt_cost_per_1m = Column(Numeric, default=0, index=True)
+    completion_cost_per_1m = Column(Numeric, default=0, index=True)
+
+    @validates(
+        "prompt_cost",
+        "completion_cost",
+        "request_cost",
+        "image_cost",
+        "image_output_cost",
+        "audio_cost",
+        "input_audio_cache_cost",
+        "input_cache_read_cost",
+        "input_cache_write_cost",
+        "discount",
+    )
+    def _validate_cost(self, name: str, value: str | None) -> str | None:
+        return self._set_numeric_costs(name, value)
+
 
 class ModelSupportedParameter(Base):
     """Supported parameters for model (many-to-many with LLMModel)"""
@@ -227,6 +319,29 @@ class ModelDefaultParameters(Base):
     parameters = Column(JSON)
 
 
+class ModelFingerprint(Base):
+    """Upstream content fingerprints used to skip unchanged models (one-to-one with LLMModel)"""
+
+    __tablename__ = "model_fingerprints"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    model_id = Column(
+        Integer,
+        nullable=False,
+        unique=True,
+        index=True,
+    )
+
+    # SHA-256 of the /models entry and of the /models/{id}/endpoints payload
+    summary_hash = Column(String(64), nullable=False)
+    endpoints_hash = Column(String(64), nullable=False)
+    checked_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    )
+
+
 class SyncMetadata(Base):
     """Tracks synchronization metadata to avoid unnecessary API calls"""
 
@@ -241,5 +356,7 @@ class SyncMetadata(Base):
     )
     models_count = Column(Integer)
     zdr_endpoints_count = Column(Integer)
+    # Hash of the upstream payload for this sync type (e.g. the full ZDR list)
+    content_hash = Column(String(64))
 
     __table_args__ = (UniqueConstraint("sync_type"),)
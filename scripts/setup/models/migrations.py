@@ -0,0 +1,195 @@
+"""
+Lightweight schema migrations applied after `create_all`.
+"""
+
+import logging
+
+from sqlalchemy import (
+    Connection,
+    Table,
+    and_,
+    bindparam,
+    insert,
+    inspect,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from .database import (
+    Base,
+    ModelEndpointPricing,
+    ModelPricing,
+    SyncMetadata,
+    numeric_costs,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _add_missing_columns(sync_conn: Connection) -> list[str]:
+    """Add nullable columns declared on the models but missing from existing tables"""
+    inspector = inspect(sync_conn)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue  # Created from scratch by create_all
+
+        existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+
+            if not column.nullable:
+                logger.warning(
+                    f"Cannot add NOT NULL column {table.name}.{column.name} automatically"
+                )
+                continue
+
+            column_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.exec_driver_sql(
+                f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+            )
+            added.append(f"{table.name}.{column.name}")
+
+    return added
+
+
+def _add_missing_indexes(sync_conn: Connection) -> list[str]:
+    """Create non-unique indexes declared on the models but missing from existing tables"""
+    inspector = inspect(sync_conn)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            # A unique index could fail on, or silently constrain, existing data
+            if not index.unique and index.name not in existing_indexes:
+                index.create(sync_conn)
+                added.append(str(index.name))
+
+    return added
+
+
+def _pending_schema_changes(sync_conn: Connection) -> list[str]:
+    """Tables, columns and indexes declared on the models but missing from the database"""
+    inspector = inspect(sync_conn)
+    existing_tables = set(inspector.get_table_names())
+    pending = []
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            pending.append(table.name)
+            continue
+
+        existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+        pending.extend(
+            f"{table.name}.{column.name}"
+            for column in table.columns
+            if column.name not in existing_columns
+        )
+        existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+        pending.extend(
+            str(index.name)
+            for index in table.indexes
+            if not index.unique and index.name not in existing_indexes
+        )
+
+    return pending
+
+
+# sync_metadata row marking the numeric cost backfill as done for this database
+NUMERIC_COSTS_BACKFILL = "numeric_costs_backfill"
+
+
+def _backfill_numeric_costs(sync_conn: Connection, batch_size: int = 1000) -> int:
+    """
+    Fill NUMERIC cost columns of rows written before they existed.
+
+    Runs once per database: rows written since carry their numeric copies,
+    and costs that are not numbers would otherwise be re-read on every start.
+    Rows are read `batch_size` at a time in id order.
+    """
+    sync_metadata: Table = SyncMetadata.__table__  # type: ignore[assignment]
+    done = sync_conn.scalar(
+        select(sync_metadata.c.id)
+        .where(sync_metadata.c.sync_type == NUMERIC_COSTS_BACKFILL)
+        .limit(1)
+    )
+    if done is not None:
+        return 0
+
+    backfilled = 0
+    for model in (ModelPricing, ModelEndpointPricing):
+        table: Table = model.__table__  # type: ignore[assignment]
+        cost_columns = [
+            column
+            for column in table.columns
+            if f"{column.name}_numeric" in table.columns
+        ]
+        # Only rows with a cost whose numeric copy was never set
+        pending = or_(
+            *(
+                and_(
+                    table.c[f"{column.name}_numeric"].is_(None),
+                    column.is_not(None),
+                )
+                for column in cost_columns
+            )
+        )
+        numeric_columns = [table.c[f"{column.name}_numeric"] for column in cost_columns]
+        # Keys other than row_id become the SET clause
+        statement = update(table).where(table.c.id == bindparam("row_id"))
+
+        last_id = 0
+        while rows := sync_conn.execute(
+            select(table.c.id, *cost_columns, *numeric_columns)
+            .where(pending, table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(batch_size)
+        ).all():
+            last_id = rows[-1].id
+            updates = []
+            for row in rows:
+                values = numeric_costs(
+                    {column.name: row._mapping[column] for column in cost_columns}
+                )
+                # Costs that are not numbers stay NULL and need no write
+                if any(
+                    values[column.name] is not None and row._mapping[column] is None
+                    for column in numeric_columns
+                ):
+                    updates.append({"row_id": row.id, **values})
+            if updates:
+                sync_conn.execute(statement, updates)
+            backfilled += len(updates)
+
+    sync_conn.execute(insert(sync_metadata).values(sync_type=NUMERIC_COSTS_BACKFILL))
+    return backfilled
+
+
+async def pending_schema_changes(conn: AsyncConnection) -> list[str]:
+    """What `create_all` and `apply_schema_migrations` would add, read-only"""
+    return await conn.run_sync(_pending_schema_changes)
+
+
+async def apply_schema_migrations(conn: AsyncConnection) -> None:
+    """Bring tables created by older versions up to date with the models"""
+    added = await conn.run_sync(_add_missing_columns)
+    if added:
+        logger.info(f"✓ Added {len(added)} new columns: {', '.join(added)}")
+
+    indexes = await conn.run_sync(_add_missing_indexes)
+    if indexes:
+        logger.info(f"✓ Created {len(indexes)} new indexes: {', '.join(indexes)}")
+
+    backfilled = await conn.run_sync(_backfill_numeric_costs)
+    if backfilled:
+        logger.info(f"✓ Backfilled numeric costs for {backfilled} pricing rows")
@@ -2,15 +2,60 @@
 OpenRouter API models and parsing utilities.
 """
 
+import json
 import logging
+from collections.abc import Callable
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, NotRequired, TypedDict, TypeVar
+
+from pydantic import (
+    BaseModel,
+    Field,
+    TypeAdapter,
+    ValidationError,
+    ValidationInfo,
+    field_validator,
+)
+
+from ..utils.validation import (
+    DEFAULT_PARAMETER_SET,
+    SUPPORTED_PARAMETER_SET,
+    collect_validation_diagnostics,
+    get_validation_diagnostics,
+)
 
-from pydantic import BaseModel, Field, field_validator
+logger = logging.getLogger(__name__)
 
-from ..utils.validation import is_valid_default_parameter, is_valid_supported_parameter
+T = TypeVar("T")
 
-logger = logging.getLogger(__name__)
+
+def _drop_unsupported_parameters(
+    v: list[str], info: ValidationInfo, owner: str, id_field: str
+) -> list[str]:
+    """Filter out unknown supported parameters, recording them for the run summary"""
+    invalid_params = [param for param in v if param not in SUPPORTED_PARAMETER_SET]
+    if invalid_params:
+        get_validation_diagnostics().record(
+            f"{owner}.{info.field_name}", invalid_params, info.data.get(id_field)
+        )
+        v = [param for param in v if param in SUPPORTED_PARAMETER_SET]
+    return v
+
+
+def _drop_invalid_default_parameters(
+    v: dict[str, Any] | None, info: ValidationInfo, owner: str, id_field: str
+) -> dict[str, Any] | None:
+    """Remove unknown default parameter keys, recording them for the run summary"""
+    if v is None:
+        return v
+
+    invalid_keys = [key for key in v if key not in DEFAULT_PARAMETER_SET]
+    if invalid_keys:
+        get_validation_diagnostics().record(
+            f"{owner}.{info.field_name}", invalid_keys, info.data.get(id_field)
+        )
+        v = {k: v[k] for k in v if k in DEFAULT_PARAMETER_SET}
+    return v
 
 
 class Architecture(BaseModel):
@@ -59,32 +104,19 @@ class OpenRouterModel(BaseModel):
 
     @field_validator("supported_parameters")
     @classmethod
-    def validate_supported_parameters(cls, v: list[str]) -> list[str]:
-        """Validate that all supported parameters are valid"""
-        invalid_params = [
-            param for param in v if not is_valid_supported_parameter(param)
-        ]
-        if invalid_params:
-            logger.warning(f"Found invalid supported parameters: {invalid_params}")
-            # Filter out invalid parameters instead of failing
-            v = [param for param in v if is_valid_supported_parameter(param)]
-        return v
+    def validate_supported_parameters(
+        cls, v: list[str], info: ValidationInfo
+    ) -> list[str]:
+        """Filter out invalid supported parameters instead of failing"""
+        return _drop_unsupported_parameters(v, info, cls.__name__, "id")
 
     @field_validator("default_parameters")
     @classmethod
     def validate_default_parameters(
-        cls, v: dict[str, Any] | None
+        cls, v: dict[str, Any] | None, info: ValidationInfo
     ) -> dict[str, Any] | None:
-        """Validate that default parameters only contain valid keys"""
-        if v is None:
-            return v
-
-        invalid_keys = [key for key in v.keys() if not is_valid_default_parameter(key)]
-        if invalid_keys:
-            logger.warning(f"Found invalid default parameter keys: {invalid_keys}")
-            # Remove invalid keys instead of failing
-            v = {k: v[k] for k in v.keys() if is_valid_default_parameter(k)}
-        return v
+        """Remove invalid default parameter keys instead of failing"""
+        return _drop_invalid_default_parameters(v, info, cls.__name__, "id")
 
 
 class Endpoint(BaseModel):
@@ -106,18 +138,11 @@ class Endpoint(BaseModel):
 
     @field_validator("supported_parameters")
     @classmethod
-    def validate_supported_parameters(cls, v: list[str]) -> list[str]:
-        """Validate that all supported parameters are valid"""
-        invalid_params = [
-            param for param in v if not is_valid_supported_parameter(param)
-        ]
-        if invalid_params:
-            logger.warning(
-                f"Found invalid supported parameters in endpoint: {invalid_params}"
-            )
-            # Filter out invalid parameters instead of failing
-            v = [param for param in v if is_valid_supported_parameter(param)]
-        return v
+    def validate_supported_parameters(
+        cls, v: list[str], info: ValidationInfo
+    ) -> list[str]:
+        """Filter out invalid supported parameters instead of failing"""
+        return _drop_unsupported_parameters(v, info, cls.__name__, "name")
 
 
 class OpenRouterModelWithEndpoints(BaseModel):
@@ -150,36 +175,44 @@ class OpenRouterModelWithEndpoints(BaseModel):
 
     @field_validator("supported_parameters")
     @classmethod
-    def validate_supported_parameters(cls, v: list[str]) -> list[str]:
-        """Validate that all supported parameters are valid"""
-        invalid_params = [
-            param for param in v if not is_valid_supported_parameter(param)
-        ]
-        if invalid_params:
-            logger.warning(
-                f"Found invalid supported parameters in {cls.__name__}: {invalid_params}"
-            )
-            # Filter out invalid parameters instead of failing
-            v = [param for param in v if is_valid_supported_parameter(param)]
-        return v
+    def validate_supported_parameters(
+        cls, v: list[str], info: ValidationInfo
+    ) -> list[str]:
+        """Filter out invalid supported parameters instead of failing"""
+        return _drop_unsupported_parameters(v, info, cls.__name__, "openrouter_id")
 
     @field_validator("default_parameters")
     @classmethod
     def validate_default_parameters(
-        cls, v: dict[str, Any] | None
+        cls, v: dict[str, Any] | None, info: ValidationInfo
     ) -> dict[str, Any] | None:
-        """Validate that default parameters only contain valid keys"""
-        if v is None:
-            return v
-
-        invalid_keys = [key for key in v.keys() if not is_valid_default_parameter(key)]
-        if invalid_keys:
-            logger.warning(
-                f"Found invalid default parameter keys in {cls.__name__}: {invalid_keys}"
-            )
-            # Remove invalid keys instead of failing
-            v = {k: v[k] for k in v.keys() if is_valid_default_parameter(k)}
-        return v
+        """Remove invalid default parameter keys instead of failing"""
+        return _drop_invalid_default_parameters(v, info, cls.__name__, "openrouter_id")
+
+
+class _ModelsResponse(TypedDict):
+    """Body of GET /models"""
+
+    data: NotRequired[list[OpenRouterModel]]
+
+
+class _EndpointsData(TypedDict):
+    """`data` object of GET /models/{id}/endpoints"""
+
+    endpoints: NotRequired[list[Endpoint]]
+
+
+class _EndpointsResponse(TypedDict):
+    """Body of GET /models/{id}/endpoints"""
+
+    data: NotRequired[_EndpointsData]
+
+
+# Validators are built once at import instead of per call
+_MODELS_RESPONSE = TypeAdapter(_ModelsResponse)
+_MODEL_LIST = TypeAdapter(list[OpenRouterModel])
+_ENDPOINTS_RESPONSE = TypeAdapter(_EndpointsResponse)
+_ENDPOINT_LIST = TypeAdapter(list[Endpoint])
 
 
 def parse_openrouter_model(raw_model: dict[str, Any]) -> OpenRouterModel | None:
@@ -189,3 +222,63 @@ def parse_openrouter_model(raw_model: dict[str, Any]) -> OpenRouterModel | None:
     except Exception as e:
         logger.warning(f"Failed to parse model {raw_model.get('id')}: {e}")
         return None
+
+
+def _validate_batch(validate: Callable[[], T]) -> T:
+    """
+    Run a whole-batch validation, keeping the parameters it dropped only if
+    it succeeds; the per-item fallback records them again otherwise.
+    """
+    with collect_validation_diagnostics() as batch_diagnostics:
+        result = validate()
+    get_validation_diagnostics().merge(batch_diagnostics)
+    return result
+
+
+def parse_openrouter_models(raw_models: list[dict[str, Any]]) -> list[OpenRouterModel]:
+    """
+    Validate a list of raw models in one call.
+    If any model is invalid, falls back to parsing them one by one so only
+    the invalid models are skipped.
+    """
+    try:
+        return _validate_batch(lambda: _MODEL_LIST.validate_python(raw_models))
+    except ValidationError:
+        return [
+            parsed_model
+            for raw_model in raw_models
+            if (parsed_model := parse_openrouter_model(raw_model)) is not None
+        ]
+
+
+def parse_openrouter_models_json(content: bytes) -> list[OpenRouterModel]:
+    """
+    Validate a raw GET /models body straight from JSON bytes.
+    If any model is invalid, falls back to decoding the body and parsing the
+    models one by one so only the invalid models are skipped.
+    """
+    try:
+        response = _validate_batch(lambda: _MODELS_RESPONSE.validate_json(content))
+        return response.get("data", [])
+    except ValidationError:
+        raw_models: list[dict[str, Any]] = json.loads(content).get("data", [])
+        return [
+            parsed_model
+            for raw_model in raw_models
+            if (parsed_model := parse_openrouter_model(raw_model)) is not None
+        ]
+
+
+def parse_endpoints(raw_endpoints: list[dict[str, Any]]) -> list[Endpoint]:
+    """Validate a model's raw endpoints in one call, raising if any is invalid"""
+    return _ENDPOINT_LIST.validate_python(raw_endpoints)
+
+
+def parse_endpoints_json(content: bytes) -> list[Endpoint]:
+    """
+    Validate a raw GET /models/{id}/endpoints body straight from JSON bytes,
+    raising if any endpoint is invalid.
+    """
+    return (
+        _ENDPOINTS_RESPONSE.validate_json(content).get("data", {}).get("endpoints", [])
+    )
@@ -0,0 +1,358 @@
+"""
+Database sync stages shared by the batch and streaming pipelines.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .change_detection import ChangeDetector
+from .diff_sync import apply_changeset, diff_models, load_snapshot
+from .fetchers.metrics import FetchMetrics
+from .fetchers.openrouter import (
+    build_model_with_endpoints,
+    fetch_openrouter_models,
+    stream_endpoints_payloads,
+)
+from .fetchers.refresh import CacheRefresher
+from .fetchers.retry import RetryBudget
+from .fetchers.zdr import fetch_zdr_endpoints
+from .id_resolver import IdResolver, load_id_resolver
+from .inserters.bulk_insert import DEFAULT_INSERT_CHUNK_SIZE, bulk_insert_models
+from .models.compact import CompactModel, InternPool
+from .models.openrouter import Endpoint, OpenRouterModel
+from .models.zdr import ZDREndpoint
+from .staging_sync import staging_sync_models
+from .updaters.fingerprints import save_fingerprints
+
+logger = logging.getLogger(__name__)
+
+# Database write engines selectable with --sync-engine
+SYNC_ENGINES = ("orm", "staging")
+
+
+async def apply_updates(
+    session: AsyncSession,
+    models: list[CompactModel],
+    zdr_lookup: dict[tuple[str, str, str], ZDREndpoint],
+    resolver: IdResolver | None = None,
+    dry_run: bool = False,
+    async_session: async_sessionmaker[AsyncSession] | None = None,
+) -> dict[str, int]:
+    """
+    Update existing models, returning the rows changed per stage.
+
+    The rows of the models found in `resolver` (loaded here if not given) are
+    loaded in one snapshot, diffed against the catalog in memory and written
+    in one batched transaction. With `async_session`, the snapshot tables are
+    loaded and the changed tables written concurrently on their own sessions
+    (PostgreSQL only, one transaction per table). With `dry_run`, the
+    changeset is logged instead of written.
+    """
+    ids = resolver or await load_id_resolver(session)
+    model_ids = {
+        model_id
+        for m in models
+        if (model_id := ids.model_id(m.author, m.model_name)) is not None
+    }
+    snapshot = await load_snapshot(session, model_ids, async_session)
+    changeset = diff_models(snapshot, models, zdr_lookup)
+    if dry_run:
+        changeset.log_report()
+    else:
+        await apply_changeset(session, changeset, async_session)
+    return changeset.counts()
+
+
+async def write_models(
+    async_session: async_sessionmaker[AsyncSession],
+    models: list[CompactModel],
+    zdr_lookup: dict[tuple[str, str, str], ZDREndpoint],
+    sync_engine: str = "orm",
+    resolver: IdResolver | None = None,
+    dry_run: bool = False,
+    insert_chunk_size: int = DEFAULT_INSERT_CHUNK_SIZE,
+) -> tuple[dict[str, int], int, int]:
+    """
+    Update existing and insert new models with the chosen engine.
+
+    The "staging" engine reconciles the whole batch in SQL through COPY-filled
+    staging tables (PostgreSQL only); if it fails, the snapshot diff and
+    inserter write the batch instead. The ORM engine resolves ids through
+    `resolver` and records inserted ones in it; the staging engine resolves
+    them in SQL, leaving `resolver` behind, so the fallback loads a fresh one.
+    New models are inserted and committed `insert_chunk_size` at a time.
+
+    With `dry_run`, either engine only logs the changeset of existing models
+    and the number of new models, writing nothing. The changeset comes from
+    the snapshot diff for both engines: the staging engine applies the same
+    rules and counts the same changed rows (see setup.bench.parity).
+
+    Returns: (update counts per stage, inserted_count, skipped_count)
+    """
+    if dry_run:
+        async with async_session() as session:
+            ids = resolver or await load_id_resolver(session)
+            update_counts = await apply_updates(
+                session,
+                models,
+                zdr_lookup,
+                ids,
+                dry_run=True,
+                async_session=async_session,
+            )
+        new_models = {
+            (m.author, m.model_name)
+            for m in models
+            if not ids.has_model(m.author, m.model_name)
+        }
+        logger.info(f"  • {len(new_models)} new models to insert")
+        return update_counts, 0, len(models)
+
+    if sync_engine == "staging":
+        async with async_session() as session:
+            try:
+                return await staging_sync_models(session, models, zdr_lookup)
+            except Exception as e:
+                logger.warning(f"Staging sync failed, falling back to the ORM: {e}")
+                await session.rollback()
+        resolver = None
+
+    async with async_session() as session:
+        ids = resolver or await load_id_resolver(session)
+        update_counts = await apply_updates(
+            session, models, zdr_lookup, ids, async_session=async_session
+        )
+    async with async_session() as session:
+        inserted, skipped = await bulk_insert_models(
+            session,
+            models,
+            zdr_lookup,
+            resolver=ids,
+            chunk_size=insert_chunk_size,
+        )
+    return update_counts, inserted, skipped
+
+
+def log_update_counts(update_counts: dict[str, int]) -> None:
+    """Log per-stage update counts"""
+    logger.info("✓ Updates complete:")
+    for stage, count in update_counts.items():
+        logger.info(f"  • {stage}: {count}")
+
+
+@dataclass
+class StreamingSyncResult:
+    """Outcome of a streaming sync run"""
+
+    catalog_size: int = 0
+    processed: int = 0
+    unchanged: int = 0
+    inserted: int = 0
+    skipped: int = 0
+    batches: int = 0
+    update_counts: dict[str, int] = field(default_factory=dict)
+    zdr_lookup: dict[tuple[str, str, str], ZDREndpoint] = field(default_factory=dict)
+    # Only populated when the caller asks to keep models (e.g. for exports)
+    models_with_endpoints: list[CompactModel] = field(default_factory=list)
+
+
+@dataclass
+class _Batch:
+    """A batch of parsed models split by whether they already exist in the DB"""
+
+    existing: list[CompactModel]
+    new: list[CompactModel]
+
+
+async def run_streaming_sync(
+    async_session: async_sessionmaker[AsyncSession],
+    client: httpx.AsyncClient,
+    retry_budget: RetryBudget | None = None,
+    max_concurrency: int = 64,
+    batch_size: int = 100,
+    queue_size: int = 256,
+    keep_models: bool = False,
+    change_detector: ChangeDetector | None = None,
+    metrics: FetchMetrics | None = None,
+    use_cache: bool = False,
+    cache_refresher: CacheRefresher | None = None,
+    sync_engine: str = "orm",
+    dry_run: bool = False,
+    insert_chunk_size: int = DEFAULT_INSERT_CHUNK_SIZE,
+) -> StreamingSyncResult:
+    """
+    Stream the catalog through fetch → build → diff → write stages.
+
+    Validated endpoints flow through bounded queues, so database writes for the
+    first batches overlap with fetches for the remaining models and a slow
+    stage applies backpressure upstream instead of buffering the catalog:
+
+        endpoints fan-out ─► build models ─► diff (new vs existing) ─► batched write
+                          q(queue_size)     q(queue_size)              q(2 batches)
+
+    ZDR endpoints are fetched concurrently and awaited by the write stage
+    before its first batch. Memory stays proportional to the queue and batch
+    sizes unless `keep_models` is set.
+
+    With a `change_detector`, the fan-out waits for the ZDR list to select
+    which models to fetch, the diff stage drops models whose fingerprints are
+    unchanged, and the new fingerprints are saved once every batch is written.
+
+    With the "staging" `sync_engine`, each batch is written in one staging
+    transaction instead of the snapshot diff and inserter. With `dry_run`,
+    each batch's changeset is logged instead of written.
+    """
+    result = StreamingSyncResult()
+
+    fetched: asyncio.Queue[tuple[OpenRouterModel, list[Endpoint]] | None] = (
+        asyncio.Queue(maxsize=queue_size)
+    )
+    parsed: asyncio.Queue[CompactModel | None] = asyncio.Queue(maxsize=queue_size)
+    batches: asyncio.Queue[_Batch | None] = asyncio.Queue(maxsize=2)
+
+    async def parse_stage() -> None:
+        # Values are shared between this run's records only
+        pool = InternPool()
+        while (item := await fetched.get()) is not None:
+            model, endpoints = item
+            model_with_endpoints = build_model_with_endpoints(model, endpoints, pool)
+            if model_with_endpoints is not None:
+                await parsed.put(model_with_endpoints)
+        await parsed.put(None)
+
+    async def diff_stage(existing_keys: set[tuple[str, str]]) -> None:
+        batch = _Batch(existing=[], new=[])
+        while (m := await parsed.get()) is not None:
+            result.processed += 1
+            if keep_models:
+                result.models_with_endpoints.append(m)
+            if change_detector is not None and not change_detector.has_changed(m):
+                result.unchanged += 1
+                continue
+
+            key = (m.author, m.model_name)
+            if key in existing_keys:
+                batch.existing.append(m)
+            else:
+                batch.new.append(m)
+                existing_keys.add(key)
+
+            if len(batch.existing) + len(batch.new) >= batch_size:
+                await batches.put(batch)
+                batch = _Batch(existing=[], new=[])
+
+        if batch.existing or batch.new:
+            await batches.put(batch)
+        await batches.put(None)
+
+    async def write_stage(
+        zdr_task: asyncio.Task[dict[tuple[str, str, str], ZDREndpoint]],
+        resolver: IdResolver,
+    ) -> None:
+        zdr_lookup = await zdr_task
+        while (batch := await batches.get()) is not None:
+            result.batches += 1
+
+            if sync_engine == "staging" or dry_run:
+                # One staging transaction (or dry-run report) for the whole batch
+                counts, inserted, skipped = await write_models(
+                    async_session,
+                    batch.existing + batch.new,
+                    zdr_lookup,
+                    sync_engine,
+                    resolver,
+                    dry_run,
+                    insert_chunk_size,
+                )
+            else:
+                counts = {}
+                if batch.existing:
+                    async with async_session() as session:
+                        counts = await apply_updates(
+                            session,
+                            batch.existing,
+                            zdr_lookup,
+                            resolver,
+                            async_session=async_session,
+                        )
+
+                inserted = skipped = 0
+                if batch.new:
+                    async with async_session() as session:
+                        inserted, skipped = await bulk_insert_models(
+                            session,
+                            batch.new,
+                            zdr_lookup,
+                            resolver=resolver,
+                            chunk_size=insert_chunk_size,
+                        )
+                skipped += len(batch.existing)
+
+            for stage, count in counts.items():
+                result.update_counts[stage] = result.update_counts.get(stage, 0) + count
+            result.inserted += inserted
+            result.skipped += skipped
+            logger.info(
+                f"  • {'Diffed' if dry_run else 'Wrote'} batch {result.batches}: {len(batch.existing)} updated, "
+                f"{len(batch.new)} new ({result.processed} models processed so far)"
+            )
+
+    async with asyncio.TaskGroup() as task_group:
+        zdr_task = task_group.create_task(
+            fetch_zdr_endpoints(
+                use_cache=use_cache,
+                retry_budget=retry_budget,
+                client=client,
+                metrics=metrics,
+                cache_refresher=cache_refresher,
+            )
+        )
+
+        logger.info("Fetching OpenRouter models...")
+        raw_models = await fetch_openrouter_models(
+            use_cache=use_cache,
+            retry_budget=retry_budget,
+            client=client,
+            metrics=metrics,
+            cache_refresher=cache_refresher,
+        )
+        result.catalog_size = len(raw_models)
+        if change_detector is not None:
+            raw_models = change_detector.select_models(raw_models, await zdr_task)
+        async with async_session() as session:
+            # Shared by every batch and kept current by the inserts
+            resolver = await load_id_resolver(session)
+        existing_keys = set(resolver.model_ids)
+
+        logger.info(
+            f"Streaming endpoints for {len(raw_models)} models "
+            f"(batch size {batch_size}, queue size {queue_size})..."
+        )
+        task_group.create_task(
+            stream_endpoints_payloads(
+                raw_models,
+                fetched,
+                use_cache=use_cache,
+                max_concurrency=max_concurrency,
+                retry_budget=retry_budget,
+                client=client,
+                metrics=metrics,
+                cache_refresher=cache_refresher,
+            )
+        )
+        task_group.create_task(parse_stage())
+        task_group.create_task(diff_stage(existing_keys))
+        task_group.create_task(write_stage(zdr_task, resolver))
+
+    if change_detector is not None:
+        logger.info(f"✓ Skipped {result.unchanged} unchanged models")
+        if not dry_run:
+            async with async_session() as session:
+                await save_fingerprints(session, change_detector)
+
+    result.zdr_lookup = zdr_task.result()
+    return result
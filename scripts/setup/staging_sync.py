@@ -0,0 +1,582 @@
+"""
+COPY-based sync engine: stage the catalog, then reconcile it in SQL (PostgreSQL).
+"""
+
+import json
+import logging
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    ColumnElement,
+    Dialect,
+    Integer,
+    MetaData,
+    Table,
+    and_,
+    case,
+    cast,
+    false,
+    func,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql.dml import Insert, Update
+
+from .diff_sync import NON_ZDR_ENDPOINT_COSTS
+from .inserters.rows import (
+    Row,
+    ZDRLookup,
+    architecture_row,
+    default_parameters_row,
+    endpoint_key,
+    endpoint_pricing_row,
+    endpoint_row,
+    llm_model_row,
+    modality_rows,
+    model_pricing_row,
+    supported_parameter_rows,
+    top_provider_row,
+)
+from .models.compact import CompactModel
+from .models.database import (
+    LLMModel,
+    ModelArchitecture,
+    ModelArchitectureModality,
+    ModelDefaultParameters,
+    ModelEndpoint,
+    ModelEndpointPricing,
+    ModelPricing,
+    ModelSupportedParameter,
+    ModelTopProvider,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _table(model: Any) -> Table:
+    table: Table = model.__table__
+    return table
+
+
+LLM_MODELS = _table(LLMModel)
+MODEL_PRICING = _table(ModelPricing)
+MODEL_ARCHITECTURE = _table(ModelArchitecture)
+MODALITIES = _table(ModelArchitectureModality)
+TOP_PROVIDER = _table(ModelTopProvider)
+SUPPORTED_PARAMETERS = _table(ModelSupportedParameter)
+DEFAULT_PARAMETERS = _table(ModelDefaultParameters)
+ENDPOINTS = _table(ModelEndpoint)
+ENDPOINT_PRICING = _table(ModelEndpointPricing)
+
+staging_metadata = MetaData()
+
+
+def _staging_table(target: Table, *extra: Column[Any]) -> Table:
+    """
+    Temporary copy of `target`'s columns without keys or constraints, dropped
+    at commit. Foreign ids (model_id, architecture_id, endpoint_id) hold the
+    stage_id of the staged parent row instead of a database id.
+    """
+    return Table(
+        f"staging_{target.name}",
+        staging_metadata,
+        *extra,
+        *(Column(c.name, c.type) for c in target.columns if c.name != "id"),
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+# model_id is the database id, matched or inserted during the reconcile
+STAGED_MODELS = _staging_table(
+    LLM_MODELS,
+    Column("stage_id", Integer),
+    Column("model_id", Integer),
+    Column("is_new", Boolean, nullable=False, server_default=false()),
+)
+STAGED_PRICING = _staging_table(MODEL_PRICING)
+STAGED_ARCHITECTURE = _staging_table(MODEL_ARCHITECTURE)
+STAGED_MODALITIES = _staging_table(MODALITIES)
+STAGED_TOP_PROVIDER = _staging_table(TOP_PROVIDER)
+STAGED_SUPPORTED_PARAMETERS = _staging_table(SUPPORTED_PARAMETERS)
+STAGED_DEFAULT_PARAMETERS = _staging_table(DEFAULT_PARAMETERS)
+STAGED_ENDPOINTS = _staging_table(ENDPOINTS, Column("stage_id", Integer))
+STAGED_ENDPOINT_PRICING = _staging_table(ENDPOINT_PRICING)
+
+
+def supports_staging_sync(dialect: Dialect) -> bool:
+    """Whether the database can take the COPY-based sync (PostgreSQL over asyncpg)"""
+    return dialect.name == "postgresql" and dialect.driver == "asyncpg"
+
+
+def stage_rows(
+    models: Sequence[CompactModel], zdr_lookup: ZDRLookup
+) -> dict[Table, list[Row]]:
+    """
+    Rows for every staging table. Models are numbered by their position (the
+    first of any duplicate (author, model_name) wins), endpoints likewise, and
+    an endpoint listed twice for a model is staged once.
+    """
+    rows: dict[Table, list[Row]] = {
+        table: [] for table in staging_metadata.sorted_tables
+    }
+    seen_models: set[tuple[str, str]] = set()
+    seen_endpoints: set[tuple[int, str, str, str]] = set()
+
+    for m in models:
+        if (m.author, m.model_name) in seen_models:
+            continue
+        seen_models.add((m.author, m.model_name))
+        stage_id = len(seen_models)
+
+        rows[STAGED_MODELS].append({"stage_id": stage_id, **llm_model_row(m)})
+        rows[STAGED_PRICING].append(model_pricing_row(stage_id, m))
+        rows[STAGED_ARCHITECTURE].append(architecture_row(stage_id, m))
+        rows[STAGED_MODALITIES].extend(modality_rows(stage_id, m))
+        rows[STAGED_TOP_PROVIDER].append(top_provider_row(stage_id, m))
+        rows[STAGED_SUPPORTED_PARAMETERS].extend(supported_parameter_rows(stage_id, m))
+        default_parameters = default_parameters_row(stage_id, m)
+        if default_parameters is not None:
+            rows[STAGED_DEFAULT_PARAMETERS].append(default_parameters)
+
+        for ep in m.providers:
+            key = endpoint_key(stage_id, ep)
+            if key in seen_endpoints:
+                continue
+            seen_endpoints.add(key)
+            endpoint_stage_id = len(seen_endpoints)
+            rows[STAGED_ENDPOINTS].append(
+                {
+                    "stage_id": endpoint_stage_id,
+                    **endpoint_row(stage_id, ep, zdr_lookup),
+                }
+            )
+            rows[STAGED_ENDPOINT_PRICING].append(
+                endpoint_pricing_row(endpoint_stage_id, ep, zdr_lookup)
+            )
+
+    return rows
+
+
+async def _copy_rows(conn: AsyncConnection, table: Table, rows: list[Row]) -> None:
+    """Stream rows into a staging table with a binary COPY"""
+    if not rows:
+        return
+    columns = list(rows[0])
+    json_columns = {name for name in columns if isinstance(table.c[name].type, JSON)}
+    records = [
+        tuple(
+            json.dumps(row[name]) if name in json_columns else row[name]
+            for name in columns
+        )
+        for row in rows
+    ]
+    raw_connection = await conn.get_raw_connection()
+    # COPY runs on the driver connection, inside the session's transaction
+    await raw_connection.driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+        table.name, records=records, columns=columns
+    )
+
+
+# ============================================================================
+# FILL RULES (the same ones the diff engine applies)
+# ============================================================================
+
+
+def _has_text(column: ColumnElement[Any]) -> ColumnElement[bool]:
+    return func.coalesce(column, "") != ""
+
+
+def _is_blank(column: ColumnElement[Any]) -> ColumnElement[bool]:
+    return func.coalesce(column, "") == ""
+
+
+def _is_blank_cost(column: ColumnElement[Any]) -> ColumnElement[bool]:
+    return func.coalesce(column, "").in_(["", "0"])
+
+
+def _has_number(column: ColumnElement[Any]) -> ColumnElement[bool]:
+    return func.coalesce(column, 0) != 0
+
+
+def _is_zero(column: ColumnElement[Any]) -> ColumnElement[bool]:
+    return func.coalesce(column, 0) == 0
+
+
+def _filled(
+    target: Table, staged: Table, fills: dict[str, ColumnElement[bool]]
+) -> dict[str, ColumnElement[Any]]:
+    """SET values taking the staged column only where its fill condition holds"""
+    return {
+        name: case((condition, staged.c[name]), else_=target.c[name])
+        for name, condition in fills.items()
+    }
+
+
+def _changed(
+    target: Table, values: dict[str, ColumnElement[Any]]
+) -> ColumnElement[bool]:
+    """Whether any SET value differs from the stored column"""
+    return or_(
+        *(value.is_distinct_from(target.c[name]) for name, value in values.items())
+    )
+
+
+def _cost_columns(table: Table) -> list[str]:
+    """String cost columns that have NUMERIC copies"""
+    return [c.name for c in table.columns if f"{c.name}_numeric" in table.columns]
+
+
+def _fill_costs(
+    target: Table, staged: Table, fills: dict[str, ColumnElement[bool]]
+) -> dict[str, ColumnElement[Any]]:
+    """Like _filled, carrying each cost's NUMERIC copies along with it"""
+    values: dict[str, ColumnElement[Any]] = {}
+    for name, condition in fills.items():
+        for column in (name, f"{name}_numeric", f"{name}_per_1m"):
+            if column in target.columns:
+                values[column] = case(
+                    (condition, staged.c[column]), else_=target.c[column]
+                )
+    return values
+
+
+# ============================================================================
+# RECONCILE STATEMENTS
+# ============================================================================
+
+
+def _match_existing_models() -> Update:
+    """Record the database id of every staged model that already exists"""
+    sm = STAGED_MODELS
+    return (
+        update(sm)
+        .where(
+            sm.c.author == LLM_MODELS.c.author,
+            sm.c.model_name == LLM_MODELS.c.model_name,
+        )
+        .values(model_id=LLM_MODELS.c.id)
+    )
+
+
+def _update_llm_models(now: datetime) -> Update:
+    sm, m = STAGED_MODELS, LLM_MODELS
+    fills = {
+        "display_name": and_(_has_text(sm.c.display_name), _is_blank(m.c.display_name)),
+        "description": and_(_has_text(sm.c.description), _is_blank(m.c.description)),
+        "context_length": and_(
+            _has_number(sm.c.context_length), _is_zero(m.c.context_length)
+        ),
+    }
+    return (
+        update(m)
+        .where(m.c.id == sm.c.model_id, or_(*fills.values()))
+        .values(**_filled(m, sm, fills), last_updated=now)
+    )
+
+
+def _update_model_pricing() -> Update:
+    sm, sp, p = STAGED_MODELS, STAGED_PRICING, MODEL_PRICING
+    fills = {
+        name: and_(_has_text(sp.c[name]), _is_blank_cost(p.c[name]))
+        for name in _cost_columns(p)
+    }
+    # A staged "0" fills a stored "0" without changing it
+    values = _fill_costs(p, sp, fills)
+    return (
+        update(p)
+        .where(
+            sp.c.model_id == sm.c.stage_id,
+            p.c.model_id == sm.c.model_id,
+            _changed(p, values),
+        )
+        .values(**values)
+    )
+
+
+def _update_architecture() -> Update:
+    sm, sa, a = STAGED_MODELS, STAGED_ARCHITECTURE, MODEL_ARCHITECTURE
+    fills = {
+        name: and_(_has_text(sa.c[name]), _is_blank(a.c[name]))
+        for name in ("modality", "tokenizer", "instruct_type")
+    }
+    return (
+        update(a)
+        .where(
+            sa.c.model_id == sm.c.stage_id,
+            a.c.model_id == sm.c.model_id,
+            or_(*fills.values()),
+        )
+        .values(**_filled(a, sa, fills))
+    )
+
+
+def _update_top_provider() -> Update:
+    """Top provider metadata always follows the latest values"""
+    sm, st, t = STAGED_MODELS, STAGED_TOP_PROVIDER, TOP_PROVIDER
+    values = {
+        "context_length": func.coalesce(st.c.context_length, t.c.context_length),
+        "max_completion_tokens": func.coalesce(
+            st.c.max_completion_tokens, t.c.max_completion_tokens
+        ),
+        "is_moderated": st.c.is_moderated,
+    }
+    return (
+        update(t)
+        .where(
+            st.c.model_id == sm.c.stage_id,
+            t.c.model_id == sm.c.model_id,
+            _changed(t, values),
+        )
+        .values(**values)
+    )
+
+
+def _endpoint_matches(endpoints: Table) -> ColumnElement[bool]:
+    """Join a database endpoints table to its staged endpoint by natural key"""
+    sm, se = STAGED_MODELS, STAGED_ENDPOINTS
+    return and_(
+        se.c.model_id == sm.c.stage_id,
+        endpoints.c.model_id == sm.c.model_id,
+        endpoints.c.name == se.c.name,
+        endpoints.c.provider_name == se.c.provider_name,
+        endpoints.c.tag == se.c.tag,
+    )
+
+
+def _update_endpoints() -> Update:
+    """Fill empty endpoint fields; status, caching and ZDR always follow the latest"""
+    se, e = STAGED_ENDPOINTS, ENDPOINTS
+    fills = {
+        "context_length": and_(
+            _has_number(se.c.context_length), _is_zero(e.c.context_length)
+        ),
+        "quantization": and_(_has_text(se.c.quantization), _is_blank(e.c.quantization)),
+        "max_completion_tokens": and_(
+            se.c.max_completion_tokens.is_not(None), e.c.max_completion_tokens.is_(None)
+        ),
+        "max_prompt_tokens": and_(
+            se.c.max_prompt_tokens.is_not(None), e.c.max_prompt_tokens.is_(None)
+        ),
+    }
+    latest: dict[str, ColumnElement[Any]] = {
+        name: se.c[name] for name in ("status", "supports_implicit_caching", "is_zdr")
+    }
+    return (
+        update(e)
+        .where(_endpoint_matches(e), or_(*fills.values(), _changed(e, latest)))
+        .values(**_filled(e, se, fills), **latest)
+    )
+
+
+def _update_endpoint_pricing() -> Update:
+    se, sp, p = STAGED_ENDPOINTS, STAGED_ENDPOINT_PRICING, ENDPOINT_PRICING
+    fills = {
+        name: and_(
+            _has_text(sp.c[name]),
+            _is_blank_cost(p.c[name]),
+            *(() if name in NON_ZDR_ENDPOINT_COSTS else (se.c.is_zdr == "true",)),
+        )
+        for name in _cost_columns(p)
+    }
+    values = _fill_costs(p, sp, fills)
+    return (
+        update(p)
+        .where(
+            _endpoint_matches(ENDPOINTS),
+            sp.c.endpoint_id == se.c.stage_id,
+            p.c.endpoint_id == ENDPOINTS.c.id,
+            _changed(p, values),
+        )
+        .values(**values)
+    )
+
+
+def _merge_default_parameters() -> Update:
+    """Merge staged defaults over the stored ones; a null default removes the key"""
+    sm, sd, d = STAGED_MODELS, STAGED_DEFAULT_PARAMETERS, DEFAULT_PARAMETERS
+    merged = func.jsonb_strip_nulls(
+        func.coalesce(cast(d.c.parameters, JSONB), cast(literal("{}"), JSONB)).op("||")(
+            cast(sd.c.parameters, JSONB)
+        )
+    )
+    return (
+        update(d)
+        .where(
+            sd.c.model_id == sm.c.stage_id,
+            d.c.model_id == sm.c.model_id,
+            merged.is_distinct_from(cast(d.c.parameters, JSONB)),
+        )
+        .values(parameters=cast(merged, JSON))
+    )
+
+
+def _insert_new_models() -> Update:
+    """
+    Insert staged models that were not matched, recording their new ids and
+    marking them new. A model inserted concurrently conflicts and stays
+    unmatched, so none of its child rows are written.
+    """
+    sm, m = STAGED_MODELS, LLM_MODELS
+    columns = [c.name for c in m.columns if c.name != "id"]
+    inserted = (
+        pg_insert(m)
+        .from_select(
+            columns,
+            select(*(sm.c[name] for name in columns)).where(sm.c.model_id.is_(None)),
+        )
+        .on_conflict_do_nothing()
+        .returning(m.c.id, m.c.author, m.c.model_name)
+        .cte("inserted_models")
+    )
+    return (
+        update(sm)
+        .where(
+            sm.c.author == inserted.c.author, sm.c.model_name == inserted.c.model_name
+        )
+        .values(model_id=inserted.c.id, is_new=True)
+    )
+
+
+def _insert_model_rows(target: Table, staged: Table, new: bool) -> Insert:
+    """Insert staged rows keyed by model_id for new, or for existing, models"""
+    sm = STAGED_MODELS
+    columns = [c.name for c in target.columns if c.name != "id"]
+    values = select(
+        *(sm.c.model_id if name == "model_id" else staged.c[name] for name in columns)
+    )
+    return (
+        pg_insert(target)
+        .from_select(
+            columns,
+            values.join_from(staged, sm, staged.c.model_id == sm.c.stage_id).where(
+                sm.c.model_id.is_not(None), sm.c.is_new.is_(new)
+            ),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+def _insert_modalities(new: bool) -> Insert:
+    """Insert staged modalities missing from the architectures of new or existing models"""
+    sm, smod, a = STAGED_MODELS, STAGED_MODALITIES, MODEL_ARCHITECTURE
+    values = (
+        select(a.c.id, smod.c.modality_type, smod.c.modality_value)
+        .join_from(smod, sm, smod.c.architecture_id == sm.c.stage_id)
+        .join(a, a.c.model_id == sm.c.model_id)
+        .where(sm.c.is_new.is_(new))
+    )
+    return (
+        pg_insert(MODALITIES)
+        .from_select(["architecture_id", "modality_type", "modality_value"], values)
+        .on_conflict_do_nothing()
+    )
+
+
+def _insert_endpoint_pricing() -> Insert:
+    """Insert pricing for the endpoints of new models"""
+    sm, se, sp = STAGED_MODELS, STAGED_ENDPOINTS, STAGED_ENDPOINT_PRICING
+    columns = [c.name for c in ENDPOINT_PRICING.columns if c.name != "id"]
+    values = (
+        select(
+            *(
+                ENDPOINTS.c.id if name == "endpoint_id" else sp.c[name]
+                for name in columns
+            )
+        )
+        .join_from(sp, se, sp.c.endpoint_id == se.c.stage_id)
+        .join(sm, se.c.model_id == sm.c.stage_id)
+        .join(ENDPOINTS, _endpoint_matches(ENDPOINTS))
+        .where(sm.c.is_new)
+    )
+    return (
+        pg_insert(ENDPOINT_PRICING)
+        .from_select(columns, values)
+        .on_conflict_do_nothing()
+    )
+
+
+async def _rowcount(conn: AsyncConnection, statement: Insert | Update) -> int:
+    result = await conn.execute(statement)
+    return max(result.rowcount, 0)
+
+
+async def staging_sync_models(
+    session: AsyncSession,
+    models: Sequence[CompactModel],
+    zdr_lookup: ZDRLookup,
+) -> tuple[dict[str, int], int, int]:
+    """
+    Update existing and insert new models through temporary staging tables.
+
+    The catalog is streamed into one staging table per registry table with
+    binary COPY, then reconciled in a fixed number of set-based statements in
+    one transaction: UPDATE … FROM applies the diff engine's fill-empty and
+    always-latest rules to existing rows, touching only the rows that change,
+    and INSERT … SELECT … ON CONFLICT DO NOTHING writes new models and their
+    child rows. As in the ORM engine, only
+    new models get child rows inserted; existing models gain missing
+    modalities and supported parameters but no new endpoints.
+
+    Returns: (update counts per stage, inserted_count, skipped_count)
+    """
+    conn = await session.connection()
+    staged = stage_rows(models, zdr_lookup)
+
+    # 1. Stage: temporary tables (dropped at commit) filled with binary COPY
+    await conn.run_sync(staging_metadata.create_all, checkfirst=False)
+    for table, rows in staged.items():
+        await _copy_rows(conn, table, rows)
+        # Temporary tables are never auto-analyzed; the joins below need row counts
+        await conn.exec_driver_sql(f'ANALYZE "{table.name}"')
+    await conn.execute(_match_existing_models())
+
+    # 2. Update existing models (only matched rows have a model_id so far)
+    update_counts = {
+        "LLM models": await _rowcount(conn, _update_llm_models(datetime.now(UTC))),
+        "Model pricing": await _rowcount(conn, _update_model_pricing()),
+        "Architecture": await _rowcount(conn, _update_architecture()),
+        "Architecture modalities": await _rowcount(conn, _insert_modalities(new=False)),
+        "Top provider": await _rowcount(conn, _update_top_provider()),
+        "Endpoints": await _rowcount(conn, _update_endpoints()),
+        "Endpoint pricing": await _rowcount(conn, _update_endpoint_pricing()),
+        "Supported parameters": await _rowcount(
+            conn,
+            _insert_model_rows(
+                SUPPORTED_PARAMETERS, STAGED_SUPPORTED_PARAMETERS, new=False
+            ),
+        ),
+        "Default parameters": await _rowcount(conn, _merge_default_parameters()),
+    }
+
+    # 3. Insert new models, then their child rows (parents first, joined by natural key)
+    inserted_count = await _rowcount(conn, _insert_new_models())
+    for target, staged_table in (
+        (MODEL_PRICING, STAGED_PRICING),
+        (MODEL_ARCHITECTURE, STAGED_ARCHITECTURE),
+        (TOP_PROVIDER, STAGED_TOP_PROVIDER),
+        (SUPPORTED_PARAMETERS, STAGED_SUPPORTED_PARAMETERS),
+        (DEFAULT_PARAMETERS, STAGED_DEFAULT_PARAMETERS),
+        (ENDPOINTS, STAGED_ENDPOINTS),
+    ):
+        await conn.execute(_insert_model_rows(target, staged_table, new=True))
+    await conn.execute(_insert_modalities(new=True))
+    await conn.execute(_insert_endpoint_pricing())
+
+    await session.commit()
+
+    logger.info(
+        f"✓ Synced {len(staged[STAGED_MODELS])} models through staging tables "
+        f"({len(staged[STAGED_ENDPOINTS])} endpoints): {inserted_count} inserted"
+    )
+    return update_counts, inserted_count, len(models) - inserted_count
@@ -0,0 +1,91 @@
+"""
+Load and persist upstream content fingerprints.
+"""
+
+import logging
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..change_detection import ChangeDetector, StoredFingerprint
+from ..models.database import LLMModel, ModelFingerprint, SyncMetadata
+
+logger = logging.getLogger(__name__)
+
+
+async def load_change_detector(
+    session: AsyncSession, sample_fraction: float = 0.1, fetch_all: bool = False
+) -> ChangeDetector:
+    """Build a ChangeDetector from the fingerprints stored by previous syncs"""
+    result = await session.execute(
+        select(
+            LLMModel.author,
+            LLMModel.model_name,
+            ModelFingerprint.model_id,
+            ModelFingerprint.summary_hash,
+            ModelFingerprint.endpoints_hash,
+        ).join(ModelFingerprint, ModelFingerprint.model_id == LLMModel.id)
+    )
+    stored = {
+        (row[0], row[1]): StoredFingerprint(
+            model_id=row[2], summary_hash=row[3], endpoints_hash=row[4]
+        )
+        for row in result.all()
+    }
+
+    stored_zdr_hash = await session.scalar(
+        select(SyncMetadata.content_hash)
+        .where(SyncMetadata.sync_type == "zdr_endpoints")
+        .order_by(SyncMetadata.last_sync_at.desc())
+        .limit(1)
+    )
+
+    logger.info(f"✓ Loaded fingerprints for {len(stored)} models")
+    return ChangeDetector(
+        stored,
+        stored_zdr_hash=stored_zdr_hash,
+        sample_fraction=sample_fraction,
+        fetch_all=fetch_all,
+    )
+
+
+async def save_fingerprints(session: AsyncSession, detector: ChangeDetector) -> int:
+    """Persist fingerprints for the models written this run"""
+    if not detector.pending:
+        return 0
+
+    result = await session.execute(
+        select(LLMModel.id, LLMModel.author, LLMModel.model_name)
+    )
+    model_ids = {(row[1], row[2]): row[0] for row in result.all()}
+
+    result = await session.execute(select(ModelFingerprint))
+    existing = {fp.model_id: fp for fp in result.scalars().all()}
+
+    saved_count = 0
+    now = datetime.now(UTC)
+    for key, (summary_hash, endpoints_hash) in detector.pending.items():
+        model_id = model_ids.get(key)
+        if model_id is None:
+            continue  # Insert failed, keep re-checking next run
+
+        db_fingerprint = existing.get(model_id)
+        if db_fingerprint is None:
+            session.add(
+                ModelFingerprint(
+                    model_id=model_id,
+                    summary_hash=summary_hash,
+                    endpoints_hash=endpoints_hash,
+                    checked_at=now,
+                )
+            )
+        else:
+            db_fingerprint.summary_hash = summary_hash  # type: ignore
+            db_fingerprint.endpoints_hash = endpoints_hash  # type: ignore
+            db_fingerprint.checked_at = now  # type: ignore
+        saved_count += 1
+
+    await session.commit()
+    logger.info(f"✓ Saved fingerprints for {saved_count} models")
+    return saved_count
@@ -7,13 +7,13 @@ from pathlib import Path
 
 import polars as pl
 
-from ..models.openrouter import OpenRouterModelWithEndpoints
+from ..models.compact import CompactModel
 
 logger = logging.getLogger(__name__)
 
 
 def save_to_polars(
-    models: list[OpenRouterModelWithEndpoints],
+    models: list[CompactModel],
     output_path: Path,
     format: str = "parquet",
 ) -> None:
@@ -0,0 +1,43 @@
+"""
+Content fingerprints for detecting upstream changes between syncs.
+"""
+
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from ..models.compact import CompactEndpoint
+from ..models.openrouter import OpenRouterModel
+from ..models.zdr import ZDREndpoint
+
+# Endpoint fields that change on every fetch without being synced to existing rows
+VOLATILE_ENDPOINT_FIELDS = {"uptime_last_30m"}
+
+
+def fingerprint(payload: Any) -> str:
+    """SHA-256 of a canonical (sorted-key, compact) JSON encoding"""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def summary_fingerprint(model: OpenRouterModel) -> str:
+    """Fingerprint of a model's /models entry as validated"""
+    return fingerprint(model.model_dump(mode="json"))
+
+
+def endpoints_fingerprint(endpoints: Sequence[CompactEndpoint]) -> str:
+    """Order-independent fingerprint of a model's endpoints payload"""
+    # Same records as Endpoint.model_dump(mode="json"), so stored hashes stay valid
+    records = sorted(
+        (ep.to_dict(exclude=VOLATILE_ENDPOINT_FIELDS) for ep in endpoints),
+        key=lambda r: (r["provider_name"], r["tag"], r["name"]),
+    )
+    return fingerprint(records)
+
+
+def zdr_fingerprint(zdr_lookup: dict[tuple[str, str, str], ZDREndpoint]) -> str:
+    """Order-independent fingerprint of the full ZDR endpoint list"""
+    return fingerprint(
+        [zdr_lookup[key].model_dump(mode="json") for key in sorted(zdr_lookup)]
+    )
@@ -3,6 +3,9 @@ Parameter validation utilities for model registry setup.
 """
 
 import logging
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from pydantic import BaseModel
 
@@ -62,6 +65,11 @@ DEFAULT_PARAMETERS = [
 ]
 
 
+# Constant-time membership checks for the validators
+SUPPORTED_PARAMETER_SET = frozenset(SUPPORTED_PARAMETERS)
+DEFAULT_PARAMETER_SET = frozenset(DEFAULT_PARAMETERS)
+
+
 # ============================================================================
 # PYTHON EQUIVALENTS OF GO TYPES (for validation)
 # ============================================================================
@@ -122,12 +130,86 @@ class DefaultParametersValues(BaseModel):
 
 def is_valid_supported_parameter(param: str) -> bool:
     """Check if a parameter name is valid for supported parameters"""
-    return param in SUPPORTED_PARAMETERS
+    return param in SUPPORTED_PARAMETER_SET
 
 
 def is_valid_default_parameter(param: str) -> bool:
     """Check if a parameter name is valid for default parameters"""
-    return param in DEFAULT_PARAMETERS
+    return param in DEFAULT_PARAMETER_SET
+
+
+class ValidationDiagnostics:
+    """
+    Run-scoped tally of parameters dropped by the model validators.
+
+    Validators record each rejection here instead of logging it, so a new
+    upstream parameter costs one summary line per sync rather than a warning
+    per model. Counts are kept per (field, parameter) with the first
+    `max_samples` ids of the objects that carried it.
+    """
+
+    def __init__(self, max_samples: int = 5) -> None:
+        self.max_samples = max_samples
+        self.counts: dict[tuple[str, str], int] = {}
+        self.samples: dict[tuple[str, str], list[str]] = {}
+
+    @property
+    def total(self) -> int:
+        """Rejections recorded so far"""
+        return sum(self.counts.values())
+
+    def record(self, field: str, params: Iterable[str], item_id: str | None) -> None:
+        """Record parameters dropped from `field` of the object `item_id`"""
+        for param in params:
+            key = (field, param)
+            self.counts[key] = self.counts.get(key, 0) + 1
+            samples = self.samples.setdefault(key, [])
+            if item_id is not None and len(samples) < self.max_samples:
+                samples.append(item_id)
+
+    def merge(self, other: "ValidationDiagnostics") -> None:
+        """Add the rejections recorded by another aggregator"""
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+            samples = self.samples.setdefault(key, [])
+            free = self.max_samples - len(samples)
+            samples.extend(other.samples.get(key, [])[:free])
+
+    def log_summary(self) -> None:
+        """Log one line per rejected parameter"""
+        if not self.counts:
+            return
+        logger.warning(
+            f"Dropped {self.total} invalid parameters "
+            f"({len(self.counts)} distinct) during validation:"
+        )
+        for (field, param), count in sorted(
+            self.counts.items(), key=lambda item: (-item[1], item[0])
+        ):
+            samples = ", ".join(self.samples.get((field, param), []))
+            logger.warning(f"  • {field} {param!r}: {count} objects (e.g. {samples})")
+
+
+_diagnostics: ContextVar[ValidationDiagnostics | None] = ContextVar(
+    "validation_diagnostics", default=None
+)
+_default_diagnostics = ValidationDiagnostics()
+
+
+def get_validation_diagnostics() -> ValidationDiagnostics:
+    """Aggregator of the current collection scope, or the process-wide one"""
+    return _diagnostics.get() or _default_diagnostics
+
+
+@contextmanager
+def collect_validation_diagnostics() -> Iterator[ValidationDiagnostics]:
+    """Record validation rejections made inside the block (and its tasks) separately"""
+    diagnostics = ValidationDiagnostics()
+    token = _diagnostics.set(diagnostics)
+    try:
+        yield diagnostics
+    finally:
+        _diagnostics.reset(token)
 
 
 def validate_parameter_constants() -> None: